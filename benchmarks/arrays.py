@@ -0,0 +1,84 @@
+"""Time building arrays with `push`, walking them with `first`/`rest`,
+indexing, concatenating, halving them with `slice` and summing them,
+through the builtins the evaluator calls. `sum boxed` sums the same integers held as an `Array` of
+Integer objects rather than packed into an IntArray.
+
+Usage: python benchmarks/arrays.py [ELEMENTS]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simian.objects as objects
+from simian.evaluator.evaluator import (
+    evaluate_array_index_expression,
+    evaluate_array_infix_expression,
+)
+from simian.objects.builtins import BUILTINS
+
+push = BUILTINS["push"].fn
+first = BUILTINS["first"].fn
+rest = BUILTINS["rest"].fn
+len_ = BUILTINS["len"].fn
+sum_ = BUILTINS["sum"].fn
+slice_ = BUILTINS["slice"].fn
+
+
+def build(n):
+    array = objects.Array([])
+    for i in range(n):
+        array = push([array, objects.new_integer(i)])
+    return array
+
+
+def walk(array):
+    while len_([array]).value:
+        first([array])
+        array = rest([array])
+
+
+def index(array, n):
+    for i in range(n):
+        evaluate_array_index_expression(array, objects.new_integer(i))
+
+
+def concat(array):
+    evaluate_array_infix_expression("+", array, array)
+
+
+def halve(array):
+    # Split down to single elements, as a merge sort does.
+    arrays = [array]
+    while arrays:
+        array = arrays.pop()
+        middle = objects.new_integer(len(array) // 2)
+        if len(array) > 1:
+            arrays.append(slice_([array, objects.new_integer(0), middle]))
+            arrays.append(slice_([array, middle]))
+
+
+def main(n: int):
+    start = time.perf_counter()
+    array = build(n)
+    timings = {"push": time.perf_counter() - start}
+    boxed = objects.Array(array.elements)
+    for name, step in [
+        ("first/rest", lambda: walk(array)),
+        ("index", lambda: index(array, n)),
+        ("concat", lambda: concat(array)),
+        ("halve", lambda: halve(array)),
+        ("halve boxed", lambda: halve(boxed)),
+        ("sum", lambda: sum_([array])),
+        ("sum boxed", lambda: sum_([boxed])),
+    ]:
+        start = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - start
+    for name, seconds in timings.items():
+        print(f"{name:<11} {seconds * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
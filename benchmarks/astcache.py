@@ -0,0 +1,63 @@
+"""Time loading a large monkey script library the way `cli.py` and
+`import` do: parsed from scratch (`--no-cache`), parsed and written to the
+AST cache, and read back from the cache.
+
+Usage: python benchmarks/astcache.py [STATEMENTS]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simian import astcache
+from simian.astcache.astcache import cache_entry
+
+STATEMENT = """let f_{name} = fn(x, y) {{
+    if (x < y) {{ return [x, y, {i}][1:]; }} else {{ return {{"x": x, "y": y}}.x; }}
+}};
+"""
+
+
+def name(i: int) -> str:
+    # Identifiers are letters only.
+    return "".join(chr(ord("a") + int(digit)) for digit in str(i))
+
+
+def timed(path: Path, miss: bool = False) -> float:
+    """The best of three loads of `path`."""
+    best = float("inf")
+    for _ in range(3):
+        if miss and cache_entry(path).exists():
+            cache_entry(path).unlink()
+        start = time.perf_counter()
+        _, errors = astcache.load_program(path, path.parent)
+        best = min(best, time.perf_counter() - start)
+        assert not errors, errors
+    return best
+
+
+def main(n: int):
+    directory = Path(tempfile.mkdtemp())
+    try:
+        path = directory / "library.mo"
+        path.write_text("".join(STATEMENT.format(name=name(i), i=i) for i in range(n)))
+
+        astcache.disable()
+        print(f"no cache     {timed(path) * 1000:8.1f} ms")
+        astcache.enable()
+        print(f"cache miss   {timed(path, miss=True) * 1000:8.1f} ms")
+        print(f"cache hit    {timed(path) * 1000:8.1f} ms")
+        print(
+            f"source {path.stat().st_size / 1024:.0f} KiB,"
+            f" cache entry {cache_entry(path).stat().st_size / 1024:.0f} KiB"
+        )
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,64 @@
+"""Time building a binary payload a byte at a time with `push` and then
+parsing it into fixed-size records by slicing each off the front, through
+the builtins the evaluator calls. `copying` does the same with a Bytes
+that copies on every append and slice, as Python `bytes` would.
+
+Usage: python benchmarks/bytes.py [BYTES]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simian.objects as objects
+from simian.objects.builtins import BUILTINS
+
+push = BUILTINS["push"].fn
+slice_ = BUILTINS["slice"].fn
+
+RECORD = 16
+
+
+class CopyingBytes(objects.Bytes):
+    __slots__ = ()
+
+    def push(self, byte):
+        return CopyingBytes(self.to_bytes() + bytes([byte]))
+
+    def slice(self, start, end):
+        return CopyingBytes(self.to_bytes()[start:end])
+
+
+def build(empty, n):
+    payload = empty
+    for i in range(n):
+        payload = push([payload, objects.new_integer(i % 256)])
+    return payload
+
+
+def parse(payload):
+    record = objects.new_integer(RECORD)
+    while len(payload):
+        slice_([payload, objects.new_integer(0), record])
+        payload = slice_([payload, record])
+
+
+def main(n: int):
+    for name, empty in [
+        ("views", objects.Bytes(b"")),
+        ("copying", CopyingBytes(b"")),
+    ]:
+        start = time.perf_counter()
+        payload = build(empty, n)
+        built = time.perf_counter()
+        parse(payload)
+        done = time.perf_counter()
+        print(
+            f"{name:<8} push {(built - start) * 1000:8.1f} ms"
+            f"  slice {(done - built) * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
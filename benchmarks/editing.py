@@ -0,0 +1,49 @@
+"""Time parsing a large monkey source from scratch against reparsing it
+incrementally after a one-character edit in the middle, and report how
+many top-level statements the edit shared with the previous parse.
+
+Usage: python benchmarks/editing.py [STATEMENTS]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simian.lexer as lexer
+import simian.parser as parser
+from simian.incremental import edit_document, parse_document
+
+STATEMENT = """let f_{name} = fn(x, y) {{
+    if (x < y) {{ return [x, y, {i}][1:]; }} else {{ return {{"x": x, "y": y}}.x; }}
+}};
+"""
+
+
+def name(i: int) -> str:
+    # Identifiers are letters only.
+    return "".join(chr(ord("a") + int(digit)) for digit in str(i))
+
+
+def main(n: int):
+    source = "".join(STATEMENT.format(name=name(i), i=i) for i in range(n))
+    offset = source.index(f"[x, y, {n // 2}]") + 1
+
+    start = time.perf_counter()
+    parser.Parser(lexer.new(source), os.getcwd()).parse_program()
+    scratch = time.perf_counter() - start
+    print(f"from scratch   {scratch * 1000:8.1f} ms")
+
+    document = parse_document(source, os.getcwd())
+    start = time.perf_counter()
+    edited = edit_document(document, offset, 1, "z")
+    incremental = time.perf_counter() - start
+    shared = len(set(map(id, document.statements)) & set(map(id, edited.statements)))
+    print(
+        f"incremental    {incremental * 1000:8.1f} ms"
+        f"  ({shared} of {len(edited.statements)} statements shared)"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
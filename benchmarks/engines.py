@@ -0,0 +1,82 @@
+"""Time each execution engine on a few call- and loop-heavy scripts.
+
+Usage: python benchmarks/engines.py [ENGINE ...]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simian.lexer as lexer
+import simian.parser as parser
+import simian.objects as objects
+from simian.engines import ENGINES
+
+SCRIPTS = {
+    "fib(20)": """
+        let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+        fib(20);
+    """,
+    "loop(100k)": """
+        let i = 0;
+        let total = 0;
+        while (i < 100000) {
+            let total = total + i % 7;
+            let i = i + 1;
+        }
+        total;
+    """,
+    "hash fields": """
+        let p = {"x": 1, "y": 2, "z": 3};
+        let i = 0;
+        let total = 0;
+        while (i < 100000) {
+            let total = total + p.x + p.z;
+            let i = i + 1;
+        }
+        total;
+    """,
+    "record fields": """
+        let p = shape("x", "y", "z")(1, 2, 3);
+        let i = 0;
+        let total = 0;
+        while (i < 100000) {
+            let total = total + p.x + p.z;
+            let i = i + 1;
+        }
+        total;
+    """,
+}
+
+
+def parse(source: str):
+    p = parser.Parser(lexer.new(source), os.getcwd())
+    program = p.parse_program()
+    assert not p.errors, p.errors
+    return program
+
+
+def main(engines):
+    for name, source in SCRIPTS.items():
+        baseline = None
+        for engine in engines:
+            evaluate = ENGINES[engine]
+            # Parse fresh for every engine so per-AST caches don't leak across.
+            program = parse(source)
+            seconds = min(
+                timeit.repeat(
+                    lambda: evaluate(program, objects.new_environment()),
+                    number=1,
+                    repeat=3,
+                )
+            )
+            baseline = baseline or seconds
+            print(
+                f"{name:<14} {engine:<10} {seconds * 1000:9.1f} ms"
+                f"  ({baseline / seconds:4.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or list(ENGINES))
@@ -0,0 +1,58 @@
+"""Time building, querying and updating a 1M-entry monkey hash.
+
+Usage: python benchmarks/hashes.py [ENTRIES]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simian.objects as objects
+from simian.evaluator.evaluator import evaluate_hash_index_expression
+
+KEYS = {
+    "string keys": lambda n: [objects.String(f"key{i}") for i in range(n)],
+    "integer keys": lambda n: [objects.Integer(i) for i in range(n)],
+}
+
+
+def build(keys):
+    # The same steps evaluate_hash_literal takes for each pair.
+    pairs = {}
+    for key in keys:
+        pairs[key.hash_key()] = objects.HashPair(key, key)
+    return objects.Hash(pairs)
+
+
+def query(hash_, keys):
+    for key in keys:
+        evaluate_hash_index_expression(hash_, key)
+
+
+def update(hash_, keys):
+    # What the `set` builtin does, once per key.
+    for key in keys:
+        hash_ = hash_.set(key.hash_key(), objects.HashPair(key, key))
+    return hash_
+
+
+def main(n: int):
+    for name, make_keys in KEYS.items():
+        keys = make_keys(n)
+        start = time.perf_counter()
+        hash_ = build(keys)
+        built = time.perf_counter()
+        query(hash_, keys)
+        queried = time.perf_counter()
+        update(hash_, keys)
+        updated = time.perf_counter()
+        print(
+            f"{name:<13} build {(built - start) * 1000:7.1f} ms"
+            f"  query {(queried - built) * 1000:7.1f} ms"
+            f"  set {(updated - queried) * 1000:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
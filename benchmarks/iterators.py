@@ -0,0 +1,48 @@
+"""Compare the time and peak memory of summing the even numbers below N
+through a lazy iterator and through a collected array.
+
+Usage: python benchmarks/iterators.py [N]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simian.lexer as lexer
+import simian.objects as objects
+import simian.parser as parser
+from simian.engines import ENGINES
+
+CASES = {
+    "iterator": "sum(filter(range({n}), fn(x) {{ x % 2 == 0 }}))",
+    "array": "sum(collect(filter(range({n}), fn(x) {{ x % 2 == 0 }})))",
+}
+
+
+def run(source: str):
+    p = parser.Parser(lexer.new(source), os.getcwd())
+    program = p.parse_program()
+    assert not p.errors, p.errors
+    return ENGINES["tree"](program, objects.new_environment())
+
+
+def main(n: int):
+    for name, template in CASES.items():
+        tracemalloc.start()
+        try:
+            start = time.perf_counter()
+            result = run(template.format(n=n))
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        print(
+            f"{name:<9} {elapsed * 1000:8.1f} ms  peak {peak / 1024:10.1f} KiB"
+            f"  = {result}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,70 @@
+"""Compare the tokens per second of the character-at-a-time Lexer and the
+RegexLexer `lexer.new` returns, on a multi-megabyte monkey source made by
+repeating a sample program.
+
+Usage: python benchmarks/lexing.py [MEGABYTES]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simian.lexer as lexer
+from simian.token import TokenType
+
+SAMPLE = """
+// Sums the even squares below a limit.
+let squares = fn(limit) {
+    let i = 0;
+    let total = 0;
+    while (i < limit) {
+        if (i % 2 == 0 && !(i > 1000)) {
+            let total = total + i * i;
+        } else {
+            let total = total - 1;
+        }
+        let i = i + 1;
+    }
+    return total;
+};
+let point = {"x": 12, "y": 34, "label": "origin"};
+let xs = [1, 2, 3, 4, 5][1:3];
+puts(squares(100) != point.x, xs, "done");
+"""
+
+
+def char_lexer(source: str) -> lexer.Lexer:
+    l = lexer.Lexer(source)
+    l.read_char()
+    return l
+
+
+LEXERS = {
+    "char": char_lexer,
+    "regex": lexer.new,
+}
+
+
+def count_tokens(l) -> int:
+    count = 0
+    next_token = l.next_token
+    while next_token().token_type is not TokenType.EOF:
+        count += 1
+    return count
+
+
+def main(megabytes: float):
+    source = SAMPLE * int(megabytes * 1024 * 1024 / len(SAMPLE))
+    for name, new in LEXERS.items():
+        start = time.perf_counter()
+        count = count_tokens(new(source))
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name:<6} {count} tokens in {elapsed * 1000:8.1f} ms"
+            f"  {count / elapsed / 1e6:6.2f}M tokens/s"
+        )
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 4)
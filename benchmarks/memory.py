@@ -0,0 +1,48 @@
+"""Measure how many bytes each element of a 1M-element monkey array costs.
+
+Usage: python benchmarks/memory.py [ELEMENTS]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simian.objects as objects
+
+CASES = {
+    "distinct integers": lambda n: objects.Array(
+        [objects.new_integer(i) for i in range(n)]
+    ),
+    "packed integers": lambda n: objects.new_array(
+        [objects.new_integer(i) for i in range(n)]
+    ),
+    "small integers": lambda n: objects.Array(
+        [objects.new_integer(i % 100) for i in range(n)]
+    ),
+    "booleans": lambda n: objects.Array(
+        [objects.TRUE if i % 2 else objects.FALSE for i in range(n)]
+    ),
+    "strings": lambda n: objects.Array([objects.String(str(i)) for i in range(n)]),
+}
+
+
+def measure(build, n: int) -> float:
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        array = build(n)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del array
+    return (after - before) / n
+
+
+def main(n: int):
+    for name, build in CASES.items():
+        print(f"{name:<18} {measure(build, n):7.1f} bytes/element")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
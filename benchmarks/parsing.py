@@ -0,0 +1,105 @@
+"""Compare the iterative Parser with the RecursiveParser it replaced: the
+tokens per second each parses of a monkey source made by repeating a
+sample program, and the time each takes over expressions and blocks nested
+deeper and deeper, or how soon it runs out of recursion. Tokens are lexed
+beforehand, so only parsing is timed.
+
+Usage: python benchmarks/parsing.py [MEGABYTES]
+"""
+import itertools
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simian.lexer as lexer
+from benchmarks.recursive_parser import RecursiveParser
+from simian.parser import Parser
+from simian.token import Token, TokenType
+
+SAMPLE = """
+// Sums the even squares below a limit.
+let squares = fn(limit) {
+    let i = 0;
+    let total = 0;
+    while (i < limit) {
+        if (i % 2 == 0 && !(i > 1000)) {
+            let total = total + i * i;
+        } else {
+            let total = total - 1;
+        }
+        let i = i + 1;
+    }
+    return total;
+};
+let point = {"x": 12, "y": 34, "label": "origin"};
+let xs = [1, 2, 3, 4, 5][1:3];
+puts(squares(100) != point.x, xs, "done");
+"""
+
+PARSERS = {
+    "iterative": Parser,
+    "recursive": RecursiveParser,
+}
+
+NESTED = {
+    "arrays": lambda depth: "[" * depth + "]" * depth,
+    "sums": lambda depth: "1 + (" * depth + "1" + ")" * depth,
+    "ifs": lambda depth: "if (x) { " * depth + "1" + " }" * depth,
+}
+
+DEPTHS = [100, 1_000, 10_000, 100_000, 300_000]
+
+
+def lex(source: str) -> List[Token]:
+    tokens = []
+    l = lexer.new(source)
+    while not tokens or tokens[-1].token_type is not TokenType.EOF:
+        tokens.append(l.next_token())
+    return tokens
+
+
+class Tokens:
+    """Hands a parser tokens lexed beforehand, then the last, EOF, for good."""
+
+    def __init__(self, tokens: List[Token]) -> None:
+        self.next_token = itertools.chain(
+            tokens, itertools.repeat(tokens[-1])
+        ).__next__
+
+
+def parse(parser, tokens: List[Token]) -> float:
+    start = time.perf_counter()
+    p = parser(Tokens(tokens), os.getcwd())
+    p.parse_program()
+    elapsed = time.perf_counter() - start
+    assert not p.errors, p.errors[:3]
+    return elapsed
+
+
+def main(megabytes: float):
+    tokens = lex(SAMPLE * int(megabytes * 1024 * 1024 / len(SAMPLE)))
+    count = len(tokens)
+    for name, parser in PARSERS.items():
+        elapsed = min(parse(parser, tokens) for _ in range(3))
+        print(
+            f"{name:<9} {count} tokens in {elapsed * 1000:8.1f} ms"
+            f"  {count / elapsed / 1e6:6.2f}M tokens/s"
+        )
+
+    for shape, nest in NESTED.items():
+        for depth in DEPTHS:
+            tokens = lex(nest(depth))
+            results = []
+            for name, parser in PARSERS.items():
+                try:
+                    results.append(f"{name} {parse(parser, tokens) * 1000:8.1f} ms")
+                except RecursionError:
+                    results.append(f"{name} RecursionError")
+            print(f"{shape:<6} depth {depth:>7}  " + "  ".join(results))
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 1)
@@ -0,0 +1,58 @@
+"""Compare the time and peak memory of printing 1M-element monkey values by
+building their string with `str` and by streaming them with `write_to`.
+
+Usage: python benchmarks/printing.py [ELEMENTS]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simian.objects as objects
+
+CASES = {
+    "strings": lambda n: objects.Array([objects.String(str(i)) for i in range(n)]),
+    "packed integers": lambda n: objects.new_array(
+        [objects.new_integer(i) for i in range(n)]
+    ),
+    "nested": lambda n: objects.Array(
+        [objects.Array([objects.new_integer(i), objects.String("x")]) for i in range(n)]
+    ),
+}
+
+WRITERS = {
+    "str": lambda value, stream: stream.write(str(value)),
+    "write_to": lambda value, stream: value.write_to(stream),
+}
+
+
+def measure(write, value):
+    with open(os.devnull, "w") as stream:
+        # Timed and traced separately, as tracing slows allocation down.
+        start = time.perf_counter()
+        write(value, stream)
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        try:
+            write(value, stream)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(n: int):
+    for name, build in CASES.items():
+        value = build(n)
+        for writer, write in WRITERS.items():
+            elapsed, peak = measure(write, value)
+            print(
+                f"{name:<16} {writer:<9} {elapsed * 1000:8.1f} ms"
+                f"  peak {peak / 1024 / 1024:7.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
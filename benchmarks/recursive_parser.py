@@ -0,0 +1,353 @@
+"""The recursive descent parser that `simian.parser.Parser` replaced,
+which `parsing.py` benchmarks Parser against and the parser tests check
+it against.
+"""
+from typing import List, Optional, Union
+
+import simian.ast as ast
+from simian.lexer import Lexer, RegexLexer, TokenReader, TokenStore
+from simian.parser import Parser
+from simian.parser.parser import Precedence
+from simian.token import Token, TokenType
+
+__all__ = ["RecursiveParser"]
+
+
+class RecursiveParser(Parser):
+    """The original parser, which calls itself for each part of a node, so
+    Python's recursion limit bounds how deeply expressions and blocks can
+    nest. Kept out of `simian.parser` to check and benchmark Parser against.
+    """
+
+    def __init__(
+        self,
+        lexer: Union[Lexer, RegexLexer, TokenReader, TokenStore],
+        current_dir: str,
+    ) -> None:
+        super().__init__(lexer, current_dir)
+
+        self.prefix_parse_fns = {
+            TokenType.IDENT: self.parse_identifier,
+            TokenType.INT: self.parse_integer_literal,
+            TokenType.BANG: self.parse_prefix_expression,
+            TokenType.MINUS: self.parse_prefix_expression,
+            TokenType.TRUE: self.parse_boolean,
+            TokenType.FALSE: self.parse_boolean,
+            TokenType.LPAREN: self.parse_grouped_expression,
+            TokenType.IF: self.parse_if_expression,
+            TokenType.FUNCTION: self.parse_function_literal,
+            TokenType.STRING: self.parse_string_literal,
+            TokenType.LBRACKET: self.parse_array_literal,
+            TokenType.LBRACE: self.parse_hash_literal,
+            TokenType.IMPORT: self.parse_import_expression,
+            TokenType.WHILE: self.parse_while_statement,
+        }
+
+        self.infix_parse_fns = {
+            TokenType.PLUS: self.parse_infix_expression,
+            TokenType.MINUS: self.parse_infix_expression,
+            TokenType.SLASH: self.parse_infix_expression,
+            TokenType.ASTERISK: self.parse_infix_expression,
+            TokenType.MODULO: self.parse_infix_expression,
+            TokenType.EQ: self.parse_infix_expression,
+            TokenType.NOT_EQ: self.parse_infix_expression,
+            TokenType.AND: self.parse_infix_expression,
+            TokenType.OR: self.parse_infix_expression,
+            TokenType.LT: self.parse_infix_expression,
+            TokenType.GT: self.parse_infix_expression,
+            TokenType.LPAREN: self.parse_call_expression,
+            TokenType.LBRACKET: self.parse_index_expression,
+            TokenType.PERIOD: self.parse_selector_expression,
+        }
+
+    # STATEMENTS
+    def parse_statement(self) -> ast.Statement:
+        if self.current_token.token_type == TokenType.COMMENT:
+            return self.parse_comment_statement()
+        if self.current_token.token_type == TokenType.LET:
+            return self.parse_let_statement()
+        elif self.current_token.token_type == TokenType.RETURN:
+            return self.parse_return_statement()
+        elif self.current_token.token_type == TokenType.WHILE:
+            return self.parse_while_statement()
+        else:
+            return self.parse_expression_statement()
+
+    def parse_return_statement(self):
+        stmt = ast.ReturnStatement(self.current_token)
+        self.next_token()
+        stmt.return_value = self.parse_expression(Precedence.LOWEST)
+
+        if self.peek_token_is(TokenType.SEMICOLON):
+            self.next_token()
+
+        return stmt
+
+    def parse_while_statement(self):
+        stmt = ast.WhileStatement(self.current_token)
+        if not self.expect_peek(TokenType.LPAREN):
+            return None
+
+        self.next_token()
+        stmt.condition = self.parse_expression(Precedence.LOWEST)
+        if not self.expect_peek(TokenType.RPAREN):
+            return None
+
+        if not self.expect_peek(TokenType.LBRACE):
+            return None
+
+        stmt.body = self.parse_block_statement()
+
+        return stmt
+
+    def parse_expression_statement(self):
+        stmt = ast.ExpressionStatement(self.current_token)
+        stmt.expression = self.parse_expression(Precedence.LOWEST)
+        if self.peek_token_is(TokenType.SEMICOLON):
+            self.next_token()
+        return stmt
+
+    def parse_let_statement(self) -> ast.LetStatement:
+        stmt = ast.LetStatement(self.current_token)
+
+        if not self.expect_peek(TokenType.IDENT):
+            return None
+
+        stmt.name = ast.Identifier(self.current_token, self.current_token.literal)
+
+        if not self.expect_peek(TokenType.ASSIGN):
+            return None
+
+        self.next_token()
+        stmt.value = self.parse_expression(Precedence.LOWEST)
+
+        if self.peek_token_is(TokenType.SEMICOLON):
+            self.next_token()
+
+        return stmt
+
+    def parse_block_statement(self) -> ast.BlockStatement:
+        block = ast.BlockStatement(self.current_token)
+        block.statements: List[ast.Statement] = []
+        self.next_token()
+
+        while not self.current_token_is(TokenType.RBRACE) and not self.current_token_is(
+            TokenType.EOF
+        ):
+            stmt = self.parse_statement()
+            if stmt is not None:
+                block.statements.append(stmt)
+            self.next_token()
+
+        return block
+
+    # EXPRESSIONS
+    def parse_expression(self, precedence: int) -> ast.Expression:
+        prefix = self.prefix_parse_fns.get(self.current_token.token_type, None)
+        # print(
+        #     f"`prefix`: {prefix.__name__ if prefix is not None else prefix}, current token: {str(self.current_token)}"
+        # )
+        if prefix is None:
+            # print(
+            #     f"`prefix` is none: self.current_token.token_type: {self.current_token.token_type}"
+            # )
+            self.no_prefix_parse_fn_error(self.current_token.token_type)
+            return None
+        left_exp = prefix()
+
+        while (
+            not self.peek_token_is(TokenType.SEMICOLON)
+            and precedence.value < self.peek_precedence().value
+        ):
+            infix = self.infix_parse_fns.get(self.peek_token.token_type, None)
+            # print(
+            #     f"`infix`: {infix.__name__ if infix is not None else infix}, current token: {str(self.current_token)}"
+            # )
+
+            if infix is None:
+                return left_exp
+            self.next_token()
+
+            left_exp = infix(left_exp)
+        return left_exp
+
+    def parse_boolean(self) -> ast.Boolean:
+        return ast.Boolean(self.current_token, self.current_token_is(TokenType.TRUE))
+
+    def parse_identifier(self) -> ast.Identifier:
+        return ast.Identifier(self.current_token, self.current_token.literal)
+
+    def parse_string_literal(self) -> ast.StringLiteral:
+        return ast.StringLiteral(self.current_token, self.current_token.literal)
+
+    def parse_array_literal(self) -> ast.Expression:
+        array = ast.ArrayLiteral(self.current_token)
+        array.elements = self.parse_expression_list(TokenType.RBRACKET)
+        return array
+
+    def parse_prefix_expression(self) -> ast.Expression:
+        expression = ast.PrefixExpression(
+            self.current_token, self.current_token.literal
+        )
+        self.next_token()
+        expression.right = self.parse_expression(Precedence.PREFIX)
+        return expression
+
+    def parse_infix_expression(self, left: ast.Expression) -> ast.Expression:
+        expression = ast.InfixExpression(
+            self.current_token, self.current_token.literal, left
+        )
+        precedence = self.current_precedence()
+        self.next_token()
+        expression.right = self.parse_expression(precedence)
+        return expression
+
+    def parse_grouped_expression(self) -> ast.Expression:
+        self.next_token()
+        expression = self.parse_expression(Precedence.LOWEST)
+
+        if not self.expect_peek(TokenType.RPAREN):
+            return None
+
+        return expression
+
+    def parse_if_expression(self) -> ast.Expression:
+        expression = ast.IfExpression(self.current_token)
+        if not self.expect_peek(TokenType.LPAREN):
+            return None
+
+        self.next_token()
+        expression.condition = self.parse_expression(Precedence.LOWEST)
+
+        if not self.expect_peek(TokenType.RPAREN):
+            return None
+
+        if not self.expect_peek(TokenType.LBRACE):
+            return None
+
+        expression.consequence = self.parse_block_statement()
+
+        if self.peek_token_is(TokenType.ELSE):
+            self.next_token()
+
+            if not self.expect_peek(TokenType.LBRACE):
+                return None
+
+            expression.alternative = self.parse_block_statement()
+
+        return expression
+
+    def parse_function_literal(self):
+        lit = ast.FunctionLiteral(self.current_token)
+
+        if not self.expect_peek(TokenType.LPAREN):
+            return None
+
+        lit.parameters = self.parse_function_parameters()
+
+        if not self.expect_peek(TokenType.LBRACE):
+            return None
+
+        lit.body = self.parse_block_statement()
+
+        return lit
+
+    def parse_call_expression(self, function: ast.Expression) -> ast.Expression:
+        exp = ast.CallExpression(self.current_token, function)
+        exp.arguments = self.parse_expression_list(TokenType.RPAREN)
+        return exp
+
+    def parse_index_expression(self, left: ast.Expression) -> ast.Expression:
+        token = self.current_token
+        self.next_token()
+        if self.current_token_is(TokenType.COLON):
+            return self.parse_slice_expression(token, left, None)
+        index = self.parse_expression(Precedence.LOWEST)
+        if self.peek_token_is(TokenType.COLON):
+            self.next_token()
+            return self.parse_slice_expression(token, left, index)
+        exp = ast.IndexExpression(self.current_token, left, index)
+
+        if not self.expect_peek(TokenType.RBRACKET):
+            return None
+
+        return exp
+
+    def parse_slice_expression(
+        self, token: Token, left: ast.Expression, start: Optional[ast.Expression]
+    ) -> ast.Expression:
+        # The current token is the colon.
+        end = None
+        if not self.peek_token_is(TokenType.RBRACKET):
+            self.next_token()
+            end = self.parse_expression(Precedence.LOWEST)
+
+        if not self.expect_peek(TokenType.RBRACKET):
+            return None
+
+        return ast.SliceExpression(token, left, start, end)
+
+    def parse_selector_expression(self, exp: ast.Expression) -> ast.Expression:
+        self.expect_peek(TokenType.IDENT)
+        index = ast.StringLiteral(self.current_token, self.current_token.literal)
+        return ast.IndexExpression(self.current_token, exp, index)
+
+    def parse_hash_literal(self) -> ast.Expression:
+        lit = ast.HashLiteral(self.current_token)
+
+        while not self.peek_token_is(TokenType.RBRACE):
+            self.next_token()
+            key = self.parse_expression(Precedence.LOWEST)
+
+            if not self.expect_peek(TokenType.COLON):
+                return None
+
+            self.next_token()
+            value = self.parse_expression(Precedence.LOWEST)
+
+            lit.pairs[key] = value
+
+            if not self.peek_token_is(TokenType.RBRACE) and not self.expect_peek(
+                TokenType.COMMA
+            ):
+                return None
+
+        if not self.expect_peek(TokenType.RBRACE):
+            return None
+
+        return lit
+
+    def parse_import_expression(self) -> ast.Expression:
+        expression = ast.ImportExpression(self.current_token, self.current_dir)
+
+        if not self.expect_peek(TokenType.LPAREN):
+            return None
+
+        self.next_token()
+
+        expression.name = self.parse_expression(Precedence.LOWEST)
+
+        if not self.expect_peek(TokenType.RPAREN):
+            return None
+
+        return expression
+
+    def parse_expression_list(self, endTokenType: TokenType) -> List[ast.Expression]:
+        expressions: List[ast.Expression] = []
+
+        if self.peek_token_is(endTokenType):
+            self.next_token()
+            return expressions
+
+        self.next_token()
+        expressions.append(self.parse_expression(Precedence.LOWEST))
+
+        while self.peek_token_is(TokenType.COMMA):
+            self.next_token()
+            self.next_token()
+            expressions.append(self.parse_expression(Precedence.LOWEST))
+
+        if not self.expect_peek(endTokenType):
+            return None
+
+        return expressions
@@ -0,0 +1,90 @@
+"""Compare a 1M-member monkey Set with the hash of `true` values it
+replaces: the memory each member costs and the time to build, query and
+add to it through the builtins.
+
+Usage: python benchmarks/sets.py [MEMBERS]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simian.objects as objects
+from simian.evaluator.evaluator import evaluate_hash_index_expression
+from simian.objects.builtins import BUILTINS
+
+set_ = BUILTINS["set"].fn
+set_of = BUILTINS["set_of"].fn
+has = BUILTINS["has"].fn
+insert = BUILTINS["insert"].fn
+
+
+def hash_build(members):
+    pairs = {}
+    for member in members:
+        pairs[member.hash_key()] = objects.HashPair(member, objects.TRUE)
+    return objects.Hash(pairs)
+
+
+def hash_query(hash_, members):
+    for member in members:
+        evaluate_hash_index_expression(hash_, member)
+
+
+def hash_add(hash_, members):
+    for member in members:
+        hash_ = set_([hash_, member, objects.TRUE])
+
+
+def set_build(members):
+    return set_of([objects.Array(members)])
+
+
+def set_query(s, members):
+    for member in members:
+        has([s, member])
+
+
+def set_add(s, members):
+    for member in members:
+        s = insert([s, member])
+
+
+CASES = {
+    "hash": (hash_build, hash_query, hash_add),
+    "set": (set_build, set_query, set_add),
+}
+
+
+def main(n: int):
+    members = [objects.String(f"member{i}") for i in range(n)]
+    extra = [objects.String(f"extra{i}") for i in range(n // 10)]
+    for name, (build, query, add_) in CASES.items():
+        # Timed and traced separately, as tracing slows allocation down.
+        tracemalloc.start()
+        try:
+            built = build(members)
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del built
+        start = time.perf_counter()
+        built = build(members)
+        elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        query(built, members)
+        queried = time.perf_counter()
+        add_(built, extra)
+        added = time.perf_counter()
+        print(
+            f"{name:<5} {size / n:6.1f} bytes/member"
+            f"  build {elapsed * 1000:7.1f} ms"
+            f"  query {(queried - start) * 1000:7.1f} ms"
+            f"  add {len(extra)} {(added - queried) * 1000:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,77 @@
+"""Compare the time and peak memory of lexing a large monkey file read
+whole into a string with lexing it straight from the file handle and from
+an mmap, a chunk at a time.
+
+Usage: python benchmarks/streaming.py [MEGABYTES]
+"""
+import mmap
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simian.lexer as lexer
+from simian.token import TokenType
+
+RECORD = '{"id": 12345, "name": "a generated record", "tags": ["x", "y"]},\n'
+
+
+def lex(l) -> int:
+    count = 0
+    next_token = l.next_token
+    while next_token().token_type is not TokenType.EOF:
+        count += 1
+    return count
+
+
+def read_whole(path: str) -> int:
+    with open(path, "r") as f:
+        return lex(lexer.new(f.read()))
+
+
+def stream_file(path: str) -> int:
+    with open(path, "r") as f:
+        return lex(lexer.new(f))
+
+
+def stream_mmap(path: str) -> int:
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        return lex(lexer.new(m))
+
+
+CASES = {
+    "read": read_whole,
+    "file": stream_file,
+    "mmap": stream_mmap,
+}
+
+
+def main(megabytes: float):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "data.mo")
+        with open(path, "w") as f:
+            f.write("let data = [\n")
+            f.write(RECORD * int(megabytes * 1024 * 1024 / len(RECORD)))
+            f.write("];\n")
+        for name, case in CASES.items():
+            # Timed and traced separately, as tracing slows allocation down.
+            start = time.perf_counter()
+            count = case(path)
+            elapsed = time.perf_counter() - start
+            tracemalloc.start()
+            try:
+                case(path)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            print(
+                f"{name:<5} {count} tokens in {elapsed * 1000:8.1f} ms"
+                f"  peak {peak / 1024 / 1024:7.2f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 8)
@@ -0,0 +1,38 @@
+"""Time building a string with 100k appends, the way a monkey `while` loop
+doing `let s = s + line;` does, with and without ropes.
+
+Usage: python benchmarks/strings.py [APPENDS]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simian.objects as objects
+from simian.evaluator.evaluator import evaluate_string_infix_expression
+
+
+def copy(left, right):
+    # What `+` did before ropes.
+    return objects.String(left.value + right.value)
+
+
+def rope(left, right):
+    return evaluate_string_infix_expression("+", left, right)
+
+
+def main(n: int):
+    line = objects.String("a line of the report\n")
+    for name, concat in [("copy", copy), ("rope", rope)]:
+        start = time.perf_counter()
+        string = objects.String("")
+        for _ in range(n):
+            string = concat(string, line)
+        length = len(string.value)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<5} {elapsed * 1000:9.1f} ms  ({length} chars)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,60 @@
+"""Compare the memory taken by the 1M tokens of a monkey source kept as a
+list of Token objects and kept in a TokenStore, which also records where
+each token is. The source itself is not counted.
+
+Usage: python benchmarks/tokens.py [TOKENS]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simian.lexer as lexer
+from simian.token import TokenType
+
+# 26 tokens.
+LINE = 'let point = {"x": 12, "y": 34}; puts(point.x + point.y * 2);\n'
+
+
+def token_list(source: str) -> list:
+    l = lexer.new(source)
+    tokens = []
+    token = l.next_token()
+    while token.token_type is not TokenType.EOF:
+        tokens.append(token)
+        token = l.next_token()
+    return tokens
+
+
+CASES = {
+    "Token list": token_list,
+    "TokenStore": lexer.tokenize,
+}
+
+
+def main(n: int):
+    source = LINE * (n // 26)
+    for name, build in CASES.items():
+        # Timed and traced separately, as tracing slows allocation down.
+        tracemalloc.start()
+        try:
+            tokens = build(source)
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        count = len(tokens)
+        del tokens
+        start = time.perf_counter()
+        tokens = build(source)
+        elapsed = time.perf_counter() - start
+        del tokens
+        print(
+            f"{name:<10} {count} tokens  {size / 1024 / 1024:7.1f} MiB"
+            f"  {size / count:5.1f} bytes/token  {elapsed * 1000:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
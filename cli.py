@@ -1,8 +1,9 @@
 import argparse
 
+from simian import astcache
 from simian.filehandling import lex_file, parse_file, evaluate_file
 from simian.repl import Rppl, Rlpl, Repl, print_errors
-from simian.evaluator import evaluate
+from simian.engines import ENGINES, DEFAULT_ENGINE
 
 
 def main():
@@ -21,7 +22,21 @@ def main():
         action="store_true",
         help="Lex and parse input. Do not evaluate.",
     )
+    argparser.add_argument(
+        "--engine",
+        "-e",
+        choices=list(ENGINES),
+        default=DEFAULT_ENGINE,
+        help=f"Execution engine used to evaluate input. Defaults to {DEFAULT_ENGINE}.",
+    )
+    argparser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Parse files afresh, without reading or writing {astcache.CACHE_DIR}.",
+    )
     args = argparser.parse_args()
+    if args.no_cache:
+        astcache.disable()
 
     if args.FILE:
         if args.lex:
@@ -29,7 +44,7 @@ def main():
         elif args.parse:
             parse_file(args.FILE)
         else:
-            evaluate_file(args.FILE)
+            evaluate_file(args.FILE, args.engine)
 
     else:
         if args.lex:
@@ -39,7 +54,7 @@ def main():
             rppl = Rppl()
             rppl.start()
         else:
-            repl = Repl()
+            repl = Repl(args.engine)
             repl.start()
 
 
@@ -20,8 +20,11 @@ __all__ = [
     "CallExpression",
     "ArrayLiteral",
     "IndexExpression",
+    "SliceExpression",
     "HashLiteral",
     "ImportExpression",
     "Comment",
     "WhileStatement",
+    "iter_child_nodes",
+    "dump",
 ]
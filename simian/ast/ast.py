@@ -1,3 +1,5 @@
+from typing import Optional
+
 from simian.token import TokenType, Token
 
 __all__ = [
@@ -20,10 +22,13 @@ __all__ = [
     "CallExpression",
     "ArrayLiteral",
     "IndexExpression",
+    "SliceExpression",
     "HashLiteral",
     "ImportExpression",
     "Comment",
     "WhileStatement",
+    "iter_child_nodes",
+    "dump",
 ]
 
 
@@ -151,6 +156,10 @@ class Identifier(Expression):
     def __init__(self, token: Token, value: str):
         self.token = token
         self.value = value
+        # Filled in by simian.resolver: `slot` is the index into the frame
+        # `depth` function scopes out, or None for a global/builtin name.
+        self.depth: Optional[int] = None
+        self.slot: Optional[int] = None
 
     def __str__(self):
         return self.value
@@ -203,6 +212,8 @@ class FunctionLiteral(Expression):
         self.token = token
         self.parameters: List[Identifier] = []
         self.body: BlockStatement = None  # see if can make not None
+        # Name -> frame slot for every local, set by simian.resolver.
+        self.slots: Optional[Dict[str, int]] = None
 
     def __str__(self):
         return f"""{self.token_literal()}({", ".join([str(p) for p in self.parameters])}) {{{str(self.body)}}}"""
@@ -287,6 +298,8 @@ class CallExpression(Expression):
         self.token = token
         self.function = function
         self.arguments: List[Expression] = []
+        # Set by simian.resolver when the call's value is its function's.
+        self.tail = False
 
     def __str__(self):
         args = [str(arg) for arg in self.arguments]
@@ -301,6 +314,9 @@ class IndexExpression(Expression):
         self.token = token
         self.left = left
         self.index = index
+        # Set by the evaluator when `index` is a string literal, such as a
+        # selector's: a FieldSite (simian.evaluator) caching record lookups.
+        self.site = None
 
     def __str__(self):
         if self.index is None:
@@ -311,6 +327,29 @@ class IndexExpression(Expression):
         return self.token.literal
 
 
+class SliceExpression(Expression):
+    def __init__(
+        self,
+        token: Token,
+        left: Expression,
+        start: Optional[Expression],
+        end: Optional[Expression],
+    ):
+        self.token = token
+        self.left = left
+        # Either bound may be left out, as in `a[:2]`.
+        self.start = start
+        self.end = end
+
+    def __str__(self):
+        start = "" if self.start is None else str(self.start)
+        end = "" if self.end is None else str(self.end)
+        return f"({str(self.left)}[{start}:{end}])"
+
+    def token_literal(self):
+        return self.token.literal
+
+
 class ImportExpression(Expression):
     def __init__(self, token: Token, requestor: Expression):
         self.token = token
@@ -323,3 +362,56 @@ class ImportExpression(Expression):
     def __str__(self):
         return f'{self.token_literal()}("{self.name}")'
 
+
+def iter_child_nodes(node: Node):
+    """Yield the direct children of `node` in evaluation order, skipping None."""
+    if isinstance(node, (Program, BlockStatement)):
+        children = node.statements
+    elif isinstance(node, LetStatement):
+        children = [node.name, node.value]
+    elif isinstance(node, ReturnStatement):
+        children = [node.return_value]
+    elif isinstance(node, ExpressionStatement):
+        children = [node.expression]
+    elif isinstance(node, WhileStatement):
+        children = [node.condition, node.body]
+    elif isinstance(node, FunctionLiteral):
+        children = (node.parameters or []) + [node.body]
+    elif isinstance(node, ArrayLiteral):
+        children = node.elements or []
+    elif isinstance(node, HashLiteral):
+        children = [n for pair in node.pairs.items() for n in pair]
+    elif isinstance(node, PrefixExpression):
+        children = [node.right]
+    elif isinstance(node, InfixExpression):
+        children = [node.left, node.right]
+    elif isinstance(node, IfExpression):
+        children = [node.condition, node.consequence, node.alternative]
+    elif isinstance(node, CallExpression):
+        children = [node.function] + (node.arguments or [])
+    elif isinstance(node, IndexExpression):
+        children = [node.left, node.index]
+    elif isinstance(node, SliceExpression):
+        children = [node.left, node.start, node.end]
+    elif isinstance(node, ImportExpression):
+        children = [node.name]
+    else:
+        children = []
+    for child in children:
+        if child is not None:
+            yield child
+
+
+def dump(node):
+    """`node` as nested tuples and lists, with each token as its type and
+    literal, for comparing trees.
+    """
+    if isinstance(node, list):
+        return [dump(x) for x in node]
+    if isinstance(node, dict):
+        return [(dump(k), dump(v)) for k, v in node.items()]
+    if isinstance(node, Token):
+        return (node.token_type, node.literal)
+    if hasattr(node, "__dict__"):
+        return (type(node).__name__, {k: dump(v) for k, v in vars(node).items()})
+    return node
@@ -0,0 +1,3 @@
+from .astcache import CACHE_DIR, dumps, loads, load_program, enable, disable
+
+__all__ = ["CACHE_DIR", "dumps", "loads", "load_program", "enable", "disable"]
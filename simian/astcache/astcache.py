@@ -0,0 +1,241 @@
+import contextlib
+import functools
+import gc
+import hashlib
+import io
+import os
+import pickle
+import tempfile
+import sys
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+import simian.ast as ast
+import simian.lexer as lexer
+import simian.parser as parser
+import simian.token as token
+from simian.parser import Parser
+
+__all__ = ["CACHE_DIR", "dumps", "loads", "load_program", "enable", "disable"]
+
+# Whether load_program reads and writes the cache. `cli.py --no-cache`
+# turns it off, through `disable`, for the whole run, imports included.
+enabled = True
+
+CACHE_DIR = "__simiancache__"
+MAGIC = b"SMAST"
+HEADER = len(MAGIC) + hashlib.sha256().digest_size
+# The modules whose source decides what an entry holds: the lexer and parser
+# that build the tree, the classes pickled into it, and this one, which
+# writes and reads it.
+FINGERPRINTED = (
+    lexer.lexer,
+    parser.parser,
+    ast.ast,
+    token.token,
+    sys.modules[__name__],
+)
+PATH_CLASSES = (
+    "Path",
+    "PosixPath",
+    "WindowsPath",
+    "PurePath",
+    "PurePosixPath",
+    "PureWindowsPath",
+)
+
+
+def enable() -> None:
+    global enabled
+    enabled = True
+
+
+def disable() -> None:
+    global enabled
+    enabled = False
+
+
+def dumps(program: ast.Program) -> bytes:
+    """`program` as bytes for `loads`: pickled, then compressed.
+
+    Raises RecursionError for a tree too deep to pickle, or PicklingError
+    if it holds something that can't be pickled.
+    """
+    with paused_gc():
+        data = pickle.dumps(program, pickle.HIGHEST_PROTOCOL)
+    return zlib.compress(data, 1)
+
+
+def loads(data: bytes, current_dir) -> ast.Program:
+    """The program `dumps` made `data` from, with every import in it made
+    relative to `current_dir`, whichever directory it was parsed in.
+    """
+    unpickler = Unpickler(io.BytesIO(zlib.decompress(data)), current_dir)
+    with paused_gc():
+        return unpickler.load()
+
+
+@contextlib.contextmanager
+def paused_gc() -> Iterator[None]:
+    """Pause the cycle collector, which would otherwise scan a large tree
+    over and over as pickling or unpickling it allocates. An AST has no
+    reference cycles for it to find.
+    """
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if collecting:
+            gc.enable()
+
+
+class Unpickler(pickle.Unpickler):
+    """Loads only the classes an AST is made of, so a cache entry can't
+    run arbitrary code, and swaps in `current_dir` for the directory the
+    program was parsed in, the only path in an AST.
+    """
+
+    def __init__(self, file: BinaryIO, current_dir) -> None:
+        super().__init__(file)
+        self.current_dir = current_dir
+
+    def find_class(self, module: str, name: str):
+        if module == "simian.ast.ast":
+            cls = getattr(ast, name, None)
+            if isinstance(cls, type) and issubclass(cls, ast.Node):
+                return cls
+        if module == "simian.token.token" and name in ("Token", "TokenType"):
+            return getattr(token, name)
+        elif module == "pathlib" and name in PATH_CLASSES:
+            return lambda *parts: self.current_dir
+        raise pickle.UnpicklingError(f"{module}.{name} is not part of an AST")
+
+
+def load_program(path: Path, current_dir) -> Tuple[ast.Program, List[str]]:
+    """Parse the file at `path`, as if in `current_dir`, and return the
+    program and any parser errors. Unless the cache is disabled, a program
+    parsed without errors is kept in a `__simiancache__` directory beside
+    the file, in one entry per file and fingerprint of the lexer, parser
+    and AST classes, holding the hash of the source it came from, and taken
+    from there while that still matches. Entries are written to a temporary
+    file and renamed into place, so processes sharing a cache never see half
+    of one.
+    """
+    path = Path(path)
+    if not enabled or fingerprint() is None:
+        program, errors, _ = parse(path, current_dir)
+        return program, errors
+
+    entry = cache_entry(path)
+    program = read_entry(entry, source_hash(path), current_dir)
+    if program is not None:
+        return program, []
+
+    # Stored under the hash of the bytes parsed, in case the file changed
+    # since it was hashed above.
+    program, errors, digest = parse(path, current_dir)
+    if not errors:
+        write_entry(entry, digest, program)
+    return program, errors
+
+
+def parse(path: Path, current_dir) -> Tuple[ast.Program, List[str], bytes]:
+    """The program in the file at `path`, its parser errors and the hash of
+    the bytes it was parsed from.
+    """
+    with open(path, "rb") as f:
+        source = HashingReader(f)
+        # Decoded as open(path, "r") would.
+        text = io.TextIOWrapper(io.BufferedReader(source))
+        p = Parser(lexer.new(text), current_dir)
+        program = p.parse_program()
+        # A NUL ends a program before the end of its file.
+        while source.read(lexer.lexer.CHUNK_SIZE):
+            pass
+    return program, p.errors, source.digest.digest()
+
+
+class HashingReader(io.RawIOBase):
+    """Reads a binary file, hashing every byte read."""
+
+    def __init__(self, f: BinaryIO) -> None:
+        self.f = f
+        self.digest = hashlib.sha256()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        n = self.f.readinto(buffer)
+        self.digest.update(memoryview(buffer)[:n])
+        return n
+
+
+@functools.lru_cache(maxsize=None)
+def fingerprint() -> Optional[str]:
+    """A hash of the source of FINGERPRINTED, so entries made by other
+    versions of the lexer, parser or AST classes are never read. None, leaving the cache
+    unused, when that source can't be read.
+    """
+    digest = hashlib.sha256()
+    try:
+        for module in FINGERPRINTED:
+            with open(module.__file__, "rb") as f:
+                digest.update(f.read())
+    except (AttributeError, OSError):
+        return None
+    return digest.hexdigest()[:16]
+
+
+def source_hash(path: Path) -> bytes:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(lexer.lexer.CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def cache_entry(path: Path) -> Path:
+    return path.parent / CACHE_DIR / f"{path.name}.{fingerprint()}.ast"
+
+
+def read_entry(entry: Path, digest: bytes, current_dir) -> Optional[ast.Program]:
+    try:
+        with open(entry, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if data[:HEADER] != MAGIC + digest:
+        return None
+    try:
+        return loads(data[HEADER:], current_dir)
+    except Exception:
+        # Written by something else, or damaged: parse it again.
+        return None
+
+
+def write_entry(entry: Path, digest: bytes, program: ast.Program) -> None:
+    try:
+        data = dumps(program)
+    except (RecursionError, pickle.PicklingError):
+        return
+    try:
+        entry.parent.mkdir(exist_ok=True)
+        fd, temporary = tempfile.mkstemp(
+            dir=entry.parent, prefix=entry.name, suffix=".tmp"
+        )
+    except OSError:
+        # A read-only directory, say: go without the cache.
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC + digest)
+            f.write(data)
+        os.replace(temporary, entry)
+    except OSError:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
@@ -0,0 +1,138 @@
+import hashlib
+import os
+import pickle
+import zlib
+from pathlib import Path
+
+import pytest
+
+import simian.ast as ast
+import simian.lexer as lexer
+from simian import astcache
+from simian.astcache.astcache import CACHE_DIR, cache_entry, fingerprint
+from simian.parser import Parser
+
+# At least one of every node class.
+SOURCE = """// every node
+let add = fn(x, y) { return x + y; };
+let m = import("./module.mo");
+while (false) { -1 }
+if (!true) { [1, 2][0:1] } else { {"a": add(1, 2)}["a"] }
+m.field;
+"""
+
+
+def test_round_trip_keeps_every_node(tmp_path):
+    program = parse(SOURCE, tmp_path)
+    loaded = astcache.loads(astcache.dumps(program), Path("/elsewhere"))
+    assert str(loaded) == str(program)
+    assert {type(node) for node in walk(loaded)} == {
+        cls
+        for cls in map(ast.__dict__.get, ast.__all__)
+        if isinstance(cls, type) and cls not in (ast.Node, ast.Statement, ast.Expression)
+    }
+    imports = [n for n in walk(loaded) if isinstance(n, ast.ImportExpression)]
+    assert [n.requestor for n in imports] == [Path("/elsewhere")]
+
+
+def test_loads_refuses_other_classes():
+    data = zlib.compress(pickle.dumps(os.system))
+    with pytest.raises(pickle.UnpicklingError):
+        astcache.loads(data, ".")
+
+
+def test_load_program_caches_by_content(tmp_path, monkeypatch):
+    path = tmp_path / "main.mo"
+    path.write_text(SOURCE)
+    program, errors = astcache.load_program(path, tmp_path)
+    assert not errors
+    assert cache_entry(path).exists()
+    assert cache_entry(path).parent.name == CACHE_DIR
+
+    parsed = []
+    parse = astcache.astcache.parse
+    monkeypatch.setattr(
+        astcache.astcache, "parse", lambda *args: parsed.append(args) or parse(*args)
+    )
+    cached, errors = astcache.load_program(path, tmp_path)
+    assert not errors and not parsed
+    assert str(cached) == str(program)
+
+    path.write_text(SOURCE + "1;")
+    edited, errors = astcache.load_program(path, tmp_path)
+    assert len(parsed) == 1
+    assert str(edited) == str(program) + "1"
+
+
+def test_load_program_does_not_cache_errors_or_when_disabled(tmp_path):
+    broken = tmp_path / "broken.mo"
+    broken.write_text("let = 1;")
+    _, errors = astcache.load_program(broken, tmp_path)
+    assert errors
+    assert not cache_entry(broken).exists()
+
+    path = tmp_path / "main.mo"
+    path.write_text(SOURCE)
+    astcache.disable()
+    try:
+        astcache.load_program(path, tmp_path)
+    finally:
+        astcache.enable()
+    assert not cache_entry(path).exists()
+
+
+def test_entries_are_keyed_on_the_parser(tmp_path, monkeypatch):
+    # Whatever changes the trees entries hold changes their names.
+    fingerprinted = {module.__name__ for module in astcache.astcache.FINGERPRINTED}
+    assert {"simian.lexer.lexer", "simian.parser.parser", "simian.ast.ast"} <= fingerprinted
+
+    path = tmp_path / "main.mo"
+    path.write_text(SOURCE)
+    astcache.load_program(path, tmp_path)
+    entry = cache_entry(path)
+    assert entry.name == f"main.mo.{fingerprint()}.ast"
+
+    # As if the parser had changed since the entry was written.
+    monkeypatch.setattr(astcache.astcache, "fingerprint", lambda: "0" * 16)
+    parsed = []
+    parse = astcache.astcache.parse
+    monkeypatch.setattr(
+        astcache.astcache, "parse", lambda *args: parsed.append(args) or parse(*args)
+    )
+    astcache.load_program(path, tmp_path)
+    assert len(parsed) == 1
+    assert cache_entry(path) != entry and cache_entry(path).exists()
+
+
+def test_entries_hold_the_hash_of_the_source_parsed(tmp_path, monkeypatch):
+    path = tmp_path / "main.mo"
+    path.write_text(SOURCE)
+    # As if the file changed between being hashed and being parsed.
+    monkeypatch.setattr(astcache.astcache, "source_hash", lambda path: b"\0" * 32)
+    astcache.load_program(path, tmp_path)
+    header = cache_entry(path).read_bytes()[: astcache.astcache.HEADER]
+    assert header.endswith(hashlib.sha256(path.read_bytes()).digest())
+
+
+def test_damaged_entries_are_parsed_again(tmp_path):
+    path = tmp_path / "main.mo"
+    path.write_text(SOURCE)
+    program, _ = astcache.load_program(path, tmp_path)
+    entry = cache_entry(path)
+    entry.write_bytes(entry.read_bytes()[:-10])
+    reparsed, errors = astcache.load_program(path, tmp_path)
+    assert not errors
+    assert str(reparsed) == str(program)
+
+
+def parse(source: str, current_dir) -> ast.Program:
+    p = Parser(lexer.new(source), current_dir)
+    program = p.parse_program()
+    assert not p.errors
+    return program
+
+
+def walk(node: ast.Node):
+    yield node
+    for child in ast.iter_child_nodes(node):
+        yield from walk(child)
@@ -0,0 +1,3 @@
+from .closures import Closure, compile_node, evaluate_closures
+
+__all__ = ["Closure", "compile_node", "evaluate_closures"]
@@ -0,0 +1,498 @@
+from typing import Callable, Dict, List, Optional
+
+import simian.ast as ast
+import simian.objects as objects
+from simian.evaluator import evaluator
+from simian.resolver import mark_tail_calls
+
+__all__ = ["Closure", "compile_node", "evaluate_closures"]
+
+# A compiled node: takes the environment it runs in and returns what
+# `evaluator.evaluate` would have returned for the same node.
+Code = Callable[[objects.Environment], Optional[objects.Object]]
+
+Error = objects.Error
+Integer = objects.Integer
+ReturnValue = objects.ReturnValue
+TailCall = evaluator.TailCall
+Environment = objects.Environment
+
+TRUE = objects.TRUE
+FALSE = objects.FALSE
+NULL = objects.NULL
+
+
+class Closure(objects.Function):
+    """A function value whose body has already been compiled.
+
+    It is still an `objects.Function`, so `type`, `str` and the tree-walking
+    `evaluator.apply_function` treat it exactly like one.
+    """
+
+    __slots__ = ("code",)
+
+    def __init__(
+        self,
+        parameters: List[ast.Identifier],
+        body: ast.BlockStatement,
+        env: objects.Environment,
+        code: Code,
+    ):
+        super().__init__(parameters, body, env)
+        self.code = code
+
+    def call(self, args: List[objects.Object]) -> objects.Object:
+        return apply_function(self, args)
+
+
+def evaluate_closures(program: ast.Program, env: objects.Environment) -> objects.Object:
+    return compile_node(program)(env)
+
+
+def compile_node(node: ast.Node) -> Code:
+    if node is None:
+        return compile_none(node)
+    compiler = COMPILERS.get(type(node), compile_none)
+    return compiler(node)
+
+
+def compile_none(node: ast.Node) -> Code:
+    def run(env):
+        return None
+
+    return run
+
+
+######################
+#     STATEMENTS     #
+######################
+def compile_program(program: ast.Program) -> Code:
+    statements = [compile_node(s) for s in program.statements]
+
+    def run(env):
+        result = None
+        for statement in statements:
+            result = statement(env)
+            if result is not None:
+                result_type = type(result)
+                if result_type is ReturnValue:
+                    return result.value
+                elif result_type is Error:
+                    return result
+        return result
+
+    return run
+
+
+def compile_block_statement(block: ast.BlockStatement) -> Code:
+    statements = [compile_node(s) for s in block.statements]
+
+    def run(env):
+        result = None
+        for statement in statements:
+            result = statement(env)
+            if result is not None:
+                result_type = type(result)
+                if result_type is ReturnValue or result_type is Error:
+                    return result
+        return result
+
+    return run
+
+
+def compile_expression_statement(stmt: ast.ExpressionStatement) -> Code:
+    return compile_node(stmt.expression)
+
+
+def compile_return_statement(stmt: ast.ReturnStatement) -> Code:
+    value_code = compile_node(stmt.return_value)
+
+    def run(env):
+        value = value_code(env)
+        if type(value) is Error:
+            return value
+        return ReturnValue(value)
+
+    return run
+
+
+def compile_let_statement(stmt: ast.LetStatement) -> Code:
+    name = stmt.name.value
+    value_code = compile_node(stmt.value)
+
+    def run(env):
+        value = value_code(env)
+        if type(value) is Error:
+            return value
+        env.set(name, value)
+
+    return run
+
+
+def compile_while_statement(stmt: ast.WhileStatement) -> Code:
+    condition_code = compile_node(stmt.condition)
+    body_code = compile_node(stmt.body)
+
+    def run(env):
+        while True:
+            condition = condition_code(env)
+            if condition is None or type(condition) is Error:
+                return condition
+            if condition is NULL or condition is FALSE:
+                break
+            result = body_code(env)
+            if type(result) is Error:
+                return result
+        return None
+
+    return run
+
+
+#######################
+#     EXPRESSIONS     #
+#######################
+def compile_integer_literal(node: ast.IntegerLiteral) -> Code:
+    # Objects are immutable, so one instance can be shared by every run.
+    value = objects.Integer(node.value)
+
+    def run(env):
+        return value
+
+    return run
+
+
+def compile_string_literal(node: ast.StringLiteral) -> Code:
+    value = objects.String(node.value)
+
+    def run(env):
+        return value
+
+    return run
+
+
+def compile_boolean(node: ast.Boolean) -> Code:
+    value = TRUE if node.value else FALSE
+
+    def run(env):
+        return value
+
+    return run
+
+
+def compile_identifier(node: ast.Identifier) -> Code:
+    name = node.value
+    builtin = objects.BUILTINS.get(name, None)
+    message = f"identifier not found: {name}"
+
+    def run(env):
+        while env is not None:
+            value = env.store.get(name, None)
+            if value is not None:
+                return value
+            env = env.outer
+        if builtin is not None:
+            return builtin
+        return Error(message)
+
+    return run
+
+
+def compile_array_literal(node: ast.ArrayLiteral) -> Code:
+    element_codes = [compile_node(e) for e in node.elements]
+
+    def run(env):
+        elements = []
+        for element_code in element_codes:
+            element = element_code(env)
+            if type(element) is Error:
+                return element
+            elements.append(element)
+        return objects.new_array(elements)
+
+    return run
+
+
+def compile_hash_literal(node: ast.HashLiteral) -> Code:
+    pair_codes = [(compile_node(k), compile_node(v)) for k, v in node.pairs.items()]
+
+    def run(env):
+        pairs = {}
+        for key_code, value_code in pair_codes:
+            key = key_code(env)
+            if type(key) is Error:
+                return key
+            if not isinstance(key, objects.Hashable):
+                return Error(f"unusable as hash key: {key.object_type().value}")
+            value = value_code(env)
+            if type(value) is Error:
+                return value
+            pairs[key.hash_key()] = objects.HashPair(key, value)
+        return objects.Hash(pairs)
+
+    return run
+
+
+def compile_prefix_expression(node: ast.PrefixExpression) -> Code:
+    operator = node.operator
+    right_code = compile_node(node.right)
+
+    if operator == "!":
+
+        def run(env):
+            right = right_code(env)
+            if type(right) is Error:
+                return right
+            if right is FALSE or right is NULL:
+                return TRUE
+            return FALSE
+
+    elif operator == "-":
+
+        def run(env):
+            right = right_code(env)
+            if type(right) is Integer:
+                return Integer(-right.value)
+            if type(right) is Error:
+                return right
+            return evaluator.evaluate_minus_prefix_operator_expression(right)
+
+    else:
+
+        def run(env):
+            right = right_code(env)
+            if type(right) is Error:
+                return right
+            return evaluator.evaluate_prefix_expression(operator, right)
+
+    return run
+
+
+# Operators whose INTEGER/INTEGER case can skip `evaluate_infix_expression`.
+# Division is left out on purpose: it goes through the generic path so that
+# its result stays exactly what the tree-walker produces.
+INTEGER_OPERATORS = {
+    "+": lambda l, r: Integer(l + r),
+    "-": lambda l, r: Integer(l - r),
+    "*": lambda l, r: Integer(l * r),
+    "%": lambda l, r: Integer(l % r),
+    "<": lambda l, r: TRUE if l < r else FALSE,
+    ">": lambda l, r: TRUE if l > r else FALSE,
+    "==": lambda l, r: TRUE if l == r else FALSE,
+    "!=": lambda l, r: TRUE if l != r else FALSE,
+}
+
+
+def compile_infix_expression(node: ast.InfixExpression) -> Code:
+    operator = node.operator
+    left_code = compile_node(node.left)
+    right_code = compile_node(node.right)
+    integer_operator = INTEGER_OPERATORS.get(operator, None)
+    evaluate_infix_expression = evaluator.evaluate_infix_expression
+
+    if integer_operator is None:
+
+        def run(env):
+            left = left_code(env)
+            if type(left) is Error:
+                return left
+            right = right_code(env)
+            if type(right) is Error:
+                return right
+            return evaluate_infix_expression(operator, left, right)
+
+    else:
+
+        def run(env):
+            left = left_code(env)
+            if type(left) is Integer:
+                right = right_code(env)
+                if type(right) is Integer:
+                    return integer_operator(left.value, right.value)
+            elif type(left) is Error:
+                return left
+            else:
+                right = right_code(env)
+            if type(right) is Error:
+                return right
+            return evaluate_infix_expression(operator, left, right)
+
+    return run
+
+
+def compile_if_expression(node: ast.IfExpression) -> Code:
+    condition_code = compile_node(node.condition)
+    consequence_code = compile_node(node.consequence)
+    alternative_code = (
+        compile_node(node.alternative) if node.alternative is not None else None
+    )
+
+    def run(env):
+        condition = condition_code(env)
+        if type(condition) is Error:
+            return condition
+        if condition is not NULL and condition is not FALSE:
+            return consequence_code(env)
+        if alternative_code is not None:
+            return alternative_code(env)
+        return NULL
+
+    return run
+
+
+def compile_function_literal(node: ast.FunctionLiteral) -> Code:
+    parameters = node.parameters
+    body = node.body
+    mark_tail_calls(body)
+    body_code = compile_node(body)
+
+    def run(env):
+        return Closure(parameters, body, env, body_code)
+
+    return run
+
+
+def compile_call_expression(node: ast.CallExpression) -> Code:
+    function_code = compile_node(node.function)
+    argument_codes = [compile_node(a) for a in node.arguments]
+    tail = node.tail
+
+    def run(env):
+        function = function_code(env)
+        if type(function) is Error:
+            return function
+        args = []
+        for argument_code in argument_codes:
+            arg = argument_code(env)
+            if type(arg) is Error:
+                return arg
+            args.append(arg)
+        if tail and type(function) is Closure:
+            return TailCall(function, args)
+        return apply_function(function, args)
+
+    return run
+
+
+def compile_field_expression(left_code: Code, name: str) -> Code:
+    site = evaluator.FieldSite(name)
+
+    def run(env):
+        left = left_code(env)
+        if type(left) is Error:
+            return left
+        return evaluator.evaluate_field_expression(left, site)
+
+    return run
+
+
+def compile_slice_expression(node: ast.SliceExpression) -> Code:
+    left_code = compile_node(node.left)
+    bound_codes = [
+        compile_node(bound) if bound is not None else None
+        for bound in (node.start, node.end)
+    ]
+
+    def run(env):
+        left = left_code(env)
+        if type(left) is Error:
+            return left
+        bounds = []
+        for code in bound_codes:
+            bound = code(env) if code is not None else NULL
+            if type(bound) is Error:
+                return bound
+            bounds.append(bound)
+        return evaluator.evaluate_slice_expression(left, *bounds)
+
+    return run
+
+
+def compile_index_expression(node: ast.IndexExpression) -> Code:
+    left_code = compile_node(node.left)
+    if type(node.index) is ast.StringLiteral:
+        return compile_field_expression(left_code, node.index.value)
+    index_code = compile_node(node.index)
+
+    def run(env):
+        left = left_code(env)
+        if type(left) is Error:
+            return left
+        index = index_code(env)
+        if type(index) is Error:
+            return index
+        return evaluator.evaluate_index_expression(left, index)
+
+    return run
+
+
+def compile_import_expression(node: ast.ImportExpression) -> Code:
+    def run(env):
+        module_path = evaluator.resolve_module_path(node)
+        if type(module_path) is Error:
+            return module_path
+        attrs = evaluate_module(module_path.value)
+        if type(attrs) is Error:
+            return attrs
+        return objects.Module(module_path.value, attrs)
+
+    return run
+
+
+####################
+#      HELPERS     #
+####################
+def apply_function(fn: objects.Object, args: List[objects.Object]) -> objects.Object:
+    # As in the tree-walker, a tail call comes back as a TailCall and is made
+    # by the next iteration here, so tail recursion runs in constant stack.
+    while type(fn) is Closure:
+        env = Environment({}, fn.env)
+        store = env.store
+        parameters = fn.parameters
+        if len(args) < len(parameters):
+            return Error(f"{parameters[len(args)].value} not supplied")
+        for param, arg in zip(parameters, args):
+            store[param.value] = arg
+
+        evaluated = fn.code(env)
+        if type(evaluated) is ReturnValue:
+            evaluated = evaluated.value
+        if type(evaluated) is not TailCall:
+            return evaluated
+        fn, args = evaluated.fn, evaluated.args
+    if type(fn) is objects.Builtin:
+        return fn.fn(args)
+    return evaluator.apply_function(fn, args)
+
+
+def evaluate_module(name: str) -> objects.Object:
+    module = evaluator.parse_module(name)
+    if type(module) is Error:
+        return module
+
+    env = objects.new_environment()
+    evaluate_closures(module, env)
+    return env.exported_hash()
+
+
+COMPILERS: Dict[type, Callable[[ast.Node], Code]] = {
+    ast.Program: compile_program,
+    ast.ExpressionStatement: compile_expression_statement,
+    ast.BlockStatement: compile_block_statement,
+    ast.ReturnStatement: compile_return_statement,
+    ast.LetStatement: compile_let_statement,
+    ast.WhileStatement: compile_while_statement,
+    ast.IntegerLiteral: compile_integer_literal,
+    ast.StringLiteral: compile_string_literal,
+    ast.Boolean: compile_boolean,
+    ast.Identifier: compile_identifier,
+    ast.ArrayLiteral: compile_array_literal,
+    ast.HashLiteral: compile_hash_literal,
+    ast.PrefixExpression: compile_prefix_expression,
+    ast.InfixExpression: compile_infix_expression,
+    ast.IfExpression: compile_if_expression,
+    ast.FunctionLiteral: compile_function_literal,
+    ast.CallExpression: compile_call_expression,
+    ast.IndexExpression: compile_index_expression,
+    ast.SliceExpression: compile_slice_expression,
+    ast.ImportExpression: compile_import_expression,
+}
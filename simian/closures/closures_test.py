@@ -0,0 +1,72 @@
+import os
+import simian.lexer as lexer
+import simian.parser as parser
+import simian.objects as objects
+from simian.closures import Closure, compile_node, evaluate_closures
+from simian.evaluator import evaluate
+
+
+def test_compiled_program_can_be_rerun():
+    program = build_program("let counter = counter + 1; counter;")
+    code = compile_node(program)
+    env = objects.new_environment()
+    env.set("counter", objects.Integer(0))
+    for expected in [1, 2, 3]:
+        evaluated = code(env)
+        assert isinstance(evaluated, objects.Integer)
+        assert evaluated.value == expected
+
+
+def test_functions_are_closures():
+    evaluated = run("fn(x) { x }")
+    assert isinstance(evaluated, Closure)
+    assert isinstance(evaluated, objects.Function)
+    assert str(evaluated) == "fn(x) {\nx\n}"
+
+
+def test_closures_run_on_tree_walker():
+    env = objects.new_environment()
+    evaluate_closures(build_program("let add = fn(x, y) { x + y };"), env)
+    evaluated = evaluate(build_program("add(2, 3)"), env)
+    assert isinstance(evaluated, objects.Integer)
+    assert evaluated.value == 5
+
+
+def test_missing_arguments():
+    evaluated = run("let add = fn(x, y) { x + y }; add(1);")
+    assert isinstance(evaluated, objects.Error)
+    assert evaluated.message == "y not supplied"
+
+
+def test_matches_tree_walker():
+    tests = [
+        "let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } }; fib(15);",
+        "let i = 0; let total = 0; while (i < 100) { let total = total + i; let i = i + 1; }; total;",
+        'let h = {"a": [1, 2, 3]}; h.a[1] + len(h["a"]);',
+        "let f = fn() { if (true) { return 1; } return 2; }; f();",
+        "let x = 1; let f = fn() { x }; let x = 2; f();",
+        "5 / 2",
+        "5; // comment",
+        "if (true) {}",
+        "[1, 2] + [3]",
+        '"a" * 2',
+        "1(2)",
+    ]
+    for input_ in tests:
+        expected = evaluate(build_program(input_), objects.new_environment())
+        evaluated = run(input_)
+        assert type(evaluated) is type(expected)
+        assert str(evaluated) == str(expected)
+
+
+####################
+#      HELPERS     #
+####################
+def build_program(input_: str):
+    l = lexer.new(input_)
+    p = parser.Parser(l, os.getcwd())
+    return p.parse_program()
+
+
+def run(input_: str) -> objects.Object:
+    return evaluate_closures(build_program(input_), objects.new_environment())
@@ -0,0 +1,13 @@
+from .code import Opcode, Instructions, make, disassemble
+from .compiler import Compiler, Bytecode, CompiledFunction, compile_program
+
+__all__ = [
+    "Opcode",
+    "Instructions",
+    "make",
+    "disassemble",
+    "Compiler",
+    "Bytecode",
+    "CompiledFunction",
+    "compile_program",
+]
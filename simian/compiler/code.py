@@ -0,0 +1,114 @@
+import enum
+from typing import Dict, List, Tuple
+
+__all__ = ["Opcode", "Instructions", "DEFINITIONS", "make", "disassemble"]
+
+# Instructions are a flat list of ints: an opcode followed by its operands.
+# A list is used rather than packed bytes because indexing a list is the
+# cheapest way to fetch the next int in the interpreter loop.
+Instructions = List[int]
+
+
+class Opcode(enum.IntEnum):
+    CONSTANT = 0
+    NONE = 1
+    NULL = 2
+    TRUE = 3
+    FALSE = 4
+    POP = 5
+    POP_UNLESS_RETURN = 6
+    WRAP_RETURN = 7
+
+    ADD = 10
+    SUB = 11
+    MUL = 12
+    MOD = 13
+    EQ = 14
+    NOT_EQ = 15
+    LT = 16
+    GT = 17
+    INFIX = 18
+    MINUS = 19
+    BANG = 20
+
+    JUMP = 30
+    JUMP_IF_FALSY = 31
+    LOOP_TEST = 32
+
+    GET_GLOBAL = 40
+    SET_GLOBAL = 41
+    GET_LOCAL = 42
+    SET_LOCAL = 43
+    GET_OUTER = 44
+
+    ARRAY = 50
+    HASH = 51
+    CHECK_HASH_KEY = 52
+    INDEX = 53
+    SLICE = 54
+    GET_FIELD = 55
+
+    CLOSURE = 60
+    CALL = 61
+    RETURN_VALUE = 62
+    IMPORT = 63
+
+
+# Opcode -> (mnemonic, number of operands)
+DEFINITIONS: Dict[int, Tuple[str, int]] = {
+    Opcode.CONSTANT: ("CONSTANT", 1),
+    Opcode.NONE: ("NONE", 0),
+    Opcode.NULL: ("NULL", 0),
+    Opcode.TRUE: ("TRUE", 0),
+    Opcode.FALSE: ("FALSE", 0),
+    Opcode.POP: ("POP", 0),
+    Opcode.POP_UNLESS_RETURN: ("POP_UNLESS_RETURN", 1),
+    Opcode.WRAP_RETURN: ("WRAP_RETURN", 0),
+    Opcode.ADD: ("ADD", 0),
+    Opcode.SUB: ("SUB", 0),
+    Opcode.MUL: ("MUL", 0),
+    Opcode.MOD: ("MOD", 0),
+    Opcode.EQ: ("EQ", 0),
+    Opcode.NOT_EQ: ("NOT_EQ", 0),
+    Opcode.LT: ("LT", 0),
+    Opcode.GT: ("GT", 0),
+    Opcode.INFIX: ("INFIX", 1),
+    Opcode.MINUS: ("MINUS", 0),
+    Opcode.BANG: ("BANG", 0),
+    Opcode.JUMP: ("JUMP", 1),
+    Opcode.JUMP_IF_FALSY: ("JUMP_IF_FALSY", 1),
+    Opcode.LOOP_TEST: ("LOOP_TEST", 1),
+    Opcode.GET_GLOBAL: ("GET_GLOBAL", 1),
+    Opcode.SET_GLOBAL: ("SET_GLOBAL", 1),
+    Opcode.GET_LOCAL: ("GET_LOCAL", 1),
+    Opcode.SET_LOCAL: ("SET_LOCAL", 1),
+    Opcode.GET_OUTER: ("GET_OUTER", 2),
+    Opcode.ARRAY: ("ARRAY", 1),
+    Opcode.HASH: ("HASH", 1),
+    Opcode.CHECK_HASH_KEY: ("CHECK_HASH_KEY", 0),
+    Opcode.INDEX: ("INDEX", 0),
+    Opcode.SLICE: ("SLICE", 0),
+    Opcode.GET_FIELD: ("GET_FIELD", 1),
+    Opcode.CLOSURE: ("CLOSURE", 1),
+    Opcode.CALL: ("CALL", 1),
+    Opcode.RETURN_VALUE: ("RETURN_VALUE", 0),
+    Opcode.IMPORT: ("IMPORT", 1),
+}
+
+
+def make(op: Opcode, *operands: int) -> Instructions:
+    name, width = DEFINITIONS[op]
+    if len(operands) != width:
+        raise ValueError(f"{name} expects {width} operand(s), got {len(operands)}")
+    return [int(op), *operands]
+
+
+def disassemble(instructions: Instructions) -> str:
+    out = []
+    ip = 0
+    while ip < len(instructions):
+        name, width = DEFINITIONS[instructions[ip]]
+        operands = instructions[ip + 1 : ip + 1 + width]
+        out.append(" ".join([f"{ip:04d}", name] + [str(o) for o in operands]))
+        ip += 1 + width
+    return "\n".join(out)
@@ -0,0 +1,346 @@
+from typing import Dict, List, Optional, Union
+
+import simian.ast as ast
+import simian.objects as objects
+from simian.compiler.code import Instructions, Opcode, make
+from simian.evaluator.evaluator import RETURNING_EXPRESSIONS, FieldSite
+from simian.resolver import declared_names
+
+__all__ = ["Compiler", "Bytecode", "CompiledFunction", "compile_program"]
+
+INFIX_OPCODES = {
+    "+": Opcode.ADD,
+    "-": Opcode.SUB,
+    "*": Opcode.MUL,
+    "%": Opcode.MOD,
+    "==": Opcode.EQ,
+    "!=": Opcode.NOT_EQ,
+    "<": Opcode.LT,
+    ">": Opcode.GT,
+}
+
+# Operators without a dedicated opcode go through `Opcode.INFIX`, whose
+# operand indexes this list.
+GENERIC_INFIX_OPERATORS = ["/", "&&", "||"]
+
+
+class CompiledFunction(objects.Object):
+    """The constant-pool entry for a function literal.
+
+    `names` lists every local (parameters first, then each name bound with
+    `let` anywhere in the body outside nested functions); a local's index in
+    that list is its slot in the frame.
+    """
+
+    def __init__(
+        self,
+        instructions: Instructions,
+        constants: List[object],
+        names: List[str],
+        literal: ast.FunctionLiteral,
+    ):
+        self.instructions = instructions
+        self.constants = constants
+        self.names = names
+        self.slots = {name: i for i, name in enumerate(names)}
+        self.num_locals = len(names)
+        self.parameters = literal.parameters
+        self.body = literal.body
+
+    def object_type(self):
+        return objects.ObjectType.FUNCTION_OBJ
+
+    def __str__(self):
+        params = [str(p) for p in self.parameters]
+        return f"fn({', '.join(params)}) {{\n{str(self.body)}\n}}"
+
+
+class Bytecode:
+    def __init__(self, instructions: Instructions, constants: List[object]):
+        self.instructions = instructions
+        self.constants = constants
+
+
+class CompilationScope:
+    def __init__(
+        self, names: Optional[List[str]], outer: Optional["CompilationScope"]
+    ):
+        self.instructions: Instructions = []
+        # None for the global scope, whose bindings live in an Environment.
+        self.names = names
+        self.slots = {name: i for i, name in enumerate(names or [])}
+        self.outer = outer
+        # What catches a `return` in this scope, innermost last: a `while`
+        # loop, by its start address, or an `if` used as a value, by the
+        # jumps to patch to its end.
+        self.exits: List[Union[int, List[int]]] = []
+
+
+class Compiler:
+    def __init__(self):
+        self.constants: List[object] = []
+        self.constant_indexes: Dict[object, int] = {}
+        self.scope = CompilationScope(None, None)
+
+    def bytecode(self) -> Bytecode:
+        return Bytecode(self.scope.instructions, self.constants)
+
+    def compile(self, node: ast.Node) -> None:
+        if isinstance(node, ast.Program):
+            self.compile_block(node.statements, keep_value=True)
+            self.emit(Opcode.RETURN_VALUE)
+        elif isinstance(node, ast.Statement):
+            self.compile_statement(node, keep_value=True)
+        else:
+            self.compile_expression(node)
+
+    ######################
+    #     STATEMENTS     #
+    ######################
+    def compile_block(self, statements: List[ast.Statement], keep_value: bool):
+        """Compile `statements`, leaving the last one's result on the stack
+        when `keep_value` is set. Statements that have no value in the
+        tree-walker (let, while, comments) leave None."""
+        if not statements:
+            if keep_value:
+                self.emit(Opcode.NONE)
+            return
+        last = len(statements) - 1
+        for i, statement in enumerate(statements):
+            self.compile_statement(statement, keep_value and i == last)
+
+    def compile_statement(self, node: ast.Statement, keep_value: bool) -> None:
+        if isinstance(node, ast.ExpressionStatement):
+            if isinstance(node.expression, ast.IfExpression):
+                # Unlike an `if` used as a value, a `return` in its branches
+                # leaves whatever the statement is in.
+                self.compile_if_expression(node.expression, as_value=False)
+            else:
+                self.compile_expression(node.expression)
+            if keep_value:
+                # Whatever the block's value goes to deals with a ReturnValue.
+                pass
+            elif isinstance(node.expression, RETURNING_EXPRESSIONS):
+                # A ReturnValue, from an `if` used as a value, returns.
+                skip = self.emit(Opcode.POP_UNLESS_RETURN, -1)
+                self.emit_return()
+                self.patch_jump(skip)
+            else:
+                self.emit(Opcode.POP)
+        elif isinstance(node, ast.LetStatement):
+            self.compile_expression(node.value)
+            self.emit_set(node.name.value)
+            if keep_value:
+                self.emit(Opcode.NONE)
+        elif isinstance(node, ast.ReturnStatement):
+            self.compile_expression(node.return_value)
+            exits = self.scope.exits
+            if exits and isinstance(exits[-1], list):
+                # Taken by an `if` used as a value, as a ReturnValue.
+                self.emit(Opcode.WRAP_RETURN)
+            elif not exits and isinstance(node.return_value, RETURNING_EXPRESSIONS):
+                # RETURN_VALUE unwraps what a statement returns, but a
+                # ReturnValue given to `return` is returned as it is.
+                self.emit(Opcode.WRAP_RETURN)
+            self.emit_return()
+        elif isinstance(node, ast.WhileStatement):
+            self.compile_while_statement(node)
+            if keep_value:
+                self.emit(Opcode.NONE)
+        elif isinstance(node, ast.BlockStatement):
+            self.compile_block(node.statements, keep_value)
+        elif keep_value:
+            self.emit(Opcode.NONE)
+
+    def emit_return(self) -> None:
+        """Return the value on the stack from whatever catches it, as the
+        tree-walker does: an `if` used as a value takes it, as a ReturnValue,
+        as its own value, and a `while` loop drops it and carries on with
+        the next iteration, so `return` in a loop body behaves like
+        `continue`.
+        """
+        if not self.scope.exits:
+            self.emit(Opcode.RETURN_VALUE)
+            return
+        exit = self.scope.exits[-1]
+        if isinstance(exit, list):
+            exit.append(self.emit(Opcode.JUMP, -1))
+        else:
+            self.emit(Opcode.POP)
+            self.emit(Opcode.JUMP, exit)
+
+    def compile_while_statement(self, node: ast.WhileStatement) -> None:
+        loop_start = len(self.scope.instructions)
+        self.compile_expression(node.condition)
+        exit_jump = self.emit(Opcode.LOOP_TEST, -1)
+
+        self.scope.exits.append(loop_start)
+        self.compile_block(node.body.statements, keep_value=False)
+        self.scope.exits.pop()
+
+        self.emit(Opcode.JUMP, loop_start)
+        self.patch_jump(exit_jump)
+
+    #######################
+    #     EXPRESSIONS     #
+    #######################
+    def compile_expression(self, node: ast.Expression) -> None:
+        if isinstance(node, ast.InfixExpression):
+            self.compile_expression(node.left)
+            self.compile_expression(node.right)
+            opcode = INFIX_OPCODES.get(node.operator, None)
+            if opcode is not None:
+                self.emit(opcode)
+            else:
+                self.emit(
+                    Opcode.INFIX, GENERIC_INFIX_OPERATORS.index(node.operator)
+                )
+        elif isinstance(node, ast.Identifier):
+            self.emit_get(node.value)
+        elif isinstance(node, ast.IntegerLiteral):
+            self.emit_constant(objects.Integer(node.value), ("int", node.value))
+        elif isinstance(node, ast.CallExpression):
+            self.compile_expression(node.function)
+            for argument in node.arguments:
+                self.compile_expression(argument)
+            self.emit(Opcode.CALL, len(node.arguments))
+        elif isinstance(node, ast.IfExpression):
+            self.compile_if_expression(node)
+        elif isinstance(node, ast.PrefixExpression):
+            self.compile_expression(node.right)
+            if node.operator == "!":
+                self.emit(Opcode.BANG)
+            else:
+                self.emit(Opcode.MINUS)
+        elif isinstance(node, ast.IndexExpression):
+            self.compile_expression(node.left)
+            if isinstance(node.index, ast.StringLiteral):
+                # Each site gets its own constant: it holds the site's cache.
+                site = self.add_constant(FieldSite(node.index.value))
+                self.emit(Opcode.GET_FIELD, site)
+            else:
+                self.compile_expression(node.index)
+                self.emit(Opcode.INDEX)
+        elif isinstance(node, ast.SliceExpression):
+            self.compile_expression(node.left)
+            for bound in (node.start, node.end):
+                if bound is None:
+                    self.emit(Opcode.NULL)
+                else:
+                    self.compile_expression(bound)
+            self.emit(Opcode.SLICE)
+        elif isinstance(node, ast.StringLiteral):
+            self.emit_constant(objects.String(node.value), ("str", node.value))
+        elif isinstance(node, ast.Boolean):
+            self.emit(Opcode.TRUE if node.value else Opcode.FALSE)
+        elif isinstance(node, ast.FunctionLiteral):
+            self.compile_function_literal(node)
+        elif isinstance(node, ast.ArrayLiteral):
+            for element in node.elements:
+                self.compile_expression(element)
+            self.emit(Opcode.ARRAY, len(node.elements))
+        elif isinstance(node, ast.HashLiteral):
+            for key, value in node.pairs.items():
+                self.compile_expression(key)
+                self.emit(Opcode.CHECK_HASH_KEY)
+                self.compile_expression(value)
+            self.emit(Opcode.HASH, len(node.pairs))
+        elif isinstance(node, ast.ImportExpression):
+            self.emit(Opcode.IMPORT, self.add_constant(node))
+        elif isinstance(node, ast.WhileStatement):
+            # `while` is also registered as a prefix parse function, so it can
+            # turn up in expression position, where it evaluates to None.
+            self.compile_while_statement(node)
+            self.emit(Opcode.NONE)
+        else:
+            self.emit(Opcode.NONE)
+
+    def compile_if_expression(
+        self, node: ast.IfExpression, as_value: bool = True
+    ) -> None:
+        self.compile_expression(node.condition)
+        else_jump = self.emit(Opcode.JUMP_IF_FALSY, -1)
+        returns: List[int] = []
+        if as_value:
+            self.scope.exits.append(returns)
+        self.compile_block(node.consequence.statements, keep_value=True)
+        end_jump = self.emit(Opcode.JUMP, -1)
+        self.patch_jump(else_jump)
+        if node.alternative is not None:
+            self.compile_block(node.alternative.statements, keep_value=True)
+        else:
+            self.emit(Opcode.NULL)
+        if as_value:
+            self.scope.exits.pop()
+        self.patch_jump(end_jump)
+        for jump in returns:
+            self.patch_jump(jump)
+
+    def compile_function_literal(self, node: ast.FunctionLiteral) -> None:
+        names = declared_names(node)
+        self.scope = CompilationScope(names, self.scope)
+        self.compile_block(node.body.statements, keep_value=True)
+        self.emit(Opcode.RETURN_VALUE)
+        instructions = self.scope.instructions
+        self.scope = self.scope.outer
+
+        fn = CompiledFunction(instructions, self.constants, names, node)
+        self.emit(Opcode.CLOSURE, self.add_constant(fn))
+
+    ####################
+    #      HELPERS     #
+    ####################
+    def emit(self, op: Opcode, *operands: int) -> int:
+        position = len(self.scope.instructions)
+        self.scope.instructions.extend(make(op, *operands))
+        return position
+
+    def patch_jump(self, position: int) -> None:
+        self.scope.instructions[position + 1] = len(self.scope.instructions)
+
+    def add_constant(self, obj: object) -> int:
+        self.constants.append(obj)
+        return len(self.constants) - 1
+
+    def emit_constant(self, obj: objects.Object, key: object) -> None:
+        # Literal objects are immutable, so equal literals share one entry.
+        index = self.constant_indexes.get(key, None)
+        if index is None:
+            index = self.add_constant(obj)
+            self.constant_indexes[key] = index
+        self.emit(Opcode.CONSTANT, index)
+
+    def name_constant(self, name: str) -> int:
+        key = ("name", name)
+        index = self.constant_indexes.get(key, None)
+        if index is None:
+            index = self.add_constant(name)
+            self.constant_indexes[key] = index
+        return index
+
+    def emit_get(self, name: str) -> None:
+        depth = 0
+        scope = self.scope
+        while scope.names is not None:
+            slot = scope.slots.get(name, None)
+            if slot is not None:
+                if depth == 0:
+                    self.emit(Opcode.GET_LOCAL, slot)
+                else:
+                    self.emit(Opcode.GET_OUTER, depth, slot)
+                return
+            depth += 1
+            scope = scope.outer
+        self.emit(Opcode.GET_GLOBAL, self.name_constant(name))
+
+    def emit_set(self, name: str) -> None:
+        if self.scope.names is None:
+            self.emit(Opcode.SET_GLOBAL, self.name_constant(name))
+        else:
+            self.emit(Opcode.SET_LOCAL, self.scope.slots[name])
+
+
+def compile_program(program: ast.Program) -> Bytecode:
+    compiler = Compiler()
+    compiler.compile(program)
+    return compiler.bytecode()
@@ -0,0 +1,107 @@
+import os
+import simian.lexer as lexer
+import simian.parser as parser
+from simian.compiler import Opcode, CompiledFunction, compile_program, disassemble, make
+
+
+def test_make():
+    assert make(Opcode.CONSTANT, 65534) == [Opcode.CONSTANT, 65534]
+    assert make(Opcode.GET_OUTER, 1, 2) == [Opcode.GET_OUTER, 1, 2]
+    assert make(Opcode.ADD) == [Opcode.ADD]
+
+
+def test_disassemble():
+    instructions = make(Opcode.ADD) + make(Opcode.GET_LOCAL, 1) + make(Opcode.GET_OUTER, 2, 3)
+    assert disassemble(instructions) == "0000 ADD\n0001 GET_LOCAL 1\n0003 GET_OUTER 2 3"
+
+
+def test_global_program():
+    bytecode = compile_program(build_program("let a = 1; a + 2;"))
+    assert disassemble(bytecode.instructions) == "\n".join(
+        [
+            "0000 CONSTANT 0",
+            "0002 SET_GLOBAL 1",
+            "0004 GET_GLOBAL 1",
+            "0006 CONSTANT 2",
+            "0008 ADD",
+            "0009 RETURN_VALUE",
+        ]
+    )
+    assert [str(c) for c in bytecode.constants] == ["1", "a", "2"]
+
+
+def test_if_jumps():
+    bytecode = compile_program(build_program("if (true) { 10 } else { 20 }"))
+    assert disassemble(bytecode.instructions) == "\n".join(
+        [
+            "0000 TRUE",
+            "0001 JUMP_IF_FALSY 7",
+            "0003 CONSTANT 0",
+            "0005 JUMP 9",
+            "0007 CONSTANT 1",
+            "0009 RETURN_VALUE",
+        ]
+    )
+
+
+def test_function_locals_and_outer():
+    bytecode = compile_program(
+        build_program("fn(a) { let b = a; if (b) { let c = 1 }; fn() { a + c } }")
+    )
+    outer = bytecode.constants[-1]
+    assert isinstance(outer, CompiledFunction)
+    assert outer.names == ["a", "b", "c"]
+    inner = [c for c in bytecode.constants if isinstance(c, CompiledFunction)][0]
+    assert inner.names == []
+    assert disassemble(inner.instructions) == "\n".join(
+        ["0000 GET_OUTER 1 0", "0003 GET_OUTER 1 2", "0006 ADD", "0007 RETURN_VALUE"]
+    )
+
+
+def test_return_inside_loop_continues():
+    bytecode = compile_program(build_program("while (x) { return 1; }"))
+    assert disassemble(bytecode.instructions) == "\n".join(
+        [
+            "0000 GET_GLOBAL 0",
+            "0002 LOOP_TEST 11",
+            "0004 CONSTANT 1",
+            "0006 POP",
+            "0007 JUMP 0",
+            "0009 JUMP 0",
+            "0011 NONE",
+            "0012 RETURN_VALUE",
+        ]
+    )
+
+
+def test_return_inside_if_value_leaves_the_if():
+    bytecode = compile_program(
+        build_program("let x = if (true) { return 5; } else { 3 }; x; 7")
+    )
+    assert disassemble(bytecode.instructions) == "\n".join(
+        [
+            "0000 TRUE",
+            "0001 JUMP_IF_FALSY 10",
+            "0003 CONSTANT 0",
+            "0005 WRAP_RETURN",
+            "0006 JUMP 12",
+            "0008 JUMP 12",
+            "0010 CONSTANT 1",
+            "0012 SET_GLOBAL 2",
+            "0014 GET_GLOBAL 2",
+            "0016 POP_UNLESS_RETURN 19",
+            "0018 RETURN_VALUE",
+            "0019 CONSTANT 3",
+            "0021 RETURN_VALUE",
+        ]
+    )
+
+
+####################
+#      HELPERS     #
+####################
+def build_program(input_: str):
+    p = parser.Parser(lexer.new(input_), os.getcwd())
+    program = p.parse_program()
+    assert len(p.errors) == 0
+    return program
@@ -0,0 +1,9 @@
+import pytest
+
+from simian.engines import ENGINES
+
+
+@pytest.fixture(params=list(ENGINES))
+def evaluate(request):
+    """Each execution engine, for a test to run against."""
+    return ENGINES[request.param]
@@ -0,0 +1,3 @@
+from .engines import ENGINES, DEFAULT_ENGINE, get_engine
+
+__all__ = ["ENGINES", "DEFAULT_ENGINE", "get_engine"]
@@ -0,0 +1,32 @@
+from typing import Callable, Dict
+
+import simian.ast as ast
+import simian.objects as objects
+from simian.evaluator import evaluate
+from simian.closures import evaluate_closures
+from simian.vm import evaluate_vm
+from simian.transpiler import evaluate_transpiled
+
+__all__ = ["ENGINES", "DEFAULT_ENGINE", "get_engine"]
+
+Engine = Callable[[ast.Program, objects.Environment], objects.Object]
+
+# Every engine takes a parsed program plus the environment to run it in and
+# returns the same value the tree-walking `evaluate` would.
+ENGINES: Dict[str, Engine] = {
+    "tree": evaluate,
+    "closure": evaluate_closures,
+    "vm": evaluate_vm,
+    "python": evaluate_transpiled,
+}
+
+DEFAULT_ENGINE = "tree"
+
+
+def get_engine(name: str) -> Engine:
+    engine = ENGINES.get(name, None)
+    if engine is None:
+        raise ValueError(
+            f"unknown engine {name!r}, expected one of {', '.join(ENGINES)}"
+        )
+    return engine
@@ -1,86 +1,150 @@
-from typing import List, Dict, Union
+from typing import Dict, Hashable, List, Optional, Union
 from pathlib import Path
 
 import simian.ast as ast
-import simian.lexer as lexer
+import simian.astcache as astcache
 import simian.objects as objects
 from simian.token import TokenType
-from simian.objects import ObjectType
-from simian.parser import Parser
+from simian.objects import ObjectType, tensor
+from simian.objects.builtins import SLICEABLE_TYPES, slice_of
+from simian.resolver import resolve
 
 __all__ = ["evaluate"]
 
+Error = objects.Error
+
+
+class EvaluationError(Exception):
+    """Carries an `objects.Error` from where it is made up to the nearest
+    boundary (`evaluate`, `evaluate_program`, `apply_function`), which hands
+    it back as a value."""
+
+    def __init__(self, error: objects.Error):
+        self.error = error
+
+
+class Return(Exception):
+    """Raised by a `return`; caught by the call, program or loop body it
+    leaves."""
+
+    def __init__(self, value: objects.Object):
+        self.value = value
+
+
+class TailCall(objects.Object):
+    """A call in tail position, handed back to `apply_function` to make once
+    the calling function's Python frames have unwound."""
+
+    __slots__ = ("fn", "args")
+
+    def __init__(self, fn: objects.Function, args: List[objects.Object]):
+        self.fn = fn
+        self.args = args
+
+    def object_type(self):
+        # Like a return, it ends every block it is the value of.
+        return ObjectType.RETURN_VALUE_OBJ
+
+
+# The expressions whose value can be a ReturnValue, which the statement
+# they make up then returns: an `if` used as a value, and whatever such a
+# value was bound to or stored in. Literals and operators never give one.
+RETURNING_EXPRESSIONS = (
+    ast.Identifier,
+    ast.CallExpression,
+    ast.IndexExpression,
+    ast.IfExpression,
+)
+
 
 def evaluate(node: ast.Node, env: objects.Environment) -> objects.Object:
-    # print(f"EVALUATING: node:<{node}>, type: <{type(node)}>")
+    """Evaluate `node`, giving errors back as `objects.Error` and a `return`
+    outside any function as an `objects.ReturnValue`."""
+    try:
+        return evaluate_node(node, env)
+    except EvaluationError as e:
+        return e.error
+    except Return as r:
+        return objects.ReturnValue(r.value)
+
+
+def evaluate_node(node: ast.Node, env: objects.Environment) -> objects.Object:
+    """Evaluate `node`, raising `EvaluationError` and `Return` rather than
+    returning them."""
     if isinstance(node, ast.Program):
         return evaluate_program(node, env)
     elif isinstance(node, ast.ExpressionStatement):
-        return evaluate(node.expression, env)
+        if type(node.expression) is ast.IfExpression:
+            # A `return` in a branch leaves the enclosing block as well.
+            value = evaluate_if_expression(node.expression, env)
+        else:
+            value = evaluate_node(node.expression, env)
+        if type(value) is objects.ReturnValue:
+            # A return caught as a value further in (see the IfExpression
+            # case below) takes effect once it reaches a statement.
+            raise Return(value.value)
+        return value
     elif isinstance(node, ast.BlockStatement):
         return evaluate_block_statement(node, env)
     elif isinstance(node, ast.ReturnStatement):
-        value = evaluate(node.return_value, env)
-        if is_error(value):
-            return value
-        return objects.ReturnValue(value)
+        raise Return(evaluate_node(node.return_value, env))
     elif isinstance(node, ast.LetStatement):
-        val = evaluate(node.value, env)
-        if is_error(val):
-            return val
-        env.set(node.name.value, val)
+        val = evaluate_node(node.value, env)
+        slot = node.name.slot
+        if slot is not None and type(env) is objects.Frame:
+            env.slots[slot] = val
+        else:
+            env.set(node.name.value, val)
     elif isinstance(node, ast.IntegerLiteral):
-        return objects.Integer(node.value)
+        return objects.new_integer(node.value)
     elif isinstance(node, ast.StringLiteral):
         return objects.String(node.value)
     elif isinstance(node, ast.ArrayLiteral):
-        elements = evaluate_expressions(node.elements, env)
-        if len(elements) == 1 and is_error(elements[0]):
-            return elements[0]
-        return objects.Array(elements)
+        return objects.new_array(evaluate_expressions(node.elements, env))
     elif isinstance(node, ast.HashLiteral):
         return evaluate_hash_literal(node, env)
     elif isinstance(node, ast.Boolean):
-        if node.value:
-            return objects.Boolean(True)
-        return objects.Boolean(False)
+        return objects.TRUE if node.value else objects.FALSE
     elif isinstance(node, ast.PrefixExpression):
-        right = evaluate(node.right, env)
-        if is_error(right):
-            return right
-        return evaluate_prefix_expression(node.operator, right)
+        right = evaluate_node(node.right, env)
+        return check(evaluate_prefix_expression(node.operator, right))
     elif isinstance(node, ast.InfixExpression):
-        left = evaluate(node.left, env)
-        if is_error(left):
-            return left
-        right = evaluate(node.right, env)
-        if is_error(right):
-            return right
-        return evaluate_infix_expression(node.operator, left, right)
+        left = evaluate_node(node.left, env)
+        right = evaluate_node(node.right, env)
+        return check(evaluate_infix_expression(node.operator, left, right))
     elif isinstance(node, ast.IfExpression):
-        return evaluate_if_expression(node, env)
+        try:
+            return evaluate_if_expression(node, env)
+        except Return as r:
+            # An `if` used as a value gives a `return` in its branches back
+            # as a ReturnValue, which is then used like any other value.
+            return objects.ReturnValue(r.value)
     elif isinstance(node, ast.Identifier):
         return evaluate_identifier(node, env)
     elif isinstance(node, ast.FunctionLiteral):
         params = node.parameters
         body = node.body
-        return objects.Function(params, body, env)
+        return objects.Function(params, body, env, node.slots)
     elif isinstance(node, ast.CallExpression):
-        function = evaluate(node.function, env)
-        if is_error(function):
-            return function
+        function = evaluate_node(node.function, env)
         args = evaluate_expressions(node.arguments, env)
-        if len(args) == 1 and is_error(args[0]):
-            return args[0]
-        return apply_function(function, args)
+        if node.tail and isinstance(function, objects.Function):
+            return TailCall(function, args)
+        return call_function(function, args)
     elif isinstance(node, ast.IndexExpression):
-        left = evaluate(node.left, env)
-        if is_error(left):
-            return left
-        index = evaluate(node.index, env)
-        if is_error(index):
-            return index
-        return evaluate_index_expression(left, index)
+        left = evaluate_node(node.left, env)
+        if type(node.index) is ast.StringLiteral:
+            site = node.site
+            if site is None:
+                site = node.site = FieldSite(node.index.value)
+            return check(evaluate_field_expression(left, site))
+        index = evaluate_node(node.index, env)
+        return check(evaluate_index_expression(left, index))
+    elif isinstance(node, ast.SliceExpression):
+        left = evaluate_node(node.left, env)
+        start = evaluate_optional_node(node.start, env)
+        end = evaluate_optional_node(node.end, env)
+        return check(evaluate_slice_expression(left, start, end))
     elif isinstance(node, ast.ImportExpression):
         return evaluate_import_expression(node, env)
     elif isinstance(node, ast.WhileStatement):
@@ -90,13 +154,15 @@ def evaluate(node: ast.Node, env: objects.Environment) -> objects.Object:
 
 def evaluate_program(program: ast.Program, env: objects.Environment) -> objects.Object:
     result: objects.Object = None
-
-    for statement in program.statements:
-        result = evaluate(statement, env)
-        if isinstance(result, objects.ReturnValue):
-            return result.value
-        elif isinstance(result, objects.Error):
-            return result
+    resolve(program)
+
+    try:
+        for statement in program.statements:
+            result = evaluate_node(statement, env)
+    except Return as r:
+        return r.value
+    except EvaluationError as e:
+        return e.error
     return result
 
 
@@ -105,23 +171,21 @@ def evaluate_block_statement(
 ) -> objects.Object:
     result: objects.Object = None
     for statement in block.statements:
-        result = evaluate(statement, env)
-        if result is not None:
-            rt = result.object_type()
-            if rt in [ObjectType.RETURN_VALUE_OBJ, ObjectType.ERROR_OBJ]:
-                return result
+        result = evaluate_node(statement, env)
     return result
 
 
 def evaluate_while_statement(stmt: ast.WhileStatement, env: objects.Environment):
     while True:
-        evaluated = evaluate(stmt.condition, env)
-        if is_error(evaluated) or evaluated is None:
+        evaluated = evaluate_node(stmt.condition, env)
+        if evaluated is None:
             return evaluated
         if is_truthy(evaluated):
-            consequence = evaluate(stmt.body, env)
-            if is_error(consequence):
-                return consequence
+            try:
+                evaluate_node(stmt.body, env)
+            except Return:
+                # `return` in a loop body moves on to the next iteration.
+                pass
         else:
             break
 
@@ -131,31 +195,31 @@ def evaluate_while_statement(stmt: ast.WhileStatement, env: objects.Environment)
 def evaluate_expressions(
     expressions: List[ast.Expression], env: objects.Environment
 ) -> List[objects.Object]:
-    result: List[objects.Object] = []
-    for expression in expressions:
-        evaluated = evaluate(expression, env)
-        if is_error(evaluated):
-            return [evaluated]
-        result.append(evaluated)
-    return result
+    return [evaluate_node(expression, env) for expression in expressions]
+
+
+def evaluate_optional_node(
+    node: Optional[ast.Expression], env: objects.Environment
+) -> objects.Object:
+    if node is None:
+        return objects.NULL
+    return evaluate_node(node, env)
 
 
 def evaluate_hash_literal(
     node: ast.HashLiteral, env: objects.Environment
 ) -> objects.Object:
-    pairs: Dict[objects.HashKey, objects.HashPair] = {}
+    pairs: Dict[Hashable, objects.HashPair] = {}
 
     for key_node, value_node in node.pairs.items():
-        key = evaluate(key_node, env)
-        if is_error(key):
-            return key
+        key = evaluate_node(key_node, env)
 
         if not isinstance(key, objects.Hashable):
-            return new_error(f"unusable as hash key: {key.object_type().value}")
+            raise EvaluationError(
+                new_error(f"unusable as hash key: {key.object_type().value}")
+            )
 
-        value = evaluate(value_node, env)
-        if is_error(value):
-            return value
+        value = evaluate_node(value_node, env)
 
         hashed = key.hash_key()
         pairs[hashed] = objects.HashPair(key, value)
@@ -182,6 +246,10 @@ def evaluate_infix_expression(
         return evaluate_string_infix_expression(operator, left, right)
     elif left.object_type() == right.object_type() == ObjectType.ARRAY_OBJ:
         return evaluate_array_infix_expression(operator, left, right)
+    elif left.object_type() == right.object_type() == ObjectType.BYTES_OBJ:
+        return evaluate_bytes_infix_expression(operator, left, right)
+    elif ObjectType.TENSOR_OBJ in (left.object_type(), right.object_type()):
+        return tensor.evaluate_infix(operator, left, right)
     elif operator == "==":
         return native_bool_to_boolean_object(left == right)
     elif operator == "!=":
@@ -205,20 +273,36 @@ def evaluate_infix_expression(
 def evaluate_if_expression(
     expression: ast.IfExpression, env: objects.Environment
 ) -> objects.Object:
-    condition = evaluate(expression.condition, env)
-    if is_error(condition):
-        return condition
+    condition = evaluate_node(expression.condition, env)
     if is_truthy(condition):
-        return evaluate(expression.consequence, env)
+        return evaluate_block_statement(expression.consequence, env)
     if expression.alternative is not None:
-        return evaluate(expression.alternative, env)
-    return objects.Null()
+        return evaluate_block_statement(expression.alternative, env)
+    return objects.NULL
 
 
 def evaluate_identifier(
     node: ast.Identifier, env: objects.Environment
 ) -> objects.Object:
-    val = env.get(node.value)
+    depth = node.depth
+    if depth is None:
+        val = env.get(node.value)
+    else:
+        # Hop straight to the frame the resolver placed the binding in.
+        frame = env
+        while depth and frame is not None:
+            frame = frame.outer
+            depth -= 1
+        if frame is None:
+            # Evaluated outside the scopes it was resolved against.
+            val = env.get(node.value)
+        elif node.slot is not None and type(frame) is objects.Frame:
+            val = frame.slots[node.slot]
+            if val is None and frame.outer is not None:
+                # Not bound yet in this call, so an outer binding shows through.
+                val = frame.outer.get(node.value)
+        else:
+            val = frame.get(node.value)
 
     if val is not None:
         return val
@@ -227,40 +311,58 @@ def evaluate_identifier(
     if builtin is not None:
         return builtin
 
-    return new_error(f"identifier not found: {node.value}")
+    raise EvaluationError(new_error(f"identifier not found: {node.value}"))
 
 
 def evaluate_index_expression(
     left: objects.Object, index: objects.Object
 ) -> objects.Object:
     if (
-        left.object_type() == ObjectType.ARRAY_OBJ
+        left.object_type() in (ObjectType.ARRAY_OBJ, ObjectType.BYTES_OBJ)
         and index.object_type() == ObjectType.INTEGER_OBJ
     ):
         return evaluate_array_index_expression(left, index)
+    elif (
+        left.object_type() == ObjectType.TENSOR_OBJ
+        and index.object_type() == ObjectType.INTEGER_OBJ
+    ):
+        return tensor.evaluate_index(left, index)
     elif left.object_type() == ObjectType.HASH_OBJ:
         return evaluate_hash_index_expression(left, index)
+    elif left.object_type() == ObjectType.RECORD_OBJ:
+        return evaluate_record_index_expression(left, index)
     elif left.object_type() == ObjectType.MODULE:
         return evaluate_module_index_expression(left, index)
     return new_error(f"index operator not supported: {left.object_type().value}")
 
 
+def evaluate_slice_expression(
+    left: objects.Object, start: objects.Object, end: objects.Object
+) -> objects.Object:
+    """`left[start:end]`, where a bound that was left out is NULL."""
+    if left.object_type() not in SLICEABLE_TYPES:
+        return new_error(f"slice operator not supported: {left.object_type().value}")
+    return slice_of(left, start, end)
+
+
 def evaluate_bang_operator_expression(right: objects.Object) -> objects.Object:
-    if right is objects.Boolean(True):
-        return objects.Boolean(False)
-    elif right is objects.Boolean(False):
-        return objects.Boolean(True)
-    elif right is objects.Null():
-        return objects.Boolean(True)
+    if right is objects.TRUE:
+        return objects.FALSE
+    elif right is objects.FALSE:
+        return objects.TRUE
+    elif right is objects.NULL:
+        return objects.TRUE
     else:
-        return objects.Boolean(False)
+        return objects.FALSE
 
 
 def evaluate_minus_prefix_operator_expression(right: objects.Object) -> objects.Object:
+    if right.object_type() == ObjectType.TENSOR_OBJ:
+        return tensor.evaluate_minus(right)
     if right.object_type() != ObjectType.INTEGER_OBJ:
         return new_error(f"unknown operator: -{right.object_type().value}")
 
-    return objects.Integer(-right.value)
+    return objects.new_integer(-right.value)
 
 
 def evaluate_integer_infix_expression(
@@ -270,15 +372,15 @@ def evaluate_integer_infix_expression(
     right_value = right.value
 
     if operator == "+":
-        return objects.Integer(left_value + right_value)
+        return objects.new_integer(left_value + right_value)
     elif operator == "-":
-        return objects.Integer(left_value - right_value)
+        return objects.new_integer(left_value - right_value)
     elif operator == "*":
-        return objects.Integer(left_value * right_value)
+        return objects.new_integer(left_value * right_value)
     elif operator == "/":
         return objects.Integer(left_value / right_value)
     elif operator == "%":
-        return objects.Integer(left_value % right_value)
+        return objects.new_integer(left_value % right_value)
     elif operator == "<":
         return native_bool_to_boolean_object(left_value < right_value)
     elif operator == ">":
@@ -296,11 +398,11 @@ def evaluate_string_infix_expression(
     operator: str, left: objects.Object, right: objects.Object
 ) -> objects.Object:
     if operator == "+":
-        return objects.String(left.value + right.value)
+        return left.concat(right)
     elif operator == "==":
-        return objects.Boolean(left.value == right.value)
+        return native_bool_to_boolean_object(left.value == right.value)
     elif operator == "!=":
-        return objects.Boolean(left.value != right.value)
+        return native_bool_to_boolean_object(left.value != right.value)
 
     return new_error(
         f"unknown operator: {left.object_type().value} {operator} {right.object_type().value}"
@@ -315,18 +417,72 @@ def evaluate_array_infix_expression(
             f"unknown operator: {left.object_type().value} {operator} {right.object_type().value}"
         )
 
-    return objects.Array(left.elements + right.elements)
+    return left.concat(right)
+
+
+def evaluate_bytes_infix_expression(
+    operator: str, left: objects.Bytes, right: objects.Bytes
+) -> objects.Object:
+    if operator == "+":
+        return left.concat(right)
+    elif operator in ("==", "!="):
+        with left.view() as left_view, right.view() as right_view:
+            equal = left_view == right_view
+        return native_bool_to_boolean_object(equal == (operator == "=="))
+
+    return new_error(
+        f"unknown operator: {left.object_type().value} {operator} {right.object_type().value}"
+    )
 
 
 def evaluate_array_index_expression(
     array: objects.Object, index: objects.Object
 ) -> objects.Object:
-    idx = index.value
+    element = array.get(index.value)
+    if element is None:
+        return objects.NULL
+    return element
+
 
-    if idx < 0 or idx > len(array.elements) - 1:
-        return objects.Null()
+class FieldSite:
+    """An index expression whose index is the string literal `name`, such as
+    `point.x`, with an inline cache: the shape of the last record indexed
+    there and the slot `name` has in it. A site that keeps seeing records
+    of one shape reads the slot without looking `name` up.
+    """
 
-    return array.elements[idx]
+    __slots__ = ("name", "key", "shape", "slot")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.key = objects.String(name)
+        self.shape = None
+        self.slot = None
+
+
+def evaluate_field_expression(
+    left: objects.Object, site: FieldSite
+) -> objects.Object:
+    if type(left) is objects.Record:
+        shape = left.shape
+        if shape is not site.shape:
+            site.shape = shape
+            site.slot = shape.index.get(site.name, None)
+        if site.slot is None:
+            return objects.NULL
+        return left.values[site.slot]
+    return evaluate_index_expression(left, site.key)
+
+
+def evaluate_record_index_expression(
+    record: objects.Record, index: objects.Object
+) -> objects.Object:
+    if index.object_type() != ObjectType.STRING_OBJ:
+        return new_error(f"unusable as record field: {index.object_type().value}")
+    value = record.get(index.value)
+    if value is None:
+        return objects.NULL
+    return value
 
 
 def evaluate_hash_index_expression(
@@ -335,9 +491,9 @@ def evaluate_hash_index_expression(
     if not isinstance(index, objects.Hashable):
         return new_error(f"unusable as hash key: {index.object_type().value}")
 
-    pair = hash_obj.pairs.get(index.hash_key(), None)
+    pair = hash_obj.get(index.hash_key())
     if pair is None:
-        return objects.Null()
+        return objects.NULL
 
     return pair.value
 
@@ -351,6 +507,12 @@ def evaluate_module_index_expression(
 def evaluate_import_expression(
     exp: ast.ImportExpression, env: objects.Environment
 ) -> objects.Object:
+    module_path = check(resolve_module_path(exp))
+    attrs = check(evaluate_module(module_path.value))
+    return objects.Module(module_path.value, attrs)
+
+
+def resolve_module_path(exp: ast.ImportExpression) -> objects.Object:
     if not isinstance(exp.name, ast.StringLiteral):
         return new_error(
             f"Import Error: Unable to cast ImportExpression.name to ast.StringLiteral"
@@ -368,29 +530,32 @@ def evaluate_import_expression(
     module_location_obj = ast.StringLiteral(TokenType.STRING, module_name)
 
     # (Finally) evaluate module location node
-    evaluated = evaluate(module_location_obj, env)
+    evaluated = evaluate(module_location_obj, objects.new_environment())
     if is_error(evaluated):
         return evaluated
     if not isinstance(evaluated, objects.String):
         return new_error(f'Import Error: invalid import path"{evaluated}""')
-    attrs = evaluate_module(evaluated.value)
-    if is_error(attrs):
-        return attrs
-    return objects.Module(evaluated.value, attrs)
+    return evaluated
 
 
-def evaluate_module(name: str) -> objects.Object:
+def parse_module(name: str) -> Union[ast.Program, objects.Error]:
     path = Path(name)
     directory = path.parents[0].resolve()
-    with open(path, "r") as f:
-        text = f.read()
-    l = lexer.new(text)
-    p = Parser(l, directory)
+    module, errors = astcache.load_program(path, directory)
+
+    if len(errors) != 0:
+        return new_error(f"Parser Error: {errors}")
+
+    # Imported lazily: the optimizer folds constants with this module.
+    from simian.optimizer import optimize
+
+    return optimize(module)
 
-    module = p.parse_program()
 
-    if len(p.errors) != 0:
-        return new_error(f"Parser Error: {p.errors}")
+def evaluate_module(name: str) -> objects.Object:
+    module = parse_module(name)
+    if isinstance(module, objects.Error):
+        return module
 
     env = objects.new_environment()
     evaluate(module, env)
@@ -406,56 +571,70 @@ def is_error(obj: objects.Object):
     return False
 
 
+def check(obj: objects.Object) -> objects.Object:
+    """Raise `obj` if it is an error, for results of the helpers above, which
+    other engines share and so hand errors back as values."""
+    if type(obj) is Error:
+        raise EvaluationError(obj)
+    return obj
+
+
 def new_error(message: str) -> objects.Error:
     return objects.Error(message)
 
 
 def native_bool_to_boolean_object(input_: bool) -> objects.Boolean:
     if input_:
-        return objects.Boolean(True)
-    return objects.Boolean(False)
+        return objects.TRUE
+    return objects.FALSE
 
 
 def is_truthy(obj: objects.Object) -> bool:
-    if obj is objects.Null():
-        return False
-    elif obj is objects.Boolean(True):
-        return True
-    elif obj is objects.Boolean(False):
-        return False
-    return True
+    return obj is not objects.NULL and obj is not objects.FALSE
 
 
 def apply_function(fn: objects.Object, args: List[objects.Object]) -> objects.Object:
-    if isinstance(fn, objects.Function):
-        extended_env = extend_function_env(fn, args)
-        if isinstance(extended_env, objects.Error):
-            return extended_env
+    try:
+        return call_function(fn, args)
+    except EvaluationError as e:
+        return e.error
 
-        evaluated = evaluate(fn.body, extended_env)
-        if evaluated is None:
+
+def call_function(fn: objects.Object, args: List[objects.Object]) -> objects.Object:
+    # A tail call comes back as a TailCall and is made by the next iteration
+    # here, so tail recursion runs in constant Python stack.
+    while type(fn) is objects.Function:
+        extended_env = check(extend_function_env(fn, args))
+        try:
+            evaluated = evaluate_block_statement(fn.body, extended_env)
+        except Return as r:
+            evaluated = r.value
+        if type(evaluated) is not TailCall:
             return evaluated
+        fn, args = evaluated.fn, evaluated.args
 
-        return unwrap_return_value(evaluated)
-    elif isinstance(fn, objects.Builtin):
-        return fn.fn(args)
-    return new_error(f"not a function {fn.object_type().value}")
+    if isinstance(fn, objects.Callable):
+        # A builtin, or a function made by another engine.
+        return check(fn.call(args))
+    raise EvaluationError(new_error(f"not a function {fn.object_type().value}"))
 
 
 def extend_function_env(
     fn: objects.Function, args: List[objects.Object]
 ) -> Union[objects.Environment, objects.Error]:
-    env = objects.Environment({}, fn.env)
-
+    if fn.slots is None:
+        env = objects.Environment({}, fn.env)
+        for i, param in enumerate(fn.parameters):
+            try:
+                env.set(param.value, args[i])
+            except IndexError:
+                return objects.Error(f"{param.value} not supplied")
+        return env
+
+    env = objects.Frame(fn.slots, fn.env)
     for i, param in enumerate(fn.parameters):
         try:
-            env.set(param.value, args[i])
+            env.slots[param.slot] = args[i]
         except IndexError:
             return objects.Error(f"{param.value} not supplied")
     return env
-
-
-def unwrap_return_value(obj: objects.Object) -> objects.Object:
-    if isinstance(obj, objects.ReturnValue):
-        return obj.value
-    return obj
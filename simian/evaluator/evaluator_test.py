@@ -2,13 +2,13 @@ import os
 import simian.lexer as lexer
 import simian.parser as parser
 import simian.objects as objects
-import simian.evaluator as evaluator
 from simian.objects import String, Integer, Boolean
 
+
 ##############
 # STATEMENTS #
 ##############
-def test_let_statements():
+def test_let_statements(evaluate):
     tests = [
         ("let a = 5; a;", 5),
         ("let a = 5 * 5; a;", 25),
@@ -18,10 +18,10 @@ def test_let_statements():
 
     for tt in tests:
         input_, expected = tt
-        assert integer_object_tester(evaluate_input(input_), expected)
+        assert integer_object_tester(evaluate_input(evaluate, input_), expected)
 
 
-def evaluate_return_statements():
+def evaluate_return_statements(evaluate):
     tests = [
         ("return 10;", 10),
         ("return 10; 9;", 10),
@@ -44,11 +44,11 @@ def evaluate_return_statements():
         expected: int
         evaluated: objects.Object
 
-        evaluated = evaluate_input(input_)
+        evaluated = evaluate_input(evaluate, input_)
         assert integer_object_tester(evaluated, expected)
 
 
-def test_while_statements():
+def test_while_statements(evaluate):
     tests = [
         (
             """
@@ -64,7 +64,7 @@ def test_while_statements():
     ]
     for tt in tests:
         input_, expected = tt
-        evaluated = evaluate_input(input_)
+        evaluated = evaluate_input(evaluate, input_)
         for i, el in enumerate(evaluated.elements):
             assert integer_object_tester(el, expected[i])
 
@@ -73,7 +73,7 @@ def test_while_statements():
 # EXPRESSIONS #
 # (LITERALS)  #
 ###############
-def test_evaluate_integer_expression():
+def test_evaluate_integer_expression(evaluate):
     tests = [
         ("5", 5),
         ("10", 10),
@@ -90,6 +90,9 @@ def test_evaluate_integer_expression():
         ("3 * 3 * 3 + 10", 37),
         ("3 * (3 * 3) + 10", 37),
         ("(5 + 10 * 2 + 15 / 3) * 2 + -10", 50),
+        ("5 / 2 + 1", 3.5),
+        ("-(5 / 2)", -2.5),
+        ("1000 * 1000", 1000000),
     ]
     for tt in tests:
         input_: str
@@ -97,18 +100,18 @@ def test_evaluate_integer_expression():
         evaluated: objects.Object
 
         input_, expected = tt
-        evaluated = evaluate_input(input_)
+        evaluated = evaluate_input(evaluate, input_)
         assert integer_object_tester(evaluated, expected)
 
 
-def test_evaluate_string_literal():
+def test_evaluate_string_literal(evaluate):
     input_ = '"Hello World!'
-    evaluated = evaluate_input(input_)
+    evaluated = evaluate_input(evaluate, input_)
     assert isinstance(evaluated, objects.String)
     assert evaluated.value == "Hello World!"
 
 
-def test_evaluate_boolean_expression():
+def test_evaluate_boolean_expression(evaluate):
     tests = [
         ("true", True),
         ("false", False),
@@ -141,11 +144,11 @@ def test_evaluate_boolean_expression():
         evaluated: objects.Object
 
         input_, expected = tt
-        evaluated = evaluate_input(input_)
+        evaluated = evaluate_input(evaluate, input_)
         assert boolean_object_tester(evaluated, expected)
 
 
-def test_function_application():
+def test_function_application(evaluate):
     tests = [
         ("let identity = fn(x) { x; }; identity(5);", 5),
         ("let identity = fn(x) { return x; }; identity(5);", 5),
@@ -161,13 +164,103 @@ def test_function_application():
         evaluated: objects.Object
 
         input_, expected = tt
-        evaluated = evaluate_input(input_)
+        evaluated = evaluate_input(evaluate, input_)
         assert integer_object_tester(evaluated, expected)
 
 
-def test_evaluate_array_literals():
+def test_return_and_error_propagation(evaluate):
+    tests = [
+        ("let f = fn() { if (true) { if (true) { return 1; } 2 } 3 }; f();", 1),
+        (
+            "let f = fn() { let i = 0; while (i < 3) { let i = i + 1; if (i == 2) { return 10; } } i }; f();",
+            3,
+        ),
+        ("let f = fn() { return 2; 3 }; let g = fn() { f() + 1 }; g();", 3),
+        ("if (true) { return 4; }; 5", 4),
+    ]
+    for tt in tests:
+        input_, expected = tt
+        assert integer_object_tester(evaluate_input(evaluate, input_), expected)
+
+    tests = [
+        ("let f = fn() { [1, 2 + g()] }; f(); 5", "identifier not found: g"),
+        ('let h = {"a": len(1)}; 5', "argument to `len` not supported, got INTEGER"),
+        ("let i = 0; while (i < 3) { let i = i + true; } i", "type mismatch: INTEGER + BOOLEAN"),
+        ("let f = fn(x) { x }; if (f()) { 1 }", "x not supplied"),
+    ]
+    for tt in tests:
+        input_, expected = tt
+        evaluated = evaluate_input(evaluate, input_)
+        assert isinstance(evaluated, objects.Error), input_
+        assert evaluated.message == expected
+
+
+def test_return_inside_an_if_used_as_a_value(evaluate):
+    tests = [
+        ("let x = if (true) { return 5; } else { 3 }; 7", 7),
+        ("let f = fn() { let x = if (true) { return 5; } else { 3 }; 7 }; f()", 7),
+        ("let x = if (true) { return 5; } else { 3 }; x; 7", 5),
+        ("let f = fn() { let x = if (true) { return 5; } else { 3 }; x; 7 }; f() + 1", 6),
+        ("let x = if (true) { if (true) { return 5; }; 6 } else { 3 }; [x, 7][1]", 7),
+        (
+            "let i = 0; let n = 0; while (i < 3) { let i = i + 1; "
+            "let x = if (i == 2) { return 9; } else { i }; x; let n = n + 1; } n",
+            2,
+        ),
+        (
+            "let x = if (true) { let i = 0; while (i < 2) { let i = i + 1; return 7; } 8 } "
+            "else { 4 }; x",
+            8,
+        ),
+    ]
+    for tt in tests:
+        input_, expected = tt
+        assert integer_object_tester(evaluate_input(evaluate, input_), expected), input_
+
+    evaluated = evaluate_input(evaluate, "let y = 1 + if (true) { return 5; } else { 3 }; y")
+    assert evaluated.message == "type mismatch: INTEGER + RETURN_VALUE"
+
+
+def test_tail_calls(evaluate):
+    tests = [
+        (
+            "let count = fn(n, acc) { if (n == 0) { return acc; } count(n - 1, acc + 1) }; count(100, 0);",
+            100,
+        ),
+        (
+            "let even = fn(n) { if (n == 0) { true } else { odd(n - 1) } }; let odd = fn(n) { if (n == 0) { false } else { even(n - 1) } }; even(101);",
+            False,
+        ),
+        ("let f = fn(x) { return len(x); }; f([1, 2]);", 2),
+        ("let f = fn(x) { x(1) }; f(fn(y) { y + 1 });", 2),
+    ]
+    for tt in tests:
+        input_, expected = tt
+        evaluated = evaluate_input(evaluate, input_)
+        if isinstance(expected, bool):
+            assert boolean_object_tester(evaluated, expected)
+        else:
+            assert integer_object_tester(evaluated, expected)
+
+    evaluated = evaluate_input(evaluate, "let f = fn() { g() }; f();")
+    assert isinstance(evaluated, objects.Error)
+    assert evaluated.message == "identifier not found: g"
+
+
+def test_deep_tail_recursion(evaluate):
+    tests = [
+        "let count = fn(n) { if (n == 0) { return 0; } count(n - 1) }; count(100000);",
+        "let f = fn(n) { if (n == 0) { 0 } else { f(n - 1) } }; f(3000)",
+        "let f = fn(n) { if (n == 0) { 0 } else { g(n - 1) } }; let g = fn(n) { f(n) }; f(3000)",
+    ]
+
+    for input_ in tests:
+        assert integer_object_tester(evaluate_input(evaluate, input_), 0)
+
+
+def test_evaluate_array_literals(evaluate):
     input_ = "[1, 2 * 2, 3 + 3]"
-    evaluated = evaluate_input(input_)
+    evaluated = evaluate_input(evaluate, input_)
     assert isinstance(evaluated, objects.Array)
     assert len(evaluated.elements) == 3
     assert integer_object_tester(evaluated.elements[0], 1)
@@ -175,7 +268,7 @@ def test_evaluate_array_literals():
     assert integer_object_tester(evaluated.elements[2], 6)
 
 
-def test_evaluate_hash_literals():
+def test_evaluate_hash_literals(evaluate):
     input_ = """
     let two = "two";
 	{
@@ -187,7 +280,7 @@ def test_evaluate_hash_literals():
 	false: 6
 	}
     """
-    evaluated = evaluate_input(input_)
+    evaluated = evaluate_input(evaluate, input_)
     assert isinstance(evaluated, objects.Hash)
     expected = {
         String("one").hash_key(): 1,
@@ -205,7 +298,7 @@ def test_evaluate_hash_literals():
         assert integer_object_tester(pair.value, expected_value)
 
 
-def test_evaluate_array_indexes():
+def test_evaluate_array_indexes(evaluate):
     tests = [
         ("[1, 2, 3][0]", 1,),
         ("[1, 2, 3][1]", 2,),
@@ -224,14 +317,14 @@ def test_evaluate_array_indexes():
         evaluated: objects.Object
 
         input_, expected = tt
-        evaluated = evaluate_input(input_)
+        evaluated = evaluate_input(evaluate, input_)
         if expected is None:
             null_object_tester(evaluated)
         else:
             integer_object_tester(evaluated, expected)
 
 
-def test_evaluate_hash_indexes():
+def test_evaluate_hash_indexes(evaluate):
     tests = [
         ('{"foo": 5}["foo"]', 5,),
         ('{"foo": 5}["bar"]', None,),
@@ -240,6 +333,11 @@ def test_evaluate_hash_indexes():
         ("{5: 5}[5]", 5,),
         ("{true: 5}[true]", 5,),
         ("{false: 5}[false]", 5,),
+        ("{1: 5}[true]", None,),
+        ("{true: 5}[1]", None,),
+        ('{"1": 5}[1]', None,),
+        ('{1: 5, "1": 6, true: 7}["1"]', 6,),
+        ("{1: 5}[4 / 4]", 5,),
     ]
     for tt in tests:
         input_: str
@@ -247,14 +345,14 @@ def test_evaluate_hash_indexes():
         evaluated: objects.Object
 
         input_, expected = tt
-        evaluated = evaluate_input(input_)
+        evaluated = evaluate_input(evaluate, input_)
         if expected is None:
-            null_object_tester(evaluated)
+            assert null_object_tester(evaluated)
         else:
-            integer_object_tester(evaluated, expected)
+            assert integer_object_tester(evaluated, expected)
 
 
-def test_evaluate_hash_selectors():
+def test_evaluate_hash_selectors(evaluate):
     tests = [
         ('{"foo": 5}.foo', 5),
         ('{"foo": 5}.bar', None),
@@ -270,7 +368,7 @@ def test_evaluate_hash_selectors():
         evaluated: objects.Object
 
         input_, expected = tt
-        evaluated = evaluate_input(input_)
+        evaluated = evaluate_input(evaluate, input_)
         if expected is None:
             null_object_tester(evaluated)
         else:
@@ -281,7 +379,7 @@ def test_evaluate_hash_selectors():
 # EXPRESSIONS #
 #  (COMPLEX)  #
 ###############
-def test_bang_operator():
+def test_bang_operator(evaluate):
     tests = [
         ("!true", False),
         ("!false", True),
@@ -296,11 +394,11 @@ def test_bang_operator():
         evaluated: objects.Object
 
         input_, expected = tt
-        evaluated = evaluate_input(input_)
+        evaluated = evaluate_input(evaluate, input_)
         assert boolean_object_tester(evaluated, expected)
 
 
-def test_if_else_expressions():
+def test_if_else_expressions(evaluate):
     tests = [
         ("if (true) { 10 }", 10),
         ("if (false) { 10 }", None),
@@ -316,14 +414,14 @@ def test_if_else_expressions():
         evaluated: objects.Object
 
         input_, expected = tt
-        evaluated = evaluate_input(input_)
+        evaluated = evaluate_input(evaluate, input_)
         if isinstance(expected, int):
             assert integer_object_tester(evaluated, expected)
         else:
             assert null_object_tester(evaluated)
 
 
-def test_closure_evaluation():
+def test_closure_evaluation(evaluate):
     input_ = """
 	let newAdder = fn(x) {
 		fn(y) { x + y };
@@ -331,27 +429,63 @@ def test_closure_evaluation():
 	let addTwo = newAdder(2);
 	addTwo(2);
 	"""
-    assert integer_object_tester(evaluate_input(input_), 4)
+    assert integer_object_tester(evaluate_input(evaluate, input_), 4)
 
 
-def test_string_concatenation():
+def test_string_concatenation(evaluate):
     input_ = '"Hello" + " " + "World!"'
-    evaluated = evaluate_input(input_)
+    evaluated = evaluate_input(evaluate, input_)
     assert isinstance(evaluated, objects.String)
     assert evaluated.value == "Hello World!"
 
 
-def test_array_concatenation():
+def test_long_string_concatenation(evaluate):
+    build = 'let s = ""; let i = 0; while (i < 300) { let s = s + "ab"; let i = i + 1; };'
+    tests = [
+        (build + "len(s)", 600),
+        (build + 'let t = s + "x"; let u = s + "yz"; len(t) * 1000 + len(u)', 601602),
+        (build + 'let t = s + "x"; let u = s + "yz"; if (t == s + "x") { 1 } else { 0 }', 1),
+        (build + 'let h = {s: 1}; h[s + ""] + h[s]', 2),
+        (build + 'len(split(s + s, "b"))', 601),
+    ]
+
+    for tt in tests:
+        input_, expected = tt
+        assert integer_object_tester(evaluate_input(evaluate, input_), expected)
+
+
+def test_array_concatenation(evaluate):
     input_ = "[1,2,3] + [0, 10];"
     expected = [1, 2, 3, 0, 10]
-    evaluated = evaluate_input(input_)
+    evaluated = evaluate_input(evaluate, input_)
     assert isinstance(evaluated, objects.Array)
 
     for i, el in enumerate(evaluated.elements):
         assert integer_object_tester(el, expected[i])
 
 
-def test_error_handling():
+def test_large_arrays(evaluate):
+    tests = [
+        (
+            "let a = []; let i = 0; while (i < 2000) { let a = push(a, i); let i = i + 1; }; a[1999] + a[1024] + len(a)",
+            1999 + 1024 + 2000,
+        ),
+        (
+            "let a = []; let i = 0; while (i < 100) { let a = push(a, i); let i = i + 1; }; let b = rest(rest(a)) + a; b[0] + b[97] + b[98] + last(b) + len(b)",
+            2 + 99 + 0 + 99 + 198,
+        ),
+        (
+            "let sum = fn(a, acc) { if (len(a) == 0) { acc } else { sum(rest(a), acc + first(a)) } }; let a = []; let i = 0; while (i < 100) { let a = push(a, i); let i = i + 1; }; sum(a, 0)",
+            4950,
+        ),
+    ]
+
+    for tt in tests:
+        input_, expected = tt
+        assert integer_object_tester(evaluate_input(evaluate, input_), expected)
+
+
+def test_error_handling(evaluate):
     tests = [
         ("5 + true;", "type mismatch: INTEGER + BOOLEAN",),
         ("5 + true; 5;", "type mismatch: INTEGER + BOOLEAN",),
@@ -380,12 +514,12 @@ def test_error_handling():
         evaluated: objects.Error
 
         input_, expected = tt
-        evaluated = evaluate_input(input_)
+        evaluated = evaluate_input(evaluate, input_)
         assert isinstance(evaluated, objects.Error)
         assert evaluated.message == expected
 
 
-def test_builtin_function_returning_ints_or_errors():
+def test_builtin_function_returning_ints_or_errors(evaluate):
     tests = [
         ('len("")', 0),
         ('len("four")', 4),
@@ -417,7 +551,7 @@ def test_builtin_function_returning_ints_or_errors():
         evaluated: objects.Object
 
         input_, expected = tt
-        evaluated = evaluate_input(input_)
+        evaluated = evaluate_input(evaluate, input_)
         if isinstance(expected, int):
             assert integer_object_tester(evaluated, expected)
         elif isinstance(expected, list):
@@ -428,7 +562,7 @@ def test_builtin_function_returning_ints_or_errors():
             assert evaluated.message == expected
 
 
-def test_builtin_function_returning_strings_or_errors():
+def test_builtin_function_returning_strings_or_errors(evaluate):
     tests = [
         ('join(["Hello", "World!"])', True, "wrong number of arguments. got=1, want=2"),
         (
@@ -476,7 +610,7 @@ def test_builtin_function_returning_strings_or_errors():
         evaluated: objects.Object
 
         input_, expected_an_error, expected = tt
-        evaluated = evaluate_input(input_)
+        evaluated = evaluate_input(evaluate, input_)
         if expected_an_error:
             assert isinstance(evaluated, objects.Error)
             assert evaluated.message == expected
@@ -485,7 +619,270 @@ def test_builtin_function_returning_strings_or_errors():
             assert evaluated.value == expected
 
 
-def test_builtin_function_returning_arrays_or_errors():
+def test_hash_builtins(evaluate):
+    tests = [
+        ('set({"a": 1}, "b", 2)', '{"a": 1, "b": 2}'),
+        ('set({"a": 1, "b": 2}, "a", 3)', '{"a": 3, "b": 2}'),
+        ('let h = {"a": 1}; set(h, "a", 2); h', '{"a": 1}'),
+        ('delete({"a": 1, "b": 2}, "a")', '{"b": 2}'),
+        ('delete({"a": 1}, "b")', '{"a": 1}'),
+        ('merge({"a": 1, "b": 2}, {"b": 3, 1: true})', '{"a": 1, "b": 3, 1: true}'),
+        ('merge({}, {"a": 1})', '{"a": 1}'),
+        ('keys(delete(set({"a": 1}, "b", 2), "a"))', "[b]"),
+        ('set({}, fn(x) { x }, 1)', "ERROR: unusable as hash key: FUNCTION"),
+        ('set([], 1, 1)', "ERROR: first argument to `set` must be HASH, got ARRAY"),
+        ('delete({"a": 1})', "ERROR: wrong number of arguments. got=1, want=2"),
+        ("merge({}, 1)", "ERROR: arguments to `merge` must be HASH, got INTEGER"),
+    ]
+
+    for tt in tests:
+        input_, expected = tt
+        assert str(evaluate_input(evaluate, input_)) == expected
+
+
+def test_set_builtins(evaluate):
+    tests = [
+        ("set_of()", "set_of([])"),
+        ('set_of([1, "a", true, 1, "a"])', "set_of([1, a, true])"),
+        ("set_of(range(3))", "set_of([0, 1, 2])"),
+        ("len(set_of([1, 2, 2, 3]))", "3"),
+        ('has(set_of([1, "a"]), "a")', "true"),
+        ('has(set_of([1, "a"]), "1")', "false"),
+        ("has(set_of([1]), [1])", "false"),
+        ("insert(set_of([1]), 2)", "set_of([1, 2])"),
+        ("insert(set_of([1]), 1)", "set_of([1])"),
+        ("let s = set_of([1]); let t = insert(s, 2); insert(s, 3)", "set_of([1, 3])"),
+        ("let s = set_of([1]); let t = insert(s, 2); has(s, 2)", "false"),
+        ("remove(set_of([1, 2, 3]), 2)", "set_of([1, 3])"),
+        ("remove(set_of([1]), 5)", "set_of([1])"),
+        ("union(set_of([1, 2]), set_of([2, 3]))", "set_of([1, 2, 3])"),
+        ("intersection(set_of([1, 2, 3]), set_of([3, 2, 5]))", "set_of([2, 3])"),
+        ("difference(set_of([1, 2, 3]), set_of([2]))", "set_of([1, 3])"),
+        ("sum(set_of([1, 2, 2, 3]))", "6"),
+        ("collect(map(set_of([1, 2]), fn(x) { x * 10 }))", "[10, 20]"),
+        ("let s = set_of([1, 2]); collect(map(s, fn(x) { len(insert(s, x + 10)) }))", "[3, 3]"),
+        ("let s = set_of([1, 2]); collect(map(s, fn(x) { len(union(s, set_of([x + 10]))) }))", "[3, 3]"),
+        ('type(set_of())', "SET"),
+        ("set_of([[1]])", "ERROR: unusable as set member: ARRAY"),
+        ("insert(set_of(), fn(x) { x })", "ERROR: unusable as set member: FUNCTION"),
+        ("set_of(1)", "ERROR: argument to `set_of` must be ARRAY, ITERATOR, SET or BYTES, got INTEGER"),
+        ("set_of([], 1)", "ERROR: wrong number of arguments. got=2, want=0 or 1"),
+        ("insert([1], 2)", "ERROR: first argument to `insert` must be SET, got ARRAY"),
+        ("insert(set_of(), 1, 2)", "ERROR: wrong number of arguments. got=3, want=2"),
+        ("set([1])", "ERROR: wrong number of arguments. got=1, want=3"),
+        ("add(set_of([1]), 2)", "ERROR: arguments to `add` must be ARRAY or INTEGER, got SET"),
+        ("has([1], 1)", "ERROR: first argument to `has` must be SET, got ARRAY"),
+        ("union(set_of(), [1])", "ERROR: arguments to `union` must be SET, got ARRAY"),
+        ("add([1, 2], [3, 4])", "[4, 6]"),
+    ]
+
+    for tt in tests:
+        input_, expected = tt
+        assert str(evaluate_input(evaluate, input_)) == expected
+
+
+def test_set_builtins_on_large_sets(evaluate):
+    input_ = """
+    let s = set_of();
+    let i = 0;
+    while (i < 1000) { let s = insert(s, i % 500); let i = i + 1; };
+    len(s) + len(intersection(s, set_of(range(250, 750))))
+    """
+    assert integer_object_tester(evaluate_input(evaluate, input_), 500 + 250)
+
+
+def test_hash_builtins_on_large_hashes(evaluate):
+    input_ = """
+    let h = {};
+    let i = 0;
+    while (i < 1000) { let h = set(h, i, i * 2); let i = i + 1; };
+    let j = 0;
+    while (j < 1000) { let h = delete(h, j); let j = j + 2; };
+    h[999] + h[501] + len(keys(h)) + first(keys(h))
+    """
+    assert integer_object_tester(evaluate_input(evaluate, input_), 1998 + 1002 + 500 + 1)
+
+
+def test_integer_array_builtins(evaluate):
+    tests = [
+        ("range_fill(5)", "[0, 1, 2, 3, 4]"),
+        ("range_fill(2, 5)", "[2, 3, 4]"),
+        ("range_fill(5, 2)", "[]"),
+        ("sum(range_fill(101))", "5050"),
+        ("sum([1, 2, 3])", "6"),
+        ("sum([])", "0"),
+        ("min([3, -1, 2])", "-1"),
+        ("max(rest(range_fill(10)))", "9"),
+        ("max([])", "null"),
+        ("add([1, 2, 3], [10, 20, 30])", "[11, 22, 33]"),
+        ("mul(range_fill(4), 3)", "[0, 3, 6, 9]"),
+        ("mul(2, [1, 2])", "[2, 4]"),
+        ("mul([4611686018427387904], 4)", "[18446744073709551616]"),
+        ("add(push(range_fill(2), 2), range_fill(3))", "[0, 2, 4]"),
+        ('push(range_fill(2), "x")', "[0, 1, x]"),
+        ("reverse(range_fill(3))", "[2, 1, 0]"),
+        ("range_fill(3) + [true]", "[0, 1, 2, true]"),
+        ('sum([1, "a"])', "ERROR: elements of `sum` argument must be INTEGER, got STRING"),
+        ('min("abc")', "ERROR: argument to `min` must be ARRAY, ITERATOR, SET or BYTES, got STRING"),
+        ("add([1], [1, 2])", "ERROR: arrays passed to `add` must have the same length, got 1 and 2"),
+        ("mul(1, 2)", "ERROR: one argument to `mul` must be ARRAY, got two INTEGER"),
+        ('range_fill("a")', "ERROR: arguments to `range_fill` must be INTEGER, got STRING"),
+        ("range_fill()", "ERROR: wrong number of arguments. got=0, want=1 or 2"),
+    ]
+
+    for tt in tests:
+        input_, expected = tt
+        assert str(evaluate_input(evaluate, input_)) == expected
+
+
+def test_puts_writes_values(evaluate, capsys):
+    evaluate_input(evaluate, 'puts(1, "a", [1, [2, "b"]], {"k": range_fill(2)})')
+    assert capsys.readouterr().out == '1\na\n[1, [2, b]]\n{"k": [0, 1]}\n'
+
+
+def test_slices(evaluate):
+    tests = [
+        ("let a = [1, 2, 3, 4, 5]; a[1:3]", "[2, 3]"),
+        ('[1, "a", true, 4][1:]', "[a, true, 4]"),
+        ("[1, 2, 3][:2]", "[1, 2]"),
+        ("[1, 2, 3][:]", "[1, 2, 3]"),
+        ("[1, 2, 3][:-1]", "[1, 2]"),
+        ("[1, 2, 3][-2:]", "[2, 3]"),
+        ("[1, 2, 3][5:]", "[]"),
+        ("[1, 2, 3][2:1]", "[]"),
+        ("let a = range_fill(1000); let b = a[100:200]; len(b) + first(b) + last(b)", "399"),
+        ("let a = range_fill(1000)[100:200]; a[99] + a[0]", "299"),
+        ("let a = range_fill(1000)[100:200]; a[100]", "null"),
+        ("first(rest(range_fill(10)[5:8]))", "6"),
+        ('let a = [1, "x", 3, 4]; push(a[0:2], 9)', "[1, x, 9]"),
+        ('let a = [1, "x", 3, 4]; a[0:2] + a[3:]', "[1, x, 4]"),
+        ('let a = [1, "x", 3, 4]; let b = push(a[0:2], 9); a', "[1, x, 3, 4]"),
+        ("sum(range_fill(10)[1:4])", "6"),
+        ("let f = fn(a) { a[1:] }; f([1, 2, 3])", "[2, 3]"),
+        ("slice([1, 2, 3], 1)", "[2, 3]"),
+        ("slice([1, 2, 3], 0, 2)", "[1, 2]"),
+        ('"abc"[0:1]', "ERROR: slice operator not supported: STRING"),
+        ("[1, 2][true:]", "ERROR: slice bounds must be INTEGER, got BOOLEAN"),
+        ('slice("abc", 1)', "ERROR: first argument to `slice` must be ARRAY, TENSOR or BYTES, got STRING"),
+        ("slice([1])", "ERROR: wrong number of arguments. got=1, want=2 or 3"),
+        ("[1, 2][x:]", "ERROR: identifier not found: x"),
+    ]
+
+    for tt in tests:
+        input_, expected = tt
+        assert str(evaluate_input(evaluate, input_)) == expected
+
+
+def test_bytes_builtins(evaluate):
+    tests = [
+        ('bytes("hi")', "b'hi'"),
+        ("bytes([104, 105, 0, 255])", "b'hi\\x00\\xff'"),
+        ("bytes(range_fill(2))", "b'\\x00\\x01'"),
+        ('len(bytes("héllo"))', "6"),
+        ('decode(bytes("héllo"))', "héllo"),
+        ('encode("hi", "utf-16-le")', "b'h\\x00i\\x00'"),
+        ('decode(encode("é", "latin-1"), "latin-1")', "é"),
+        ("bytes([7, 8, 9])[2]", "9"),
+        ("bytes([7, 8, 9])[3]", "null"),
+        ('bytes("abcdef")[1:3]', "b'bc'"),
+        ('slice(bytes("abcdef"), -2)', "b'ef'"),
+        ('bytes("ab") + bytes("cd")', "b'abcd'"),
+        ('let b = bytes("ab"); let c = b + b; c + b', "b'ababab'"),
+        ('push(bytes("ab"), 33)', "b'ab!'"),
+        ('let b = bytes("abc"); let c = push(b[0:2], 120); [b, c]', "[b'abc', b'abx']"),
+        ('let b = push(bytes("a"), 98); let c = push(b, 99); push(b, 100)', "b'abd'"),
+        ('bytes("ab") == bytes([97, 98])', "true"),
+        ('bytes("ab") != bytes("abc")[0:2]', "false"),
+        ('{bytes("k"): 1}[bytes("k")]', "1"),
+        ('type(bytes(""))', "BYTES"),
+        ("bytes([256])", "ERROR: elements of `bytes` argument must be from 0 to 255"),
+        ('bytes([1, "a"])', "ERROR: elements of `bytes` argument must be INTEGER, got STRING"),
+        ("bytes([1, 3 / 2])", "ERROR: elements of `bytes` argument must be whole INTEGERs, got 1.5"),
+        ("bytes([3 / 2, 256])", "ERROR: elements of `bytes` argument must be whole INTEGERs, got 1.5"),
+        ('push(bytes(""), 3 / 2)', "ERROR: second argument to `push` must be a byte (0 to 255), got 1.5"),
+        ('collect(map(bytes("abc"), fn(b) { b + 1 }))', "[98, 99, 100]"),
+        ('collect(filter(bytes("abc")[1:], fn(b) { b > 98 }))', "[99]"),
+        ('sum(bytes("ab"))', "195"),
+        ('collect(zip(bytes("ab"), [1, 2]))', "[[97, 1], [98, 2]]"),
+        ('len(set_of(bytes("abba")))', "2"),
+        ("bytes(1)", "ERROR: argument to `bytes` must be ARRAY or STRING, got INTEGER"),
+        ("decode(bytes([255]))", "ERROR: cannot decode as utf-8: invalid start byte"),
+        ('encode("x", "nope")', "ERROR: unknown encoding: nope"),
+        ('decode("x")', "ERROR: first argument to `decode` must be BYTES, got STRING"),
+        ('push(bytes(""), 256)', "ERROR: second argument to `push` must be a byte (0 to 255), got 256"),
+        ('bytes("a") - bytes("b")', "ERROR: unknown operator: BYTES - BYTES"),
+    ]
+
+    for tt in tests:
+        input_, expected = tt
+        assert str(evaluate_input(evaluate, input_)) == expected
+
+
+def test_records(evaluate):
+    tests = [
+        ('shape("x", "y")', "shape(x, y)"),
+        ('let P = shape("x", "y"); P(1, 2)', 'record({"x": 1, "y": 2})'),
+        ('let P = shape("x", "y"); let p = P(1, 2); p.x + p.y', "3"),
+        ('let P = shape("x", "y"); P(1, 2)["y"]', "2"),
+        ('let P = shape("x", "y"); P(1, 2).z', "null"),
+        ('record({"a": 1, "b": [2]})', 'record({"a": 1, "b": [2]})'),
+        ('record({"a": 1}).a', "1"),
+        ('type(record({}))', "RECORD"),
+        ("type(shape())", "SHAPE"),
+        (
+            'let A = shape("x", "y"); let B = shape("y", "x"); let f = fn(o) { o.x }; '
+            '[f(A(1, 2)), f(B(3, 4)), f({"x": 5}), f(A(6, 7)), f(record({"y": 8}))]',
+            "[1, 4, 5, 6, null]",
+        ),
+        ('let P = shape("x", "y"); P(1, 2)[0]', "ERROR: unusable as record field: INTEGER"),
+        ('let P = shape("x", "y"); P(1)', "ERROR: wrong number of arguments. got=1, want=2"),
+        ('shape("x", 1)', "ERROR: arguments to `shape` must be STRING, got INTEGER"),
+        ('shape("x", "x")', "ERROR: arguments to `shape` must be distinct"),
+        ("record(1)", "ERROR: argument to `record` must be HASH, got INTEGER"),
+        ("record({1: 2})", "ERROR: keys of `record` argument must be STRING, got INTEGER"),
+    ]
+
+    for tt in tests:
+        input_, expected = tt
+        assert str(evaluate_input(evaluate, input_)) == expected
+
+
+def test_iterator_builtins(evaluate):
+    tests = [
+        ("range(3)", "range(0, 3)"),
+        ("range(1, 10, 3)", "range(1, 10, 3)"),
+        ("collect(range(3))", "[0, 1, 2]"),
+        ("collect(range(5, 0, -2))", "[5, 3, 1]"),
+        ("len(range(2, 7))", "5"),
+        ("collect(map(range(4), fn(x) { x * x }))", "[0, 1, 4, 9]"),
+        ("collect(map([1, 2], fn(x) { x + 1 }))", "[2, 3]"),
+        ("collect(filter(range(10), fn(x) { x % 3 == 0 }))", "[0, 3, 6, 9]"),
+        ("collect(take(range(1000000000), 3))", "[0, 1, 2]"),
+        ("collect(drop(range(5), 3))", "[3, 4]"),
+        ('collect(zip(range(2), ["a", "b", "c"]))', "[[0, a], [1, b]]"),
+        ("map(range(3), len)", "<iterator>"),
+        ("let it = map(range(3), fn(x) { x * 2 }); sum(it) + sum(it)", "12"),
+        ("sum(range(101))", "5050"),
+        ("sum(filter(range(100000), fn(x) { x % 2 == 0 }))", "2499950000"),
+        ("max(map(range(5), fn(x) { 10 - x }))", "10"),
+        ("min(filter(range(5), fn(x) { false }))", "null"),
+        ("let double = fn(x) { x * 2 }; collect(map(map(range(3), double), double))", "[0, 4, 8]"),
+        ("first(collect(take(map(range(3), fn(x) { x }), 1)))", "0"),
+        ("range(1, 2, 0)", "ERROR: step of `range` must not be 0"),
+        ('range("a")', "ERROR: arguments to `range` must be INTEGER, got STRING"),
+        ("map(1, len)", "ERROR: argument to `map` must be ARRAY, ITERATOR, SET or BYTES, got INTEGER"),
+        ("filter([1], 1)", "ERROR: second argument to `filter` must be FUNCTION, got INTEGER"),
+        ("take(range(3), -1)", "ERROR: second argument to `take` must be a non-negative INTEGER, got -1"),
+        ('collect(map(range(3), fn(x) { x + "a" }))', "ERROR: type mismatch: INTEGER + STRING"),
+        ('sum(map(range(3), fn(x) { "a" }))', "ERROR: elements of `sum` argument must be INTEGER, got STRING"),
+    ]
+
+    for tt in tests:
+        input_, expected = tt
+        assert str(evaluate_input(evaluate, input_)) == expected
+
+
+def test_builtin_function_returning_arrays_or_errors(evaluate):
     tests = [
         ('split("Hello World!")', "wrong number of arguments. got=1, want=2"),
         (
@@ -519,7 +916,7 @@ def test_builtin_function_returning_arrays_or_errors():
         evaluated: objects.Object
 
         input_, expected = tt
-        evaluated = evaluate_input(input_)
+        evaluated = evaluate_input(evaluate, input_)
         if isinstance(expected, str):
             assert isinstance(evaluated, objects.Error)
             assert evaluated.message == expected
@@ -534,12 +931,12 @@ def test_builtin_function_returning_arrays_or_errors():
 ####################
 #      HELPERS     #
 ####################
-def evaluate_input(input_: str) -> objects.Object:
+def evaluate_input(evaluate, input_: str) -> objects.Object:
     l = lexer.new(input_)
     p = parser.Parser(l, os.getcwd())
     program = p.parse_program()
     env = objects.new_environment()
-    return evaluator.evaluate(program, env)
+    return evaluate(program, env)
 
 
 def integer_object_tester(obj: objects.Object, expected: int) -> bool:
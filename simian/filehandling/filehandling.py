@@ -1,10 +1,11 @@
 import sys
 from pathlib import Path
 
+from simian import astcache
 from simian import lexer
-from simian import parser
-from simian.evaluator import evaluate
+from simian.engines import DEFAULT_ENGINE, get_engine
 from simian.objects import new_environment
+from simian.optimizer import optimize
 from simian.token import TokenType
 from simian.repl import print_errors
 
@@ -18,8 +19,7 @@ __all__ = [
 def lex_file(filepath: str) -> None:
     try:
         with open(filepath, "r") as f:
-            scanned = f.read()
-            l = lexer.new(scanned)
+            l = lexer.new(f)
             token = l.next_token()
             while token.token_type != TokenType.EOF:
                 print(f"Token: {{{token.token_type}}}, Literal: {{{token.literal}}}")
@@ -35,17 +35,16 @@ def lex_file(filepath: str) -> None:
 
 def parse_file(filepath: str) -> None:
     try:
-        with open(filepath, "r") as f:
-            scanned = f.read()
-            l = lexer.new(scanned)
-            path = Path(filepath)
-            p = parser.Parser(l, path.parents[0])
-            program = p.parse_program()
-            if len(p.errors) != 0:
-                print_errors(p.errors)
-            else:
-                print(str(program))
+        path = Path(filepath)
+        program, errors = astcache.load_program(path, path.parents[0])
+        if len(errors) != 0:
+            print_errors(errors)
+        else:
+            print(str(program))
 
+    except RecursionError:
+        # The parser takes any depth, but printing the program recurses.
+        print(f'\tERROR: File: "{filepath}" is nested too deeply to print.')
     except FileNotFoundError:
         print(f'\tERROR: File: "{filepath}" does not exist.')
     except IsADirectoryError:
@@ -55,22 +54,24 @@ def parse_file(filepath: str) -> None:
         sys.exit(0)
 
 
-def evaluate_file(filepath: str) -> None:
+def evaluate_file(filepath: str, engine: str = DEFAULT_ENGINE) -> None:
+    evaluate = get_engine(engine)
     try:
         env = new_environment()
-        with open(filepath, "r") as f:
-            scanned = f.read()
-            l = lexer.new(scanned)
-            path = Path(filepath)
-            p = parser.Parser(l, path.parents[0])
-            program = p.parse_program()
-            if len(p.errors) != 0:
-                print_errors(p.errors)
-            else:
-                evaluated = evaluate(program, env)
-                if evaluated is not None:
-                    print(str(evaluated))
+        path = Path(filepath)
+        program, errors = astcache.load_program(path, path.parents[0])
+        if len(errors) != 0:
+            print_errors(errors)
+        else:
+            evaluated = evaluate(optimize(program), env)
+            if evaluated is not None:
+                evaluated.write_to(sys.stdout)
+                sys.stdout.write("\n")
 
+    except RecursionError:
+        # From a program nested deeper than the engines recurse, or from
+        # monkey functions calling themselves without end.
+        print(f'\tERROR: File: "{filepath}" is nested or recurses too deeply to evaluate.')
     except FileNotFoundError:
         print(f'\tERROR: File: "{filepath}" does not exist.')
     except IsADirectoryError:
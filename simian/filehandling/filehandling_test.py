@@ -0,0 +1,50 @@
+import pytest
+
+from simian.engines import ENGINES
+from simian.filehandling import evaluate_file, parse_file
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_evaluating_a_deeply_nested_file(tmp_path, capsys, engine):
+    path = tmp_path / "deep.mo"
+    path.write_text(" + ".join(["1"] * 5000) + ";")
+    evaluate_file(str(path), engine)
+    assert capsys.readouterr().out == "5000\n"
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_files_too_deep_to_evaluate_are_reported(tmp_path, capsys, engine):
+    path = tmp_path / "deep.mo"
+    path.write_text("let x = 1; " + " + ".join(["x"] * 5000) + ";")
+    evaluate_file(str(path), engine)
+    assert capsys.readouterr().out == (
+        f'\tERROR: File: "{path}" is nested or recurses too deeply to evaluate.\n'
+    )
+
+
+def test_parse_errors_in_files_have_positions(tmp_path, capsys):
+    path = tmp_path / "broken.mo"
+    path.write_text("let x = 5;\nlet = 6;")
+    parse_file(str(path))
+    assert capsys.readouterr().out.startswith(
+        "\tExpected next token to be TokenType.IDENT, got TokenType.ASSIGN instead"
+        " at line 2, column 5.\n"
+    )
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_parse_errors_in_imported_files_have_positions(tmp_path, capsys, engine):
+    (tmp_path / "broken.mo").write_text("let double = fn(x) {\n  x *\n};")
+    path = tmp_path / "main.mo"
+    path.write_text('import("./broken.mo");')
+    evaluate_file(str(path), engine)
+    assert "found at line 3, column 1." in capsys.readouterr().out
+
+
+def test_files_too_deep_to_print_are_reported(tmp_path, capsys):
+    path = tmp_path / "deep.mo"
+    path.write_text(" + ".join(["1"] * 5000) + ";")
+    parse_file(str(path))
+    assert capsys.readouterr().out == (
+        f'\tERROR: File: "{path}" is nested too deeply to print.\n'
+    )
@@ -0,0 +1,3 @@
+from .incremental import Document, parse_document, edit_document
+
+__all__ = ["Document", "parse_document", "edit_document"]
@@ -0,0 +1,179 @@
+import array
+import bisect
+from typing import List, Optional
+
+import simian.ast as ast
+from simian.lexer import TokenStore, tokenize
+from simian.lexer.lexer import OFFSET, TOKEN_PATTERN, type_code
+from simian.parser import Parser
+from simian.token import TokenType
+
+__all__ = ["Document", "parse_document", "edit_document"]
+
+
+class Document:
+    """A source parsed a top-level statement at a time, kept so that an edit
+    to it can be relexed and reparsed around the edit only.
+
+    `statements[k]` was parsed from the tokens `starts[k]` to `ends[k]`,
+    the token after its last, which the parser peeked at to end it and so
+    which it also depends on. It is None where parsing failed, and
+    `errors[k]` holds its parse errors.
+    """
+
+    __slots__ = ("tokens", "current_dir", "statements", "starts", "ends", "errors")
+
+    def __init__(
+        self,
+        tokens: TokenStore,
+        current_dir: str,
+        statements: List[Optional[ast.Statement]],
+        starts: List[int],
+        ends: List[int],
+        errors: List[List[str]],
+    ) -> None:
+        self.tokens = tokens
+        self.current_dir = current_dir
+        self.statements = statements
+        self.starts = starts
+        self.ends = ends
+        self.errors = errors
+
+    @property
+    def source(self) -> str:
+        return self.tokens.source
+
+    @property
+    def program(self) -> ast.Program:
+        program = ast.Program()
+        program.statements = [stmt for stmt in self.statements if stmt is not None]
+        return program
+
+    def parser_errors(self) -> List[str]:
+        return [error for errors in self.errors for error in errors]
+
+
+def parse_document(source: str, current_dir: str) -> Document:
+    document = Document(tokenize(source), current_dir, [], [], [], [])
+    parse_statements(document, 0)
+    return document
+
+
+def edit_document(
+    document: Document, offset: int, removed: int, inserted: str
+) -> Document:
+    """`document` with the `removed` characters at `offset` replaced by
+    `inserted`. Only the tokens the edit can have changed are lexed again,
+    and only the top-level statements that depend on those tokens are
+    parsed again: the rest are shared with `document`.
+    """
+    old = document.tokens
+    source = old.source[:offset] + inserted + old.source[offset + removed :]
+    tokens, first, resynced, shift = relex(old, source, offset, removed, len(inserted))
+    edited = Document(tokens, document.current_dir, [], [], [], [])
+
+    # Keep the statements that end before the first changed token.
+    kept = bisect.bisect_left(document.ends, first)
+    edited.statements = document.statements[:kept]
+    edited.starts = document.starts[:kept]
+    edited.ends = document.ends[:kept]
+    edited.errors = document.errors[:kept]
+    start = edited.ends[-1] if kept else 0
+
+    # Reparse until a statement starts where an old one did, past the
+    # changed tokens, and take the old statements from there.
+    old_starts = document.starts
+
+    def reusable(index: int) -> Optional[int]:
+        if index < resynced:
+            return None
+        k = bisect.bisect_left(old_starts, index - shift)
+        if k < len(old_starts) and old_starts[k] == index - shift:
+            return k
+        return None
+
+    k = parse_statements(edited, start, reusable)
+    if k is not None:
+        for k in range(k, len(document.statements)):
+            edited.starts.append(document.starts[k] + shift)
+            edited.ends.append(document.ends[k] + shift)
+            if document.errors[k]:
+                # Parsed again only to place its errors in the new source.
+                stmt, errors = parse_statement(edited, edited.starts[-1])
+                edited.statements.append(stmt)
+                edited.errors.append(errors)
+            else:
+                edited.statements.append(document.statements[k])
+                edited.errors.append([])
+    return edited
+
+
+def relex(old: TokenStore, source: str, offset: int, removed: int, inserted: int):
+    """Relex `source`, which is `old.source` edited at `offset`, starting
+    from the last token whose match ends before the edit: it can't have
+    changed, as matches look at most one character past their end. Stop
+    once a match starts past the edit where an old one did, as from there
+    on the text, and so the tokens, are the same.
+
+    Returns the TokenStore, the index of the first relexed token, the
+    index the reused old tokens start at and how far their indexes moved.
+    """
+    delta = inserted - removed
+    edit_end = offset + inserted
+    old_ends = old.ends
+    first = bisect.bisect_left(old_ends, offset)
+    position = old_ends[first - 1] if first else 0
+
+    types = old.types[:first]
+    starts = old.starts[:first]
+    ends = old.ends[:first]
+    reused = len(old)
+    for m in TOKEN_PATTERN.finditer(source, position):
+        position = m.start()
+        if position >= edit_end:
+            j = bisect.bisect_left(old_ends, position - delta)
+            # Never resync on the old EOF token: the new one is lexed.
+            if j < len(old_ends) - 1 and old_ends[j] == position - delta:
+                reused = j + 1
+                break
+        types.append(type_code(m))
+        starts.append(m.start(m.lastindex))
+        ends.append(m.end())
+
+    resynced = len(types)
+    types += old.types[reused:]
+    if delta:
+        starts += array.array(OFFSET, [s + delta for s in old.starts[reused:]])
+        ends += array.array(OFFSET, [e + delta for e in old.ends[reused:]])
+    else:
+        starts += old.starts[reused:]
+        ends += old.ends[reused:]
+    return TokenStore(source, types, starts, ends), first, resynced, resynced - reused
+
+
+def parse_statements(document: Document, start: int, reusable=None) -> Optional[int]:
+    """Parse top-level statements into `document` from token `start` up to
+    EOF, or until `reusable` returns the index of an old statement that
+    can be kept for the one about to be parsed, which is returned.
+    """
+    reader = document.tokens.reader(start)
+    p = Parser(reader, document.current_dir)
+    while p.current_token.token_type != TokenType.EOF:
+        index = reader.index - 1
+        if reusable is not None:
+            k = reusable(index)
+            if k is not None:
+                return k
+        errors = len(p.errors)
+        stmt = p.parse_statement()
+        p.next_token()
+        document.statements.append(stmt)
+        document.starts.append(index)
+        document.ends.append(reader.index - 1)
+        document.errors.append(p.errors[errors:])
+    return None
+
+
+def parse_statement(document: Document, start: int):
+    p = Parser(document.tokens.reader(start), document.current_dir)
+    return p.parse_statement(), p.errors
@@ -0,0 +1,58 @@
+import os
+
+import simian.ast as ast
+from simian.incremental import edit_document, parse_document
+from simian.lexer import tokenize
+
+SOURCE = """let a = 1;
+let add = fn(x, y) { x + y };
+// a comment
+let s = "a string";
+if (a == 1) { add(a, 2) } else { [1, 2][0:1] }
+puts(s)
+(a)
+let h = {"k": 1}.k;
+"""
+
+
+def test_edits_match_parsing_from_scratch():
+    tests = [
+        (SOURCE.index("1;"), 1, "42"),
+        (SOURCE.index("x + y"), 5, "x * (y"),
+        (SOURCE.index("// a"), 2, ""),
+        (SOURCE.index("string"), 0, '" + "'),
+        (SOURCE.index("== 1"), 1, ""),
+        (SOURCE.index("(a)"), 0, ";"),
+        (SOURCE.index("puts"), 0, "let = "),
+        (0, 0, "let z = 0;\n"),
+        (len(SOURCE), 0, "let tail"),
+        (0, len(SOURCE), ""),
+    ]
+
+    for offset, removed, inserted in tests:
+        document = parse_document(SOURCE, os.getcwd())
+        edited = edit_document(document, offset, removed, inserted)
+        source = SOURCE[:offset] + inserted + SOURCE[offset + removed :]
+        expected = parse_document(source, os.getcwd())
+        assert edited.source == source
+        assert list(edited.tokens.types) == list(tokenize(source).types)
+        assert list(edited.tokens.ends) == list(tokenize(source).ends)
+        assert ast.dump(edited.program) == ast.dump(expected.program)
+        assert (edited.starts, edited.ends) == (expected.starts, expected.ends)
+        assert edited.parser_errors() == expected.parser_errors()
+
+
+def test_edits_share_the_statements_they_leave_alone():
+    document = parse_document(SOURCE, os.getcwd())
+    offset = SOURCE.index('"a string"')
+    edited = edit_document(document, offset, len('"a string"'), "2")
+    shared = [a is b for a, b in zip(document.statements, edited.statements)]
+    assert shared == [True, True, True, False, True, True, True]
+
+
+def test_errors_after_an_edit_move_with_it():
+    source = "let a = 1;\nlet = 2;\n"
+    document = parse_document(source, os.getcwd())
+    assert document.parser_errors()[0].endswith("at line 2, column 5.")
+    edited = edit_document(document, 0, 0, "\n\n")
+    assert edited.parser_errors()[0].endswith("at line 4, column 5.")
@@ -1,3 +1,3 @@
-from .lexer import Lexer, new
+from .lexer import Lexer, RegexLexer, TokenStore, TokenReader, new, tokenize
 
-__all__ = ["Lexer", "new"]
+__all__ = ["Lexer", "RegexLexer", "TokenStore", "TokenReader", "new", "tokenize"]
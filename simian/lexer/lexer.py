@@ -1,7 +1,14 @@
+import array
+import bisect
+import codecs
+import mmap
+import re
 import string
+import typing
 from simian.token import Token, TokenType, lookup_ident
+from simian.token.token import keywords
 
-__all__ = ["Lexer", "new"]
+__all__ = ["Lexer", "RegexLexer", "TokenStore", "TokenReader", "new", "tokenize"]
 
 
 class Lexer:
@@ -166,7 +173,344 @@ def is_digit(ch: str) -> bool:
     return ch in string.digits
 
 
-def new(input_: str) -> Lexer:
-    l = Lexer(input_)
-    l.read_char()
-    return l
+# One alternative per kind of token, tried in order after any whitespace.
+# The last two always match, so the pattern never fails: `\0` ends the
+# input, as it does for Lexer, and any other character is ILLEGAL.
+TOKEN_PATTERN = re.compile(
+    r"""[ \t\n\r]*(?:
+        ([A-Za-z_]+)
+      | ([0-9]+)
+      | "([^"\0]*)["\0]?
+      | //([^\r\n\0]*)[\r\n\0]?
+      | (==|!=|&&|\|\||[-+!*/%<>=;(),{}\[\]:.])
+      | (\0|\Z)
+      | (.)
+    )""",
+    re.VERBOSE | re.DOTALL,
+)
+
+IDENT, INT, STRING, COMMENT, OPERATOR, EOF, ILLEGAL = range(1, 8)
+
+# Tokens are never mutated, so every keyword, operator and identifier
+# token with the same literal can be one shared Token.
+SHARED_TOKENS = {
+    literal: Token(token_type, literal)
+    for literal, token_type in list(keywords.items())
+    + [(t.value, t) for t in TokenType if not t.value.isalpha()]
+}
+EOF_TOKEN = Token(TokenType.EOF, "")
+
+
+# Characters read from a file at a time by RegexLexer.
+CHUNK_SIZE = 64 * 1024
+
+
+class RegexLexer:
+    """Produces the same tokens as Lexer, a whole token per match of
+    TOKEN_PATTERN rather than a character per call.
+
+    `input_` may also be a file object or mmap, which is read and lexed a
+    chunk at a time, so the whole file is never held in memory at once.
+    The matches of the last two tokens are kept, and where in the text
+    they were matched, for `position` to report.
+    """
+
+    __slots__ = ("input_", "matches", "tokens", "window", "last", "before_last")
+
+    def __init__(
+        self,
+        input_: typing.Union[str, typing.IO, mmap.mmap],
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None:
+        self.input_ = input_
+        if isinstance(input_, str):
+            self.window = Window(input_)
+            self.matches = TOKEN_PATTERN.finditer(input_)
+        else:
+            self.window = Window("")
+            self.matches = stream_matches(read_chunks(input_, chunk_size))
+        self.tokens = dict(SHARED_TOKENS)
+        self.last: typing.Optional[typing.Tuple[re.Match, Window]] = None
+        self.before_last: typing.Optional[typing.Tuple[re.Match, Window]] = None
+
+    def next_token(self) -> Token:
+        m = next(self.matches, None)
+        if m is None:
+            return EOF_TOKEN
+        window = self.window
+        if window.text is not m.string:
+            # A stream's next buffer, which starts where the last token ended.
+            end = 0 if self.last is None else self.last[0].end()
+            window = self.window = window.moved(m.string, end)
+        self.before_last = self.last
+        self.last = (m, window)
+        kind = m.lastindex
+        literal = m.group(kind)
+        if kind == IDENT or kind == OPERATOR:
+            tok = self.tokens.get(literal, None)
+            if tok is None:
+                tok = self.tokens[literal] = Token(TokenType.IDENT, literal)
+            return tok
+        elif kind == INT:
+            return Token(TokenType.INT, literal)
+        elif kind == STRING:
+            return Token(TokenType.STRING, literal)
+        elif kind == COMMENT:
+            return Token(TokenType.COMMENT, literal)
+        elif kind == EOF:
+            return EOF_TOKEN
+        return Token(TokenType.ILLEGAL, literal)
+
+    def position(self, last: bool = False) -> typing.Tuple[int, int]:
+        """The line and column the token before last starts at, or with
+        `last`, the last token returned.
+        """
+        token = self.last if last else self.before_last
+        if token is None:
+            return 1, 1
+        m, window = token
+        kind = m.lastindex
+        offset = m.start(kind)
+        if kind == STRING:
+            offset -= 1
+        elif kind == COMMENT:
+            offset -= 2
+        return window.line_column(offset)
+
+
+class Window:
+    """The part of a text held in `text`: its offset in the whole, and the
+    line and the offset that line starts at, in the whole, of `text[0]`.
+    """
+
+    __slots__ = ("text", "base", "line", "line_start")
+
+    def __init__(
+        self, text: str, base: int = 0, line: int = 1, line_start: int = 0
+    ) -> None:
+        self.text = text
+        self.base = base
+        self.line = line
+        self.line_start = line_start
+
+    def line_column(self, offset: int) -> typing.Tuple[int, int]:
+        """The line and column, both from 1, of `text[offset]`."""
+        text = self.text
+        line = self.line + text.count("\n", 0, offset)
+        newline = text.rfind("\n", 0, offset)
+        if newline >= 0:
+            return line, offset - newline
+        return line, self.base + offset - self.line_start + 1
+
+    def moved(self, text: str, end: int) -> "Window":
+        """The window onto `text`, which goes on from `self.text[end]`."""
+        line = self.line + self.text.count("\n", 0, end)
+        newline = self.text.rfind("\n", 0, end)
+        if newline >= 0:
+            line_start = self.base + newline + 1
+        else:
+            line_start = self.line_start
+        return Window(text, self.base + end, line, line_start)
+
+
+def read_chunks(
+    source: typing.Union[typing.IO, mmap.mmap], chunk_size: int
+) -> typing.Iterator[str]:
+    """The text of `source` in chunks of up to `chunk_size` characters.
+    Bytes, from a binary file or mmap, are decoded as UTF-8.
+    """
+    decoder = None
+    while True:
+        chunk = source.read(chunk_size)
+        if not isinstance(chunk, str):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder("utf-8")()
+            chunk = decoder.decode(chunk, final=not chunk)
+            if not chunk and decoder.getstate()[0]:
+                continue
+        if not chunk:
+            return
+        yield chunk
+
+
+def stream_matches(chunks: typing.Iterator[str]) -> typing.Iterator[re.Match]:
+    """Matches of TOKEN_PATTERN over the concatenation of `chunks`. A match
+    that reaches the end of what has been read so far may go on in the next
+    chunk (an identifier, a string, `=` before `=`), so it is retried with
+    more read before it is used: at least as much again as is pending, so a
+    token spanning many chunks is rescanned a few times, not once a chunk.
+    """
+    finditer = TOKEN_PATTERN.finditer
+    buffer = next(chunks, "")
+    position = 0
+    more = True
+    while True:
+        for m in finditer(buffer, position):
+            if more and m.end() == len(buffer):
+                position = m.start()
+                break
+            yield m
+        else:
+            return
+        pending = [buffer[position:]]
+        size = 0
+        while size == 0 or size < len(pending[0]):
+            chunk = next(chunks, None)
+            if chunk is None:
+                more = False
+                break
+            pending.append(chunk)
+            size += len(chunk)
+        buffer = "".join(pending)
+        position = 0
+
+
+def new(
+    input_: typing.Union[str, typing.IO, mmap.mmap], chunk_size: int = CHUNK_SIZE
+) -> RegexLexer:
+    return RegexLexer(input_, chunk_size)
+
+
+# The TokenType of each type code in a TokenStore.
+TOKEN_TYPES = list(TokenType)
+TYPE_CODES = {token_type: code for code, token_type in enumerate(TOKEN_TYPES)}
+IDENT_CODE = TYPE_CODES[TokenType.IDENT]
+STRING_CODE = TYPE_CODES[TokenType.STRING]
+COMMENT_CODE = TYPE_CODES[TokenType.COMMENT]
+EOF_CODE = TYPE_CODES[TokenType.EOF]
+# The type code of each keyword and operator, by literal.
+LITERAL_CODES = {
+    literal: TYPE_CODES[tok.token_type] for literal, tok in SHARED_TOKENS.items()
+}
+KIND_CODES = {
+    INT: TYPE_CODES[TokenType.INT],
+    STRING: STRING_CODE,
+    COMMENT: COMMENT_CODE,
+    EOF: EOF_CODE,
+    ILLEGAL: TYPE_CODES[TokenType.ILLEGAL],
+}
+# What may close the literal of a string or comment, as part of its match.
+TERMINATORS = {STRING_CODE: '"\0', COMMENT_CODE: "\r\n\0"}
+# Offsets are stored as unsigned 32-bit integers, so a TokenStore holds
+# sources of up to 4 GiB characters.
+OFFSET = "I"
+
+
+def type_code(m: re.Match) -> int:
+    kind = m.lastindex
+    if kind == IDENT or kind == OPERATOR:
+        return LITERAL_CODES.get(m.group(kind), IDENT_CODE)
+    return KIND_CODES[kind]
+
+
+class TokenStore:
+    """The tokens of `source` as three parallel arrays rather than a Token
+    object each: the token's type code (an index into TOKEN_TYPES), the
+    offset its literal starts at and the offset its match ends at, after
+    any closing quote. Tokens are made on demand by `token`, and line and
+    column numbers looked up by `line_column` in a table of the offsets
+    lines start at, built the first time it is needed.
+    """
+
+    __slots__ = ("source", "types", "starts", "ends", "lines")
+
+    def __init__(
+        self,
+        source: str,
+        types: typing.Optional[array.array] = None,
+        starts: typing.Optional[array.array] = None,
+        ends: typing.Optional[array.array] = None,
+    ) -> None:
+        self.source = source
+        self.types = array.array("B") if types is None else types
+        self.starts = array.array(OFFSET) if starts is None else starts
+        self.ends = array.array(OFFSET) if ends is None else ends
+        self.lines: typing.Optional[array.array] = None
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def token_type(self, i: int) -> TokenType:
+        return TOKEN_TYPES[self.types[i]]
+
+    def literal(self, i: int) -> str:
+        code = self.types[i]
+        if code == EOF_CODE:
+            return ""
+        start = self.starts[i]
+        end = self.ends[i]
+        terminators = TERMINATORS.get(code, None)
+        if terminators is not None and end > start and self.source[end - 1] in terminators:
+            end -= 1
+        return self.source[start:end]
+
+    def token(self, i: int) -> Token:
+        code = self.types[i]
+        if code == EOF_CODE:
+            return EOF_TOKEN
+        token_type = TOKEN_TYPES[code]
+        literal = self.literal(i)
+        tok = SHARED_TOKENS.get(literal, None)
+        if tok is not None and tok.token_type is token_type:
+            return tok
+        return Token(token_type, literal)
+
+    def offset(self, i: int) -> int:
+        """Where token `i` starts, at its opening quote or `//`."""
+        code = self.types[i]
+        if code == STRING_CODE:
+            return self.starts[i] - 1
+        elif code == COMMENT_CODE:
+            return self.starts[i] - 2
+        return self.starts[i]
+
+    def line_column(self, offset: int) -> typing.Tuple[int, int]:
+        """The line and column, both from 1, of `offset` in the source."""
+        if self.lines is None:
+            self.lines = array.array(
+                OFFSET, [0] + [m.end() for m in re.finditer("\n", self.source)]
+            )
+        line = bisect.bisect_right(self.lines, offset)
+        return line, offset - self.lines[line - 1] + 1
+
+    def reader(self, index: int = 0) -> "TokenReader":
+        return TokenReader(self, index)
+
+
+class TokenReader:
+    """Hands out the tokens of a TokenStore one at a time from `index`, as
+    a lexer would, so a Parser can read them. `index` is then the index of
+    the token `next_token` returned last, so the parser's current token is
+    at `index - 1`.
+    """
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store: TokenStore, index: int = 0) -> None:
+        self.store = store
+        self.index = index - 1
+
+    def next_token(self) -> Token:
+        self.index += 1
+        if self.index >= len(self.store.types):
+            return EOF_TOKEN
+        return self.store.token(self.index)
+
+    def position(self, index: int) -> typing.Tuple[int, int]:
+        """The line and column token `index` starts at."""
+        store = self.store
+        index = min(index, len(store.types) - 1)
+        return store.line_column(store.offset(index))
+
+
+def tokenize(source: str) -> TokenStore:
+    """Lex all of `source` into a TokenStore, ending with its EOF token."""
+    store = TokenStore(source)
+    append_type = store.types.append
+    append_start = store.starts.append
+    append_end = store.ends.append
+    for m in TOKEN_PATTERN.finditer(source):
+        append_type(type_code(m))
+        append_start(m.start(m.lastindex))
+        append_end(m.end())
+    return store
@@ -1,10 +1,25 @@
+import io
+import mmap
+
 import pytest
 
-from simian.lexer import new
+import simian.lexer as lexer
 from simian.token import TokenType
 
 
-def test_next_token():
+def new_char_lexer(input_: str) -> lexer.Lexer:
+    l = lexer.Lexer(input_)
+    l.read_char()
+    return l
+
+
+@pytest.fixture(params=[lexer.new, new_char_lexer])
+def new(request):
+    """Each lexer's factory, for a test to run against."""
+    return request.param
+
+
+def test_next_token(new):
     input = """let five = 5;
     let ten = 10;
 	
@@ -153,3 +168,90 @@ def test_next_token():
         tok = l.next_token()
         assert tok.token_type == tt[0] and tok.literal == tt[1]
 
+
+def test_edge_cases(new):
+    tests = [
+        ("", [(TokenType.EOF, ""), (TokenType.EOF, "")]),
+        ("&|#", [(TokenType.ILLEGAL, "&"), (TokenType.ILLEGAL, "|"), (TokenType.ILLEGAL, "#")]),
+        ('"open', [(TokenType.STRING, "open"), (TokenType.EOF, "")]),
+        ("// end", [(TokenType.COMMENT, " end"), (TokenType.EOF, "")]),
+        ("a\0b", [(TokenType.IDENT, "a"), (TokenType.EOF, ""), (TokenType.IDENT, "b")]),
+        ("x1 é", [(TokenType.IDENT, "x"), (TokenType.INT, "1"), (TokenType.ILLEGAL, "é")]),
+        ("while_ ==\r\n=", [(TokenType.IDENT, "while_"), (TokenType.EQ, "=="), (TokenType.ASSIGN, "=")]),
+    ]
+
+    for input_, expected in tests:
+        l = new(input_)
+        for token_type, literal in expected:
+            tok = l.next_token()
+            assert (tok.token_type, tok.literal) == (token_type, literal), input_
+
+
+def test_streams_match_strings(tmp_path):
+    input_ = 'let greeting = "héllo, wörld"; // a comment\nif (a == b) { c != d && e || f }'
+    expected = tokens(lexer.new(input_))
+    # Small chunks split every token across a chunk boundary.
+    for chunk_size in (1, 2, 3, 5):
+        assert tokens(lexer.new(io.StringIO(input_), chunk_size)) == expected
+        assert tokens(lexer.new(io.BytesIO(input_.encode()), chunk_size)) == expected
+    path = tmp_path / "source.mo"
+    path.write_bytes(input_.encode())
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        assert tokens(lexer.new(m, 4)) == expected
+
+
+def test_streams_rescan_long_tokens_a_few_times(monkeypatch):
+    input_ = 'let s = "' + "x" * 100_000 + '"; ' + "y" * 100_000
+    expected = tokens(lexer.new(input_))
+    scanned = []
+
+    class Pattern:
+        def finditer(self, buffer, position):
+            scanned.append(len(buffer) - position)
+            return pattern.finditer(buffer, position)
+
+    pattern = lexer.lexer.TOKEN_PATTERN
+    monkeypatch.setattr(lexer.lexer, "TOKEN_PATTERN", Pattern())
+    assert tokens(lexer.new(io.StringIO(input_), 64)) == expected
+    # Once per chunk would be thousands of scans and hundreds of millions
+    # of characters.
+    assert sum(scanned) < 5 * len(input_)
+
+
+def test_token_stores_match_lexers():
+    input_ = 'let s = "a\tb"; // note\r\nif (x == 10) { y & z }\0 after'
+    expected = tokens(lexer.new(input_))
+    store = lexer.tokenize(input_)
+    assert tokens(store.reader()) == expected
+    assert [store.token_type(i) for i in range(len(expected))] == [t for t, _ in expected]
+    assert [store.literal(i) for i in range(len(expected))] == [l for _, l in expected]
+
+
+def test_token_store_positions():
+    store = lexer.tokenize('let a = 1;\n  "two" // three\r\n\nfour')
+    positions = [store.line_column(store.offset(i)) for i in range(len(store))]
+    assert positions == [(1, 1), (1, 5), (1, 7), (1, 9), (1, 10), (2, 3), (2, 9), (4, 1), (4, 5)]
+
+
+def test_stream_positions_match_token_stores():
+    input_ = 'let a = 1;\n  "two\nlines" // three\r\n\nfour héllo\n\n  "'
+    store = lexer.tokenize(input_)
+    expected = [store.line_column(store.offset(i)) for i in range(len(store))]
+    # Small chunks move every token into a later buffer than the one before.
+    for chunk_size in (1, 2, 3, 64):
+        for source in (io.StringIO(input_), io.BytesIO(input_.encode())):
+            l = lexer.new(source, chunk_size)
+            positions = []
+            for _ in expected:
+                l.next_token()
+                positions.append(l.position(last=True))
+            assert positions == expected
+
+
+def tokens(l) -> list:
+    result = []
+    tok = l.next_token()
+    while tok.token_type != TokenType.EOF:
+        result.append((tok.token_type, tok.literal))
+        tok = l.next_token()
+    return result
@@ -1,26 +1,43 @@
 from .objects import *
 from .environment import *
 from .builtins import *
+from .tensor import *
 
 __all__ = [
     "new_environment", 
     "new_enclosed_environment", 
     "Environment",
+    "Frame",
     "ObjectType",
     "Object",
     "Boolean",
     "Integer",
     "String",
+    "Bytes",
     "Hash",
-    "HashKey",
     "HashPair",
+    "Set",
+    "Shape",
+    "Record",
     "Hashable",
+    "Callable",
     "Null",
     "Error",
     "ReturnValue",
     "Function",
     "Builtin",
     "Array",
+    "ArraySlice",
+    "IntArray",
+    "Tensor",
+    "Iterator",
+    "Range",
     "Module",
     "BUILTINS",
+    "TRUE",
+    "FALSE",
+    "NULL",
+    "new_array",
+    "to_string",
+    "new_integer",
 ]
\ No newline at end of file
@@ -1,19 +1,36 @@
+import array
+import codecs
+import itertools
+import operator
 import sys
-from typing import List
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Union
 from simian import objects
 from simian.objects import ObjectType
-from simian.token import TokenType
 
 __all__ = ["BUILTINS"]
 
+# What `map`, `collect`, `sum` and the like can iterate over.
+ITERABLE_TYPES = (
+    ObjectType.ARRAY_OBJ,
+    ObjectType.ITERATOR_OBJ,
+    ObjectType.SET_OBJ,
+    ObjectType.BYTES_OBJ,
+)
+
+# What `slice` and `a[start:end]` can slice.
+SLICEABLE_TYPES = (ObjectType.ARRAY_OBJ, ObjectType.TENSOR_OBJ, ObjectType.BYTES_OBJ)
+
 
 def len_fn(args: List[objects.Object]) -> objects.Object:
     if len(args) != 1:
         return wrong_number_of_args(actual=len(args), expected=1)
-    if isinstance(args[0], objects.Array):
-        return objects.Integer(len(args[0].elements))
+    if isinstance(args[0], (objects.Array, objects.Range, objects.Set, objects.Bytes)):
+        return objects.new_integer(len(args[0]))
     elif isinstance(args[0], objects.String):
-        return objects.Integer(len(args[0].value))
+        return objects.new_integer(len(args[0].value))
+    elif args[0].object_type() == ObjectType.TENSOR_OBJ and args[0].array.ndim:
+        # Tensors are defined in simian.objects.tensor, which imports this.
+        return objects.new_integer(len(args[0]))
     return objects.Error(
         f"argument to `len` not supported, got {args[0].object_type().value}"
     )
@@ -26,10 +43,10 @@ def first_fn(args: List[objects.Object]) -> objects.Object:
         return objects.Error(
             f"argument to `first` must be ARRAY, got {args[0].object_type().value}"
         )
-    arr = args[0]
-    if len(arr.elements):
-        return arr.elements[0]
-    return objects.Null()
+    first = args[0].first()
+    if first is not None:
+        return first
+    return objects.NULL
 
 
 def last_fn(args: List[objects.Object]) -> objects.Object:
@@ -39,10 +56,10 @@ def last_fn(args: List[objects.Object]) -> objects.Object:
         return objects.Error(
             f"argument to `last` must be ARRAY, got {args[0].object_type().value}"
         )
-    arr = args[0]
-    if len(arr.elements):
-        return arr.elements[-1]
-    return objects.Null()
+    last = args[0].last()
+    if last is not None:
+        return last
+    return objects.NULL
 
 
 def rest_fn(args: List[objects.Object]) -> objects.Object:
@@ -52,29 +69,183 @@ def rest_fn(args: List[objects.Object]) -> objects.Object:
         return objects.Error(
             f"argument to `rest` must be ARRAY, got {args[0].object_type().value}"
         )
-    arr = args[0]
-    if len(arr.elements):
-        return objects.Array(arr.elements[1:])
-    return objects.Array([])
+    return args[0].rest()
+
+
+def slice_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) not in (2, 3):
+        return wrong_number_of_args(actual=len(args), expected="2 or 3")
+    if args[0].object_type() not in SLICEABLE_TYPES:
+        return objects.Error(
+            f"first argument to `slice` must be ARRAY, TENSOR or BYTES, got {args[0].object_type().value}"
+        )
+    return slice_of(*args)
 
 
 def push_fn(args: List[objects.Object]) -> objects.Object:
     if len(args) != 2:
         return wrong_number_of_args(actual=len(args), expected=2)
+    if args[0].object_type() == ObjectType.BYTES_OBJ:
+        byte = args[1]
+        if (
+            byte.object_type() != ObjectType.INTEGER_OBJ
+            or not isinstance(byte.value, int)
+            or not 0 <= byte.value < 256
+        ):
+            return objects.Error(
+                f"second argument to `push` must be a byte (0 to 255), got {byte}"
+            )
+        return args[0].push(byte.value)
     if args[0].object_type() != ObjectType.ARRAY_OBJ:
         return objects.Error(
-            f"first argument to `push` must be ARRAY, got {args[0].object_type().value}"
+            f"first argument to `push` must be ARRAY or BYTES, got {args[0].object_type().value}"
         )
-    arr = args[0]
-    new_elements = list(arr.elements)
-    new_elements.append(args[1])
-    return objects.Array(new_elements)
+    return args[0].push(args[1])
+
+
+def sum_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) != 1:
+        return wrong_number_of_args(actual=len(args), expected=1)
+    if args[0].object_type() == ObjectType.TENSOR_OBJ:
+        return args[0].sum()
+    if isinstance(args[0], objects.Range):
+        return objects.new_integer(sum(args[0].range))
+    return reduce_integers("sum", sum, args[0])
+
+
+def min_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) != 1:
+        return wrong_number_of_args(actual=len(args), expected=1)
+    return reduce_integers("min", lambda values: min(values, default=None), args[0])
+
+
+def max_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) != 1:
+        return wrong_number_of_args(actual=len(args), expected=1)
+    return reduce_integers("max", lambda values: max(values, default=None), args[0])
+
+
+def range_fill_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) not in (1, 2):
+        return wrong_number_of_args(actual=len(args), expected="1 or 2")
+    for arg in args:
+        if arg.object_type() != ObjectType.INTEGER_OBJ:
+            return objects.Error(
+                f"arguments to `range_fill` must be INTEGER, got {arg.object_type().value}"
+            )
+    bounds = range(*[int(arg.value) for arg in args])
+    try:
+        return objects.IntArray(array.array("q", bounds))
+    except OverflowError:
+        return objects.Array([objects.new_integer(v) for v in bounds])
+
+
+def add_fn(args: List[objects.Object]) -> objects.Object:
+    return elementwise("add", operator.add, args)
+
+
+def mul_fn(args: List[objects.Object]) -> objects.Object:
+    return elementwise("mul", operator.mul, args)
+
+
+def range_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) not in (1, 2, 3):
+        return wrong_number_of_args(actual=len(args), expected="1, 2 or 3")
+    for arg in args:
+        if arg.object_type() != ObjectType.INTEGER_OBJ:
+            return objects.Error(
+                f"arguments to `range` must be INTEGER, got {arg.object_type().value}"
+            )
+    bounds = [int(arg.value) for arg in args]
+    if len(bounds) == 3 and bounds[2] == 0:
+        return objects.Error("step of `range` must not be 0")
+    return objects.Range(range(*bounds))
+
+
+def map_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) != 2:
+        return wrong_number_of_args(actual=len(args), expected=2)
+    src, fn = args
+    error = check_iterable("map", src) or check_callable("map", fn)
+    if error is not None:
+        return error
+
+    def source():
+        for element in src:
+            yield checked(fn.call([element]))
+
+    return objects.Iterator(source)
+
+
+def filter_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) != 2:
+        return wrong_number_of_args(actual=len(args), expected=2)
+    src, fn = args
+    error = check_iterable("filter", src) or check_callable("filter", fn)
+    if error is not None:
+        return error
+
+    def source():
+        for element in src:
+            keep = checked(fn.call([element]))
+            if keep is not objects.NULL and keep is not objects.FALSE:
+                yield element
+
+    return objects.Iterator(source)
+
+
+def take_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) != 2:
+        return wrong_number_of_args(actual=len(args), expected=2)
+    src, n = args
+    error = check_iterable("take", src) or check_count("take", n)
+    if error is not None:
+        return error
+    return objects.Iterator(lambda: itertools.islice(src, n.value))
+
+
+def drop_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) != 2:
+        return wrong_number_of_args(actual=len(args), expected=2)
+    src, n = args
+    error = check_iterable("drop", src) or check_count("drop", n)
+    if error is not None:
+        return error
+    return objects.Iterator(lambda: itertools.islice(src, n.value, None))
+
+
+def zip_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) < 2:
+        return wrong_number_of_args(actual=len(args), expected="at least 2")
+    for arg in args:
+        error = check_iterable("zip", arg)
+        if error is not None:
+            return error
+    return objects.Iterator(
+        lambda: (objects.new_array(list(elements)) for elements in zip(*args))
+    )
+
+
+def collect_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) != 1:
+        return wrong_number_of_args(actual=len(args), expected=1)
+    src = args[0]
+    if src.object_type() == ObjectType.ARRAY_OBJ:
+        return src
+    error = check_iterable("collect", src)
+    if error is not None:
+        return error
+    try:
+        return objects.new_array(list(src))
+    except IterationError as e:
+        return e.error
 
 
 def puts_fn(args: List[objects.Object]) -> objects.Object:
     for arg in args:
-        print(str(arg))
-    return objects.Null()
+        arg.write_to(sys.stdout)
+        sys.stdout.write("\n")
+    return objects.NULL
 
 
 def exit_fn(args: List[objects.Object]) -> None:
@@ -104,22 +275,7 @@ def join_fn(args: List[objects.Object]) -> objects.Object:
             f"second argument to `join` must be STRING, got {args[1].object_type().value}"
         )
 
-    elements = args[0].elements
-    if len(elements) == 0:
-        return objects.String("")
-    if len(elements) == 1:
-        return objects.String(str(elements[0]))
-
-    max_ = len(elements) - 1
-
-    out = f""
-
-    for i, el in enumerate(elements):
-        out += str(el)
-        if i < max_:
-            out += str(args[1])
-
-    return objects.String(out)
+    return objects.String(str(args[1]).join(str(el) for el in args[0]))
 
 
 def split_fn(args: List[objects.Object]) -> objects.Object:
@@ -160,7 +316,7 @@ def keys_fn(args: List[objects.Object]) -> objects.Object:
             f"argument to `keys` must be HASH or MODULE, got {src.object_type().value}({src})"
         )
 
-    keys = [hash_pair.key for hash_key, hash_pair in hash_.pairs.items()]
+    keys = [hash_pair.key for hash_pair in hash_]
 
     return objects.Array(keys)
 
@@ -182,11 +338,211 @@ def values_fn(args: List[objects.Object]) -> objects.Object:
             f"argument to `values` must be HASH or MODULE, got {src.object_type().value}({src})"
         )
 
-    values = [hash_pair.value for hash_key, hash_pair in hash_.pairs.items()]
+    values = [hash_pair.value for hash_pair in hash_]
 
     return objects.Array(values)
 
 
+def set_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) != 3:
+        return wrong_number_of_args(actual=len(args), expected=3)
+    hash_, key, value = args
+    if hash_.object_type() != ObjectType.HASH_OBJ:
+        return objects.Error(
+            f"first argument to `set` must be HASH, got {hash_.object_type().value}"
+        )
+    if not isinstance(key, objects.Hashable):
+        return objects.Error(f"unusable as hash key: {key.object_type().value}")
+    return hash_.set(key.hash_key(), objects.HashPair(key, value))
+
+
+def delete_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) != 2:
+        return wrong_number_of_args(actual=len(args), expected=2)
+    hash_, key = args
+    if hash_.object_type() != ObjectType.HASH_OBJ:
+        return objects.Error(
+            f"first argument to `delete` must be HASH, got {hash_.object_type().value}"
+        )
+    if not isinstance(key, objects.Hashable):
+        return objects.Error(f"unusable as hash key: {key.object_type().value}")
+    return hash_.delete(key.hash_key())
+
+
+def merge_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) != 2:
+        return wrong_number_of_args(actual=len(args), expected=2)
+    for arg in args:
+        if arg.object_type() != ObjectType.HASH_OBJ:
+            return objects.Error(
+                f"arguments to `merge` must be HASH, got {arg.object_type().value}"
+            )
+    return args[0].merge(args[1])
+
+
+def set_of_fn(args: List[objects.Object]) -> objects.Object:
+    """`set_of()`, or `set_of(iterable)`: a Set of the iterable's elements."""
+    if len(args) > 1:
+        return wrong_number_of_args(actual=len(args), expected="0 or 1")
+    members = {}
+    if args:
+        src = args[0]
+        error = check_iterable("set_of", src)
+        if error is not None:
+            return error
+        try:
+            for member in src:
+                if not isinstance(member, objects.Hashable):
+                    return unusable_as_member(member)
+                members.setdefault(member.hash_key(), member)
+        except IterationError as e:
+            return e.error
+    return objects.Set(members)
+
+
+def has_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) != 2:
+        return wrong_number_of_args(actual=len(args), expected=2)
+    set_, member = args
+    if set_.object_type() != ObjectType.SET_OBJ:
+        return objects.Error(
+            f"first argument to `has` must be SET, got {set_.object_type().value}"
+        )
+    if not isinstance(member, objects.Hashable):
+        return objects.FALSE
+    return objects.TRUE if set_.has(member.hash_key()) else objects.FALSE
+
+
+def insert_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) != 2:
+        return wrong_number_of_args(actual=len(args), expected=2)
+    set_, member = args
+    if set_.object_type() != ObjectType.SET_OBJ:
+        return objects.Error(
+            f"first argument to `insert` must be SET, got {set_.object_type().value}"
+        )
+    if not isinstance(member, objects.Hashable):
+        return unusable_as_member(member)
+    return set_.add(member.hash_key(), member)
+
+
+def remove_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) != 2:
+        return wrong_number_of_args(actual=len(args), expected=2)
+    set_, member = args
+    if set_.object_type() != ObjectType.SET_OBJ:
+        return objects.Error(
+            f"first argument to `remove` must be SET, got {set_.object_type().value}"
+        )
+    if not isinstance(member, objects.Hashable):
+        return set_
+    return set_.remove(member.hash_key())
+
+
+def union_fn(args: List[objects.Object]) -> objects.Object:
+    return set_operation("union", objects.Set.union, args)
+
+
+def intersection_fn(args: List[objects.Object]) -> objects.Object:
+    return set_operation("intersection", objects.Set.intersection, args)
+
+
+def difference_fn(args: List[objects.Object]) -> objects.Object:
+    return set_operation("difference", objects.Set.difference, args)
+
+
+def bytes_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) != 1:
+        return wrong_number_of_args(actual=len(args), expected=1)
+    src = args[0]
+    if src.object_type() == ObjectType.BYTES_OBJ:
+        return src
+    if src.object_type() == ObjectType.STRING_OBJ:
+        return objects.Bytes(src.value.encode("utf-8"))
+    if src.object_type() != ObjectType.ARRAY_OBJ:
+        return objects.Error(
+            f"argument to `bytes` must be ARRAY or STRING, got {src.object_type().value}"
+        )
+    values = integer_values("bytes", src)
+    if isinstance(values, objects.Error):
+        return values
+    if isinstance(values, array.array):
+        # bytes() of an array('q') would copy its raw memory instead.
+        values = values.tolist()
+    try:
+        return objects.Bytes(bytes(values))
+    except TypeError:
+        # Fractions, from `/`, are INTEGER objects holding floats.
+        fraction = next(v for v in values if not isinstance(v, int))
+        return objects.Error(
+            f"elements of `bytes` argument must be whole INTEGERs, got {fraction}"
+        )
+    except ValueError:
+        return objects.Error("elements of `bytes` argument must be from 0 to 255")
+
+
+def encode_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) not in (1, 2):
+        return wrong_number_of_args(actual=len(args), expected="1 or 2")
+    if args[0].object_type() != ObjectType.STRING_OBJ:
+        return objects.Error(
+            f"first argument to `encode` must be STRING, got {args[0].object_type().value}"
+        )
+    encoding = encoding_of("encode", args)
+    if isinstance(encoding, objects.Error):
+        return encoding
+    try:
+        return objects.Bytes(args[0].value.encode(encoding))
+    except UnicodeError as e:
+        return objects.Error(f"cannot encode as {encoding}: {e.reason}")
+
+
+def decode_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) not in (1, 2):
+        return wrong_number_of_args(actual=len(args), expected="1 or 2")
+    if args[0].object_type() != ObjectType.BYTES_OBJ:
+        return objects.Error(
+            f"first argument to `decode` must be BYTES, got {args[0].object_type().value}"
+        )
+    encoding = encoding_of("decode", args)
+    if isinstance(encoding, objects.Error):
+        return encoding
+    try:
+        return objects.String(args[0].decode(encoding))
+    except UnicodeError as e:
+        return objects.Error(f"cannot decode as {encoding}: {e.reason}")
+
+
+def shape_fn(args: List[objects.Object]) -> objects.Object:
+    for arg in args:
+        if arg.object_type() != ObjectType.STRING_OBJ:
+            return objects.Error(
+                f"arguments to `shape` must be STRING, got {arg.object_type().value}"
+            )
+    fields = tuple(arg.value for arg in args)
+    if len(set(fields)) != len(fields):
+        return objects.Error("arguments to `shape` must be distinct")
+    return objects.Shape.of(fields)
+
+
+def record_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) != 1:
+        return wrong_number_of_args(actual=len(args), expected=1)
+    if args[0].object_type() != ObjectType.HASH_OBJ:
+        return objects.Error(
+            f"argument to `record` must be HASH, got {args[0].object_type().value}"
+        )
+    fields, values = [], []
+    for pair in args[0]:
+        if pair.key.object_type() != ObjectType.STRING_OBJ:
+            return objects.Error(
+                f"keys of `record` argument must be STRING, got {pair.key.object_type().value}"
+            )
+        fields.append(pair.key.value)
+        values.append(pair.value)
+    return objects.Record(objects.Shape.of(tuple(fields)), values)
+
+
 def type_fn(args: List[objects.Object]) -> objects.Object:
     if len(args) != 1:
         return wrong_number_of_args(actual=len(args), expected=1)
@@ -196,7 +552,10 @@ def type_fn(args: List[objects.Object]) -> objects.Object:
 def str_fn(args: List[objects.Object]) -> objects.Object:
     if len(args) != 1:
         return wrong_number_of_args(actual=len(args), expected=1)
-    return objects.String(str(args[0]))
+    if args[0].object_type() == ObjectType.STRING_OBJ:
+        # Strings are immutable, and a rope stays unjoined this way.
+        return args[0]
+    return objects.String(objects.to_string(args[0]))
 
 
 def int_fn(args: List[objects.Object]) -> objects.Object:
@@ -208,10 +567,7 @@ def int_fn(args: List[objects.Object]) -> objects.Object:
     elif src.object_type() == ObjectType.STRING_OBJ:
         print(src)
         try:
-            i = int(src.value)
-            ix = objects.Integer(TokenType.INT)
-            ix.value = i
-            return ix
+            return objects.new_integer(int(src.value))
         except ValueError:
             return objects.Error(
                 f"Cannot cast {src.object_type().value}({src}) to INTEGER"
@@ -223,6 +579,8 @@ def reverse_fn(args: List[objects.Object]) -> objects.Object:
     if len(args) != 1:
         return wrong_number_of_args(actual=len(args), expected=1)
     src = args[0]
+    if isinstance(src, objects.IntArray):
+        return objects.IntArray(src.packed()[::-1])
     if src.object_type() == ObjectType.ARRAY_OBJ:
         reversed_elements = src.elements[::-1]
         return objects.Array(reversed_elements)
@@ -238,24 +596,229 @@ def reverse_fn(args: List[objects.Object]) -> objects.Object:
 ####################
 
 
+def slice_of(
+    obj: objects.Object, start: objects.Object, end: objects.Object = objects.NULL
+) -> objects.Object:
+    """`obj[start:end]`, a view sharing `obj`'s elements. As in Python,
+    negative bounds count from the end, a NULL bound means the start or end
+    and out of range bounds are clamped."""
+    for bound in (start, end):
+        if bound is not objects.NULL and type(bound) is not objects.Integer:
+            return objects.Error(
+                f"slice bounds must be INTEGER, got {bound.object_type().value}"
+            )
+    lo, hi, _ = slice(
+        None if start is objects.NULL else int(start.value),
+        None if end is objects.NULL else int(end.value),
+    ).indices(len(obj))
+    return obj.slice(lo, hi if hi > lo else lo)
+
+
 def wrong_number_of_args(actual, expected=1):
     return objects.Error(f"wrong number of arguments. got={actual}, want={expected}")
 
 
+class IterationError(Exception):
+    """Raised inside a lazy iterator, e.g. when `map`'s function fails, to
+    stop whichever builtin is consuming it with `error`."""
+
+    def __init__(self, error: objects.Error):
+        self.error = error
+
+
+def checked(obj: objects.Object) -> objects.Object:
+    if type(obj) is objects.Error:
+        raise IterationError(obj)
+    return obj
+
+
+def check_iterable(name: str, arg: objects.Object) -> Optional[objects.Error]:
+    if arg.object_type() not in ITERABLE_TYPES:
+        return objects.Error(
+            f"argument to `{name}` must be ARRAY, ITERATOR, SET or BYTES, got {arg.object_type().value}"
+        )
+    return None
+
+
+def check_callable(name: str, arg: objects.Object) -> Optional[objects.Error]:
+    if not isinstance(arg, objects.Callable):
+        return objects.Error(
+            f"second argument to `{name}` must be FUNCTION, got {arg.object_type().value}"
+        )
+    return None
+
+
+def check_count(name: str, arg: objects.Object) -> Optional[objects.Error]:
+    if arg.object_type() != ObjectType.INTEGER_OBJ or arg.value < 0:
+        return objects.Error(
+            f"second argument to `{name}` must be a non-negative INTEGER, got {arg}"
+        )
+    return None
+
+
+def reduce_integers(
+    name: str, reduce: Callable[[Iterable[int]], Optional[int]], arg: objects.Object
+) -> objects.Object:
+    """`reduce` applied to the native values of an array or iterator of
+    integers, streamed so that iterators take constant memory. A None
+    result, from `min` or `max` of nothing, is NULL."""
+    if isinstance(arg, objects.IntArray):
+        values = arg.packed()
+    elif arg.object_type() in ITERABLE_TYPES:
+        values = integer_stream(name, arg)
+    else:
+        return objects.Error(
+            f"argument to `{name}` must be ARRAY, ITERATOR, SET or BYTES, got {arg.object_type().value}"
+        )
+    try:
+        result = reduce(values)
+    except IterationError as e:
+        return e.error
+    return objects.NULL if result is None else objects.new_integer(result)
+
+
+def integer_stream(name: str, elements: Iterable[objects.Object]) -> Iterator[int]:
+    for element in elements:
+        if element.object_type() != ObjectType.INTEGER_OBJ:
+            raise IterationError(
+                objects.Error(
+                    f"elements of `{name}` argument must be INTEGER, got {element.object_type().value}"
+                )
+            )
+        yield element.value
+
+
+def encoding_of(name: str, args: List[objects.Object]) -> Union[str, objects.Error]:
+    """The encoding named by the optional second argument, UTF-8 by default."""
+    if len(args) == 1:
+        return "utf-8"
+    if args[1].object_type() != ObjectType.STRING_OBJ:
+        return objects.Error(
+            f"second argument to `{name}` must be STRING, got {args[1].object_type().value}"
+        )
+    try:
+        return codecs.lookup(args[1].value).name
+    except LookupError:
+        return objects.Error(f"unknown encoding: {args[1].value}")
+
+
+def set_operation(
+    name: str,
+    op: Callable[[objects.Set, objects.Set], objects.Set],
+    args: List[objects.Object],
+) -> objects.Object:
+    if len(args) != 2:
+        return wrong_number_of_args(actual=len(args), expected=2)
+    for arg in args:
+        if arg.object_type() != ObjectType.SET_OBJ:
+            return objects.Error(
+                f"arguments to `{name}` must be SET, got {arg.object_type().value}"
+            )
+    return op(*args)
+
+
+def unusable_as_member(obj: objects.Object) -> objects.Error:
+    return objects.Error(f"unusable as set member: {obj.object_type().value}")
+
+
+def integer_values(
+    name: str, arg: objects.Object
+) -> Union[Sequence[int], objects.Error]:
+    """The native values of an array of integers, unboxed if it is packed."""
+    if isinstance(arg, objects.IntArray):
+        return arg.packed()
+    if arg.object_type() != ObjectType.ARRAY_OBJ:
+        return objects.Error(
+            f"argument to `{name}` must be ARRAY, got {arg.object_type().value}"
+        )
+    values = []
+    for element in arg:
+        if element.object_type() != ObjectType.INTEGER_OBJ:
+            return objects.Error(
+                f"elements of `{name}` argument must be INTEGER, got {element.object_type().value}"
+            )
+        values.append(element.value)
+    return values
+
+
+def elementwise(
+    name: str, op: Callable[[int, int], int], args: List[objects.Object]
+) -> objects.Object:
+    """`op` applied to each pair of elements of two equal-length arrays, or
+    to each element of one array and an integer."""
+    if len(args) != 2:
+        return wrong_number_of_args(actual=len(args), expected=2)
+    operands = []
+    lengths = []
+    for arg in args:
+        if arg.object_type() == ObjectType.INTEGER_OBJ:
+            operands.append(itertools.repeat(arg.value))
+        elif arg.object_type() == ObjectType.ARRAY_OBJ:
+            values = integer_values(name, arg)
+            if isinstance(values, objects.Error):
+                return values
+            operands.append(values)
+            lengths.append(len(values))
+        else:
+            return objects.Error(
+                f"arguments to `{name}` must be ARRAY or INTEGER, got {arg.object_type().value}"
+            )
+    if not lengths:
+        return objects.Error(f"one argument to `{name}` must be ARRAY, got two INTEGER")
+    if len(lengths) == 2 and lengths[0] != lengths[1]:
+        return objects.Error(
+            f"arrays passed to `{name}` must have the same length, got {lengths[0]} and {lengths[1]}"
+        )
+    try:
+        return objects.IntArray(array.array("q", map(op, *operands)))
+    except (OverflowError, TypeError):
+        # Results beyond 64 bits, or floats from `/`.
+        return objects.Array([objects.new_integer(v) for v in map(op, *operands)])
+
+
 BUILTINS = {
     "len": objects.Builtin(len_fn),
     "first": objects.Builtin(first_fn),
     "last": objects.Builtin(last_fn),
     "rest": objects.Builtin(rest_fn),
     "push": objects.Builtin(push_fn),
+    "slice": objects.Builtin(slice_fn),
     "puts": objects.Builtin(puts_fn),
     "exit": objects.Builtin(exit_fn),
     "join": objects.Builtin(join_fn),
     "split": objects.Builtin(split_fn),
     "keys": objects.Builtin(keys_fn),
     "values": objects.Builtin(values_fn),
+    "set": objects.Builtin(set_fn),
+    "delete": objects.Builtin(delete_fn),
+    "merge": objects.Builtin(merge_fn),
+    "set_of": objects.Builtin(set_of_fn),
+    "has": objects.Builtin(has_fn),
+    "insert": objects.Builtin(insert_fn),
+    "remove": objects.Builtin(remove_fn),
+    "union": objects.Builtin(union_fn),
+    "intersection": objects.Builtin(intersection_fn),
+    "difference": objects.Builtin(difference_fn),
+    "bytes": objects.Builtin(bytes_fn),
+    "shape": objects.Builtin(shape_fn),
+    "record": objects.Builtin(record_fn),
+    "encode": objects.Builtin(encode_fn),
+    "decode": objects.Builtin(decode_fn),
     "type": objects.Builtin(type_fn),
     "str": objects.Builtin(str_fn),
     "reverse": objects.Builtin(reverse_fn),
     "int": objects.Builtin(int_fn),
+    "sum": objects.Builtin(sum_fn),
+    "min": objects.Builtin(min_fn),
+    "max": objects.Builtin(max_fn),
+    "range_fill": objects.Builtin(range_fill_fn),
+    "add": objects.Builtin(add_fn),
+    "mul": objects.Builtin(mul_fn),
+    "range": objects.Builtin(range_fn),
+    "map": objects.Builtin(map_fn),
+    "filter": objects.Builtin(filter_fn),
+    "take": objects.Builtin(take_fn),
+    "drop": objects.Builtin(drop_fn),
+    "zip": objects.Builtin(zip_fn),
+    "collect": objects.Builtin(collect_fn),
 }
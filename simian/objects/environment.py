@@ -1,7 +1,7 @@
 from __future__ import annotations
 import simian.objects as objects
 
-__all__ = ["new_environment", "new_enclosed_environment", "Environment"]
+__all__ = ["new_environment", "new_enclosed_environment", "Environment", "Frame"]
 
 
 class Environment:
@@ -35,6 +35,38 @@ class Environment:
         return objects.Hash(pairs)
 
 
+class Frame(Environment):
+    """A function call's locals, stored by slot rather than by name.
+
+    `names` maps each local to its slot, as laid out by simian.resolver.
+    Names the resolver didn't see (e.g. code evaluated directly against the
+    frame) still work through the by-name `store`.
+    """
+
+    def __init__(self, names, outer: Environment):
+        self.store = {}
+        self.outer = outer
+        self.names = names
+        self.slots = [None] * len(names)
+
+    def get(self, name: str) -> objects.Object:
+        slot = self.names.get(name, None)
+        if slot is not None and self.slots[slot] is not None:
+            return self.slots[slot]
+        obj = self.store.get(name, None)
+        if obj is None and self.outer is not None:
+            return self.outer.get(name)
+        return obj
+
+    def set(self, name: str, val: objects.Object) -> objects.Object:
+        slot = self.names.get(name, None)
+        if slot is not None:
+            self.slots[slot] = val
+        else:
+            self.store[name] = val
+        return val
+
+
 def new_environment() -> Environment:
     return Environment({}, None)
 
@@ -0,0 +1,116 @@
+"""Helpers for the hash array mapped trie behind `objects.Hash`.
+
+A trie is either a bucket - a dict of up to BUCKET_SIZE entries - or a
+32-wide list of sub-tries indexed by the next 5 bits of each key's hash.
+Tries are never modified once a Hash holds them, so an update copies only
+the path to the key's bucket and that bucket: O(log n) time and memory.
+
+Unlike a textbook HAMT, whose slots hold single entries, the leaves here are
+dicts, so a lookup ends in one dict probe and a small hash is a single dict.
+"""
+from typing import Hashable, Iterable, Tuple, Union
+
+__all__ = []
+
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+BUCKET_SIZE = 64
+HASH_BITS = 64
+HASH_MASK = (1 << HASH_BITS) - 1
+
+Trie = Union[dict, list]
+
+
+def from_items(items: Iterable[Tuple[Hashable, object]], count: int) -> Trie:
+    """Build a trie holding the `count` distinct-keyed `items`."""
+    if count <= BUCKET_SIZE:
+        return dict(items)
+    # Size the trie up front so that each key is hashed and placed once.
+    depth = 1
+    while count > (BUCKET_SIZE // 2) << (BITS * depth):
+        depth += 1
+    root = empty(depth)
+    for key, value in items:
+        h = hash(key) & HASH_MASK
+        trie = root
+        while type(trie) is list:
+            trie = trie[h & MASK]
+            h >>= BITS
+        trie[key] = value
+    return split_full(root, 0)
+
+
+def empty(depth: int) -> Trie:
+    if depth == 0:
+        return {}
+    return [empty(depth - 1) for _ in range(WIDTH)]
+
+
+def split_full(trie: Trie, shift: int) -> Trie:
+    """Split any bucket of a freshly built trie that holds too many keys."""
+    if type(trie) is list:
+        for i, child in enumerate(trie):
+            trie[i] = split_full(child, shift + BITS)
+    elif len(trie) > BUCKET_SIZE:
+        return split(trie, shift)
+    return trie
+
+
+def get(trie: Trie, key: Hashable, default=None):
+    h = hash(key) & HASH_MASK
+    while type(trie) is list:
+        trie = trie[h & MASK]
+        h >>= BITS
+    return trie.get(key, default)
+
+
+def assoc(trie: Trie, key: Hashable, value) -> Trie:
+    return assoc_at(trie, hash(key) & HASH_MASK, 0, key, value)
+
+
+def assoc_at(trie: Trie, h: int, shift: int, key: Hashable, value) -> Trie:
+    if type(trie) is list:
+        i = (h >> shift) & MASK
+        trie = list(trie)
+        trie[i] = assoc_at(trie[i], h, shift + BITS, key, value)
+        return trie
+    bucket = dict(trie)
+    bucket[key] = value
+    if len(bucket) > BUCKET_SIZE:
+        return split(bucket, shift)
+    return bucket
+
+
+def dissoc(trie: Trie, key: Hashable) -> Trie:
+    """The trie without `key`, or `trie` itself if `key` is absent."""
+    return dissoc_at(trie, hash(key) & HASH_MASK, key)
+
+
+def dissoc_at(trie: Trie, h: int, key: Hashable) -> Trie:
+    if type(trie) is list:
+        i = h & MASK
+        child = dissoc_at(trie[i], h >> BITS, key)
+        if child is trie[i]:
+            return trie
+        trie = list(trie)
+        trie[i] = child
+        return trie
+    if key not in trie:
+        return trie
+    bucket = dict(trie)
+    del bucket[key]
+    return bucket
+
+
+def split(bucket: dict, shift: int) -> Trie:
+    if shift >= HASH_BITS:
+        # Every key has the same hash: nothing left to split on.
+        return bucket
+    tries = [{} for _ in range(WIDTH)]
+    for key, value in bucket.items():
+        tries[((hash(key) & HASH_MASK) >> shift) & MASK][key] = value
+    for i, trie in enumerate(tries):
+        if len(trie) > BUCKET_SIZE:
+            tries[i] = split(trie, shift + BITS)
+    return tries
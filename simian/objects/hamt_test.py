@@ -0,0 +1,75 @@
+import random
+import pytest
+from simian.objects import TRUE, Hash, HashPair, String, hamt, new_integer
+
+
+def pair(key, value=0) -> HashPair:
+    key_object = new_integer(key) if isinstance(key, int) else String(key)
+    return HashPair(key_object, new_integer(value))
+
+
+def check(hash_: Hash, model: dict):
+    assert len(hash_) == len(model)
+    assert list(hash_.pairs) == list(model)
+    for key, expected in model.items():
+        assert hash_.get(key) is expected
+
+
+@pytest.mark.parametrize("make_key", [int, str])
+def test_random_updates(make_key):
+    rng = random.Random(9)
+    # Enough keys that the root splits into buckets.
+    hash_, model = Hash({}), {}
+    versions = []
+    for _ in range(3000):
+        key = make_key(rng.randrange(400))
+        if rng.random() < 0.3:
+            hash_ = hash_.delete(key)
+            model.pop(key, None)
+        else:
+            p = pair(key)
+            hash_ = hash_.set(key, p)
+            model[key] = p
+        versions.append((hash_, dict(model)))
+        assert hash_.get(make_key(-1)) is None
+        assert hash_.get(TRUE) is None
+    check(hash_, model)
+    # Every earlier version is untouched.
+    for old, old_model in versions[::97]:
+        check(old, old_model)
+
+
+def test_insertion_order():
+    hash_ = Hash({k: pair(k) for k in "abc"})
+    hash_ = hash_.set("a", pair("a", 1)).delete("b").set("d", pair("d")).set("b", pair("b"))
+    assert list(hash_.pairs) == ["a", "c", "d", "b"]
+
+
+def test_merge():
+    left = Hash({k: pair(k) for k in range(100)})
+    right = Hash({k: pair(k, 1) for k in range(50, 150)})
+    merged = left.merge(right)
+    assert list(merged.pairs) == list(range(150))
+    assert merged.get(60) is right.get(60)
+    assert merged.get(10) is left.get(10)
+    assert len(left) == 100
+    assert Hash({}).merge(right) is right
+
+
+def test_delete_missing_key():
+    hash_ = Hash({1: pair(1)})
+    assert hash_.delete(2) is hash_
+    assert len(hash_.delete(1).delete(1)) == 0
+
+
+def test_full_hash_collisions():
+    class Colliding(int):
+        def __hash__(self):
+            return 7
+
+    trie = hamt.from_items(((Colliding(i), i) for i in range(200)), 200)
+    for i in range(200):
+        assert hamt.get(trie, Colliding(i)) == i
+    trie = hamt.dissoc(hamt.assoc(trie, Colliding(500), 500), Colliding(3))
+    assert hamt.get(trie, Colliding(500)) == 500
+    assert hamt.get(trie, Colliding(3)) is None
@@ -1,9 +1,14 @@
+import array
 import enum
+import io
+import itertools
 import typing
-from typing import List
+import weakref
+from typing import Dict, List, Optional
 
 from simian import ast
 from simian import objects
+from simian.objects import hamt, vector
 
 __all__ = [
     "ObjectType",
@@ -11,17 +16,31 @@ __all__ = [
     "Boolean",
     "Integer",
     "String",
+    "Bytes",
     "Hash",
-    "HashKey",
     "HashPair",
+    "Set",
+    "Shape",
+    "Record",
     "Hashable",
+    "Callable",
     "Null",
     "Error",
     "ReturnValue",
     "Function",
     "Builtin",
     "Array",
+    "ArraySlice",
+    "IntArray",
+    "Iterator",
+    "Range",
     "Module",
+    "TRUE",
+    "FALSE",
+    "NULL",
+    "new_array",
+    "to_string",
+    "new_integer",
 ]
 
 
@@ -36,22 +55,59 @@ class ObjectType(enum.Enum):
     BUILTIN_OBJ = "BUILTIN"
     ARRAY_OBJ = "ARRAY"
     HASH_OBJ = "HASH"
+    TENSOR_OBJ = "TENSOR"
+    ITERATOR_OBJ = "ITERATOR"
+    SET_OBJ = "SET"
+    BYTES_OBJ = "BYTES"
+    SHAPE_OBJ = "SHAPE"
+    RECORD_OBJ = "RECORD"
     MODULE = "MODULE"
 
 
 class Object:
+    __slots__ = ()
+
     def object_type(self) -> ObjectType:
         pass
 
+    def write_to(self, stream: typing.TextIO) -> None:
+        """Write `str(self)` to `stream`. Arrays, hashes and ropes override
+        this to write a piece at a time, so that printing a large value
+        never holds all of its text in memory at once."""
+        stream.write(str(self))
+
 
 class Hashable:
-    def hash_key(self):
+    """An object usable as a hash key.
+
+    `hash_key` gives the native value a `Hash` is keyed by: the int or str
+    itself for integers and strings, and the (singleton) object itself for
+    booleans, so keys of different types never compare equal.
+    """
+
+    __slots__ = ()
+
+    def hash_key(self) -> typing.Hashable:
+        raise NotImplementedError()
+
+
+class Callable:
+    """A function value, callable by builtins such as `map` whichever engine
+    made it.
+
+    `call` returns the function's result, or an Error instead of raising.
+    """
+
+    __slots__ = ()
+
+    def call(self, args: List[Object]) -> Object:
         raise NotImplementedError()
 
 
 class Boolean(Object, Hashable):
     _false_instance: typing.Optional["Boolean"] = None
     _true_instance: typing.Optional["Boolean"] = None
+    __slots__ = ("value",)
 
     def __new__(cls, value: bool) -> "Boolean":
         if value:
@@ -79,11 +135,12 @@ class Boolean(Object, Hashable):
         return str(self.value).lower()
 
     def hash_key(self):
-        val = 1 if self.value else 0
-        return HashKey(self.object_type(), val)
+        return self
 
 
 class Integer(Object, Hashable):
+    __slots__ = ("value",)
+
     def __init__(self, value: int):
         self.value = value
 
@@ -94,71 +151,453 @@ class Integer(Object, Hashable):
         return str(self.value)
 
     def hash_key(self):
-        return HashKey(self.object_type(), int(self.value))
+        return int(self.value)
+
+
+# Shared tips: a String's rope, Bytes, Set and IntArray are immutable, yet
+# appending to them doesn't copy. Each is a prefix of a buffer (a list, a
+# bytearray, a dict or an array('q')) that is shared with the objects made
+# from it and only ever appended to, so an older object still sees only its
+# own prefix. The object whose prefix is the whole buffer is the buffer's tip
+# and appends to it in place; any other object copies its prefix out first,
+# rather than clobbering what a later object appended.
 
 
 class String(Object, Hashable):
+    """A string. Concatenating long strings builds a rope instead of copying:
+    `_rope` is a `(parts, count)` pair meaning `"".join(parts[:count])`, and
+    `value` joins it the first time it is read. `parts` is a shared tip
+    (see the comment above) of which the string is the first `count` parts.
+    """
+
+    __slots__ = ("_value", "_rope")
+
     def __init__(self, value):
-        self.value = value
+        self._value = value
+        self._rope = None
+
+    @property
+    def value(self) -> str:
+        if self._rope is not None:
+            parts, count = self._rope
+            self._value = "".join(parts[:count])
+            self._rope = None
+        return self._value
+
+    def concat(self, other: "String") -> "String":
+        right = other.value
+        if self._rope is not None:
+            parts, count = self._rope
+            if len(parts) == count:
+                parts.append(right)
+                return String.from_rope(parts, count + 1)
+        left = self.value
+        if len(left) + len(right) < ROPE_MIN_LENGTH:
+            return String(left + right)
+        return String.from_rope([left, right], 2)
+
+    @classmethod
+    def from_rope(cls, parts: List[str], count: int) -> "String":
+        string = cls.__new__(cls)
+        string._value = None
+        string._rope = (parts, count)
+        return string
 
     def object_type(self):
         return ObjectType.STRING_OBJ
 
     def hash_key(self):
-        return HashKey(self.object_type(), hash(self.value))
+        return self.value
+
+    def write_to(self, stream: typing.TextIO) -> None:
+        if self._rope is None:
+            stream.write(self._value)
+            return
+        parts, count = self._rope
+        for part in itertools.islice(parts, count):
+            stream.write(part)
 
     def __str__(self):
         return self.value
 
 
-class HashKey(Object):
-    def __init__(self, object_type: ObjectType, value: int):
-        self.object_type = object_type
-        self.value = value
+class Bytes(Object, Hashable):
+    """An immutable byte string: `data[start:end]`, where `data` is a
+    `bytes` or a `bytearray`. Slices share `data` rather than copying it,
+    and reads go through a memoryview of it.
+
+    A bytearray `data` is a shared tip (see the comment above String), so
+    that building up a payload with `+` or `push` doesn't copy what was
+    already written.
+    """
+
+    __slots__ = ("data", "start", "end")
+
+    def __init__(self, data: typing.Union[bytes, bytearray]):
+        # Takes ownership of `data`.
+        self.data = data
+        self.start = 0
+        self.end = len(data)
+
+    @classmethod
+    def from_buffer(
+        cls, data: typing.Union[bytes, bytearray], start: int, end: int
+    ) -> "Bytes":
+        bytes_ = cls.__new__(cls)
+        bytes_.data = data
+        bytes_.start = start
+        bytes_.end = end
+        return bytes_
+
+    def object_type(self):
+        return ObjectType.BYTES_OBJ
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def view(self) -> memoryview:
+        """A memoryview of the bytes. Release it (use it in a `with`) before
+        anything appends to `data`, which can't be resized while viewed."""
+        return memoryview(self.data)[self.start : self.end]
+
+    def get(self, index: int) -> Optional[Integer]:
+        """The byte at `index`, or None when out of range."""
+        if index < 0 or index >= self.end - self.start:
+            return None
+        return new_integer(self.data[self.start + index])
+
+    def slice(self, start: int, end: int) -> "Bytes":
+        return Bytes.from_buffer(self.data, self.start + start, self.start + end)
+
+    def concat(self, other: "Bytes") -> "Bytes":
+        if other.end == other.start:
+            return self
+        data, start = self.appendable()
+        if other.data is data:
+            # `data` can't grow while `other` views it.
+            data += other.to_bytes()
+        else:
+            with other.view() as view:
+                data += view
+        return Bytes.from_buffer(data, start, len(data))
+
+    def push(self, byte: int) -> "Bytes":
+        """`byte`, which must be in range(256), appended."""
+        data, start = self.appendable()
+        data.append(byte)
+        return Bytes.from_buffer(data, start, len(data))
+
+    def appendable(self) -> typing.Tuple[bytearray, int]:
+        """A bytearray to append to and where this Bytes starts in it:
+        `data` itself if this is its tip, else a copy."""
+        if type(self.data) is bytearray and len(self.data) == self.end:
+            return self.data, self.start
+        with self.view() as view:
+            return bytearray(view), 0
+
+    def to_bytes(self) -> bytes:
+        if self.start == 0 and self.end == len(self.data) and type(self.data) is bytes:
+            return self.data
+        with self.view() as view:
+            return view.tobytes()
+
+    def decode(self, encoding: str) -> str:
+        with self.view() as view:
+            return str(view, encoding)
 
-    def __eq__(self, other: typing.Any) -> bool:
-        if isinstance(other, HashKey):
-            if other.object_type == self.object_type and other.value == self.value:
-                return True
-        return False
+    def hash_key(self):
+        return self.to_bytes()
 
-    def __ne__(self, other: typing.Any) -> bool:
-        if isinstance(other, HashKey):
-            if other.object_type == self.object_type and other.value == self.value:
-                return False
-        return True
+    def __iter__(self) -> typing.Iterator[Integer]:
+        return map(new_integer, self.data[self.start : self.end])
 
-    def __hash__(self) -> int:
-        return hash(f"{self.object_type}-{self.value}")
+    def __str__(self):
+        return repr(self.to_bytes())
 
 
 class HashPair(Object):
+    __slots__ = ("key", "value")
+
     def __init__(self, key: Object, value: Object):
         self.key = key
         self.value = value
 
 
 class Hash(Object):
-    def __init__(self, pairs: typing.Dict[HashKey, HashPair]):
-        self.pairs = pairs
+    """An immutable hash, stored as a hash array mapped trie (see
+    simian.objects.hamt) so that `set`, `delete` and `merge` share structure
+    with the hash they were made from instead of copying it.
+
+    The trie maps each key's `hash_key()` to its `(pair, position)`, where
+    `position` indexes `entries`: a persistent vector of the pairs in the
+    order their keys were first added, with None where a key was deleted.
+    """
+
+    __slots__ = ("root", "entries", "size")
+
+    def __init__(self, pairs: typing.Dict[typing.Hashable, HashPair]):
+        self.root = hamt.from_items(
+            ((key, (pair, i)) for i, (key, pair) in enumerate(pairs.items())),
+            len(pairs),
+        )
+        self.entries = vector.from_list(list(pairs.values()))
+        self.size = len(pairs)
+
+    @classmethod
+    def from_parts(cls, root: hamt.Trie, entries: vector.Parts, size: int) -> "Hash":
+        hash_ = cls.__new__(cls)
+        hash_.root = root
+        hash_.entries = entries
+        hash_.size = size
+        return hash_
 
     def object_type(self):
         return ObjectType.HASH_OBJ
 
+    def __len__(self) -> int:
+        return self.size
+
+    def get(self, key: typing.Hashable) -> Optional[HashPair]:
+        """The pair stored under the native `key`, or None."""
+        # hamt.get, inlined: this is every hash index expression.
+        trie = self.root
+        if type(trie) is list:
+            h = hash(key) & hamt.HASH_MASK
+            while type(trie) is list:
+                trie = trie[h & hamt.MASK]
+                h >>= hamt.BITS
+        found = trie.get(key)
+        return None if found is None else found[0]
+
+    def set(self, key: typing.Hashable, pair: HashPair) -> "Hash":
+        found = hamt.get(self.root, key)
+        if found is None:
+            position = self.entries[0]
+            entries = vector.push(self.entries, pair)
+            size = self.size + 1
+        else:
+            position = found[1]
+            entries = vector.assoc(self.entries, position, pair)
+            size = self.size
+        root = hamt.assoc(self.root, key, (pair, position))
+        return Hash.from_parts(root, entries, size)
+
+    def delete(self, key: typing.Hashable) -> "Hash":
+        found = hamt.get(self.root, key)
+        if found is None:
+            return self
+        if self.size <= self.entries[0] // 2:
+            # Mostly deleted entries: rebuild rather than keep carrying them.
+            pairs = self.pairs
+            del pairs[key]
+            return Hash(pairs)
+        root = hamt.dissoc(self.root, key)
+        entries = vector.assoc(self.entries, found[1], None)
+        return Hash.from_parts(root, entries, self.size - 1)
+
+    def merge(self, other: "Hash") -> "Hash":
+        """`other`'s pairs added to this hash's, replacing any with equal keys."""
+        if self.size == 0:
+            return other
+        merged = self
+        for pair in other:
+            merged = merged.set(pair.key.hash_key(), pair)
+        return merged
+
+    def __iter__(self) -> typing.Iterator[HashPair]:
+        for pair in vector.iterate(self.entries):
+            if pair is not None:
+                yield pair
+
+    @property
+    def pairs(self) -> typing.Dict[typing.Hashable, HashPair]:
+        """A copy of the pairs as a dict keyed by `hash_key()`."""
+        return {pair.key.hash_key(): pair for pair in self}
+
+    def write_to(self, stream: typing.TextIO) -> None:
+        stream.write("{")
+        separator = ""
+        for hash_pair in self:
+            stream.write(separator)
+            if isinstance(hash_pair.key, String):
+                stream.write('"')
+                hash_pair.key.write_to(stream)
+                stream.write('"')
+            else:
+                hash_pair.key.write_to(stream)
+            stream.write(": ")
+            hash_pair.value.write_to(stream)
+            separator = ", "
+        stream.write("}")
+
+    def __str__(self):
+        return to_string(self)
+
+
+class Set(Object):
+    """An immutable set of hashable objects, held as a dict from each
+    member's `hash_key()` to the member, so that membership is a single dict
+    probe and no HashPair is made per member.
+
+    `members` is a shared tip (see the comment above String) of which the
+    set is the first `size` entries. A set that is not the tip copies its
+    own entries out the first time it is used.
+    """
+
+    __slots__ = ("members", "size")
+
+    def __init__(self, members: typing.Dict[typing.Hashable, Object]):
+        # Takes ownership of `members`.
+        self.members = members
+        self.size = len(members)
+
+    @classmethod
+    def from_members(
+        cls, members: typing.Dict[typing.Hashable, Object], size: int
+    ) -> "Set":
+        set_ = cls.__new__(cls)
+        set_.members = members
+        set_.size = size
+        return set_
+
+    def object_type(self):
+        return ObjectType.SET_OBJ
+
+    def __len__(self) -> int:
+        return self.size
+
+    def own(self) -> typing.Dict[typing.Hashable, Object]:
+        """`members`, copied first if later sets have added to it."""
+        if len(self.members) != self.size:
+            self.members = dict(itertools.islice(self.members.items(), self.size))
+        return self.members
+
+    def has(self, key: typing.Hashable) -> bool:
+        return key in self.own()
+
+    def add(self, key: typing.Hashable, member: Object) -> "Set":
+        members = self.own()
+        if key in members:
+            return self
+        members[key] = member
+        return Set.from_members(members, self.size + 1)
+
+    def remove(self, key: typing.Hashable) -> "Set":
+        members = self.own()
+        if key not in members:
+            return self
+        members = dict(members)
+        del members[key]
+        return Set(members)
+
+    def union(self, other: "Set") -> "Set":
+        if other.size == 0 or other is self:
+            return self
+        members = self.own()
+        added = {k: v for k, v in other.own().items() if k not in members}
+        if not added:
+            return self
+        members.update(added)
+        return Set.from_members(members, len(members))
+
+    def intersection(self, other: "Set") -> "Set":
+        members, others = self.own(), other.own()
+        if len(others) < len(members):
+            return Set({k: members[k] for k in others if k in members})
+        return Set({k: v for k, v in members.items() if k in others})
+
+    def difference(self, other: "Set") -> "Set":
+        members, others = self.own(), other.own()
+        return Set({k: v for k, v in members.items() if k not in others})
+
+    def __iter__(self) -> typing.Iterator[Object]:
+        # A snapshot, as adding to the newest set appends to `members`,
+        # which a live view would then fail to go on iterating.
+        return iter(tuple(itertools.islice(self.members.values(), self.size)))
+
+    def write_to(self, stream: typing.TextIO) -> None:
+        stream.write("set_of([")
+        separator = ""
+        for member in self:
+            stream.write(separator)
+            member.write_to(stream)
+            separator = ", "
+        stream.write("])")
+
     def __str__(self):
-        ps = []
-        for hash_key, hash_pair in self.pairs.items():
-            key = hash_pair.key
-            key = (
-                '"' + str(key) + '"' if isinstance(hash_pair.key, String) else str(key)
+        return to_string(self)
+
+
+class Shape(Object, Callable):
+    """The field layout of records: the names of their fields, in order,
+    and the slot each is stored in. Shapes are interned by `Shape.of`, so
+    records with the same fields share one shape and comparing shapes is
+    `is`. Calling a shape makes a record of it.
+    """
+
+    __slots__ = ("fields", "index", "__weakref__")
+
+    def __init__(self, fields: typing.Tuple[str, ...]):
+        self.fields = fields
+        self.index = {name: slot for slot, name in enumerate(fields)}
+
+    @classmethod
+    def of(cls, fields: typing.Tuple[str, ...]) -> "Shape":
+        shape = SHAPES.get(fields, None)
+        if shape is None:
+            shape = SHAPES[fields] = cls(fields)
+        return shape
+
+    def object_type(self):
+        return ObjectType.SHAPE_OBJ
+
+    def call(self, args: List[Object]) -> Object:
+        if len(args) != len(self.fields):
+            return Error(
+                f"wrong number of arguments. got={len(args)}, want={len(self.fields)}"
             )
-            value = str(hash_pair.value)
-            ps.append(f"{key}: {value}")
-        return f"""{{{", ".join(ps)}}}"""
+        return Record(self, list(args))
+
+    def __str__(self):
+        return f"shape({', '.join(self.fields)})"
+
+
+class Record(Object):
+    """A record: fixed fields, laid out by a shared Shape, with the values
+    in a flat list. `values[shape.index[name]]` is the field `name`.
+    """
+
+    __slots__ = ("shape", "values")
+
+    def __init__(self, shape: Shape, values: List[Object]):
+        # Takes ownership of `values`.
+        self.shape = shape
+        self.values = values
+
+    def object_type(self):
+        return ObjectType.RECORD_OBJ
+
+    def get(self, name: str) -> Optional[Object]:
+        """The value of the field `name`, or None if there is no such field."""
+        slot = self.shape.index.get(name, None)
+        return None if slot is None else self.values[slot]
+
+    def write_to(self, stream: typing.TextIO) -> None:
+        stream.write("record({")
+        separator = ""
+        for name, value in zip(self.shape.fields, self.values):
+            stream.write(f'{separator}"{name}": ')
+            value.write_to(stream)
+            separator = ", "
+        stream.write("})")
+
+    def __str__(self):
+        return to_string(self)
 
 
 class Null(Object):
     _instance: typing.Optional["Null"] = None
+    __slots__ = ()
 
     def __new__(cls) -> "Null":
         if cls._instance is not None:
@@ -176,6 +615,8 @@ class Null(Object):
 
 
 class ReturnValue(Object):
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
 
@@ -187,6 +628,8 @@ class ReturnValue(Object):
 
 
 class Error(Object):
+    __slots__ = ("message",)
+
     def __init__(self, message):
         self.message = message
 
@@ -197,20 +640,32 @@ class Error(Object):
         return f"ERROR: {self.message}"
 
 
-class Function(Object):
+class Function(Object, Callable):
+    __slots__ = ("parameters", "body", "env", "slots")
+
     def __init__(
         self,
         parameters: List[ast.Identifier],
         body: ast.BlockStatement,
         env: "objects.Environment",
+        slots: Optional[Dict[str, int]] = None,
     ):
         self.parameters = parameters
         self.body = body
         self.env = env
+        # The frame layout from simian.resolver; None calls get a dict
+        # Environment instead.
+        self.slots = slots
 
     def object_type(self):
         return ObjectType.FUNCTION_OBJ
 
+    def call(self, args: List[Object]) -> Object:
+        # Imported here as the evaluator imports this module.
+        from simian.evaluator.evaluator import apply_function
+
+        return apply_function(self, args)
+
     def __str__(self):
         params = [str(p) for p in self.parameters]
         out = f"fn({', '.join(params)}) {{\n{str(self.body)}\n}}"
@@ -222,10 +677,15 @@ class BuiltinFunction(Object):
         pass
 
 
-class Builtin(Object):
+class Builtin(Object, Callable):
+    __slots__ = ("fn",)
+
     def __init__(self, fn: BuiltinFunction):
         self.fn = fn
 
+    def call(self, args: List[Object]) -> Object:
+        return self.fn(args)
+
     def object_type(self):
         return ObjectType.BUILTIN_OBJ
 
@@ -234,18 +694,287 @@ class Builtin(Object):
 
 
 class Array(Object):
+    """An immutable array, stored as a persistent vector (see
+    simian.objects.vector) so that `push`, `rest` and `+` share structure
+    with the array they were made from instead of copying it.
+
+    `start` makes `rest` an O(1) view that skips the first elements of the
+    vector. Arrays of up to 32 elements are a single flat list.
+    """
+
+    __slots__ = ("count", "shift", "root", "tail", "start")
+
     def __init__(self, elements: List[Object]):
-        self.elements = elements
+        # Takes ownership of `elements`.
+        self.count, self.shift, self.root, self.tail = vector.from_list(elements)
+        self.start = 0
+
+    @classmethod
+    def from_parts(cls, parts: vector.Parts, start: int = 0) -> "Array":
+        arr = cls.__new__(cls)
+        arr.count, arr.shift, arr.root, arr.tail = parts
+        arr.start = start
+        return arr
 
     def object_type(self):
         return ObjectType.ARRAY_OBJ
 
+    def __len__(self) -> int:
+        return self.count - self.start
+
+    def get(self, index: int) -> Optional[Object]:
+        """The element at `index`, or None when out of range."""
+        if index < 0 or index >= self.count - self.start:
+            return None
+        i = index + self.start
+        offset = vector.tail_offset(self.count)
+        if i >= offset:
+            return self.tail[i - offset]
+        return vector.leaf_for(self.shift, self.root, i)[i & vector.MASK]
+
+    def first(self) -> Optional[Object]:
+        return self.get(0)
+
+    def last(self) -> Optional[Object]:
+        if self.count == self.start:
+            return None
+        return self.tail[-1]
+
+    def rest(self) -> "Array":
+        if self.count - self.start <= 1:
+            return Array([])
+        return Array.from_parts(self.parts(), self.start + 1)
+
+    def slice(self, start: int, end: int) -> "Array":
+        """The view of elements `start` to `end`, which must satisfy
+        0 <= start <= end <= len(self). It shares this array's vector."""
+        if start == end:
+            return Array([])
+        if end == len(self):
+            return Array.from_parts(self.parts(), self.start + start)
+        return ArraySlice.from_parts(
+            self.parts(), self.start + start, self.start + end
+        )
+
+    def push(self, obj: Object) -> "Array":
+        if self.count == self.start:
+            return new_array([obj])
+        return Array.from_parts(vector.push(self.parts(), obj), self.start)
+
+    def concat(self, other: "Array") -> "Array":
+        if len(other) == 0:
+            return self
+        if len(self) == 0:
+            return other
+        return Array.from_parts(vector.extend(self.parts(), other), self.start)
+
+    def parts(self) -> vector.Parts:
+        return self.count, self.shift, self.root, self.tail
+
+    def __iter__(self) -> typing.Iterator[Object]:
+        return vector.iterate(self.parts(), self.start)
+
+    @property
+    def elements(self) -> List[Object]:
+        """A copy of the elements as a list."""
+        return list(self)
+
+    def write_to(self, stream: typing.TextIO) -> None:
+        stream.write("[")
+        separator = ""
+        for element in self:
+            stream.write(separator)
+            element.write_to(stream)
+            separator = ", "
+        stream.write("]")
+
     def __str__(self):
-        els = [str(e) for e in self.elements]
-        return f"[{', '.join(els)}]"
+        return to_string(self)
+
+
+class ArraySlice(Array):
+    """A view of the elements `start` to `end` of another array's vector.
+
+    Reading a view costs the same as reading the array it came from. Pushing
+    onto or concatenating a view copies its elements into a new array first,
+    as the vector beyond `end` belongs to the parent.
+    """
+
+    __slots__ = ("end",)
+
+    @classmethod
+    def from_parts(cls, parts: vector.Parts, start: int, end: int) -> "ArraySlice":
+        arr = super().from_parts(parts, start)
+        arr.end = end
+        return arr
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def get(self, index: int) -> Optional[Object]:
+        if index >= self.end - self.start:
+            return None
+        return Array.get(self, index)
+
+    def last(self) -> Optional[Object]:
+        return self.get(self.end - self.start - 1)
+
+    def rest(self) -> Array:
+        return self.slice(min(1, len(self)), len(self))
+
+    def slice(self, start: int, end: int) -> Array:
+        if start == end:
+            return Array([])
+        return ArraySlice.from_parts(
+            self.parts(), self.start + start, self.start + end
+        )
+
+    def push(self, obj: Object) -> Array:
+        return Array(self.elements).push(obj)
+
+    def concat(self, other: Array) -> Array:
+        if len(other) == 0:
+            return self
+        return Array(self.elements).concat(other)
+
+    def __iter__(self) -> typing.Iterator[Object]:
+        return itertools.islice(
+            vector.iterate(self.parts(), self.start), self.end - self.start
+        )
+
+
+class IntArray(Array):
+    """An array of integers packed into an `array('q')` buffer, so that the
+    integer builtins can work on it without boxing each element.
+
+    The array is `values[start:count]`, where `values` is a shared tip (see
+    the comment above String). Anything that is not a 64-bit integer turns
+    the result back into a plain `Array`.
+    """
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: array.array):
+        # Takes ownership of `values`.
+        self.values = values
+        self.count = len(values)
+        self.start = 0
+
+    @classmethod
+    def from_buffer(cls, values: array.array, start: int, count: int) -> "IntArray":
+        arr = cls.__new__(cls)
+        arr.values = values
+        arr.start = start
+        arr.count = count
+        return arr
+
+    def get(self, index: int) -> Optional[Object]:
+        if index < 0 or index >= self.count - self.start:
+            return None
+        return new_integer(self.values[self.start + index])
+
+    def last(self) -> Optional[Object]:
+        return self.get(self.count - self.start - 1)
+
+    def rest(self) -> "Array":
+        if self.count - self.start <= 1:
+            return IntArray(array.array("q"))
+        return IntArray.from_buffer(self.values, self.start + 1, self.count)
+
+    def slice(self, start: int, end: int) -> "IntArray":
+        return IntArray.from_buffer(
+            self.values, self.start + start, self.start + end
+        )
+
+    def push(self, obj: Object) -> "Array":
+        if type(obj) is Integer and type(obj.value) is int:
+            values, start = self.values, self.start
+            if len(values) != self.count:
+                values, start = self.packed(), 0
+            try:
+                values.append(obj.value)
+            except OverflowError:
+                pass
+            else:
+                return IntArray.from_buffer(values, start, len(values))
+        return Array(self.elements).push(obj)
+
+    def concat(self, other: Array) -> Array:
+        if len(other) == 0:
+            return self
+        if not isinstance(other, IntArray):
+            return Array(self.elements).concat(other)
+        values, start = self.values, self.start
+        if len(values) != self.count:
+            values, start = self.packed(), 0
+        values.extend(other.packed())
+        return IntArray.from_buffer(values, start, len(values))
+
+    def packed(self) -> array.array:
+        """The elements as an `array('q')`, which must not be modified."""
+        if self.start == 0 and self.count == len(self.values):
+            return self.values
+        return self.values[self.start : self.count]
+
+    def __iter__(self) -> typing.Iterator[Object]:
+        return map(new_integer, itertools.islice(self.values, self.start, self.count))
+
+    def write_to(self, stream: typing.TextIO) -> None:
+        # Integers can't nest, so write them a chunk at a time.
+        stream.write("[")
+        for i in range(self.start, self.count, WRITE_CHUNK):
+            if i != self.start:
+                stream.write(", ")
+            chunk = self.values[i : min(i + WRITE_CHUNK, self.count)]
+            stream.write(", ".join(map(str, chunk)))
+        stream.write("]")
+
+
+class Iterator(Object):
+    """A lazy sequence. Nothing is computed until something consumes it, and
+    then one element at a time: `source` returns a new Python iterator over
+    the elements for each consumer.
+    """
+
+    __slots__ = ("source",)
+
+    def __init__(self, source: typing.Callable[[], typing.Iterator[Object]]):
+        self.source = source
+
+    def object_type(self):
+        return ObjectType.ITERATOR_OBJ
+
+    def __iter__(self) -> typing.Iterator[Object]:
+        return self.source()
+
+    def __str__(self):
+        return "<iterator>"
+
+
+class Range(Iterator):
+    """The integers of a Python `range`, made as they are consumed."""
+
+    __slots__ = ("range",)
+
+    def __init__(self, range_: range):
+        self.range = range_
+
+    def __iter__(self) -> typing.Iterator[Object]:
+        return map(new_integer, self.range)
+
+    def __len__(self) -> int:
+        return len(self.range)
+
+    def __str__(self):
+        r = self.range
+        if r.step == 1:
+            return f"range({r.start}, {r.stop})"
+        return f"range({r.start}, {r.stop}, {r.step})"
 
 
 class Module(Object):
+    __slots__ = ("name", "attrs")
+
     def __init__(self, name: str, attrs: Object):
         self.name = name
         self.attrs = attrs
@@ -255,5 +984,59 @@ class Module(Object):
     def object_type(self):
         return ObjectType.MODULE
 
+    def write_to(self, stream: typing.TextIO) -> None:
+        stream.write(f"<module {self.name}: ")
+        self.attrs.write_to(stream)
+        stream.write(">")
+
     def __str__(self):
-        return f"<module {self.name}: {self.attrs}>"
+        return to_string(self)
+
+
+# Concatenations shorter than this just copy: the copy is cheaper than a rope.
+ROPE_MIN_LENGTH = 256
+
+# How many packed integers IntArray.write_to formats per write.
+WRITE_CHUNK = 4096
+
+TRUE = Boolean(True)
+FALSE = Boolean(False)
+NULL = Null()
+
+# Every Shape still in use, by its fields.
+SHAPES: "weakref.WeakValueDictionary[typing.Tuple[str, ...], Shape]" = (
+    weakref.WeakValueDictionary()
+)
+
+# Integers in this range are preallocated and shared, as loop counters,
+# indexes and lengths mostly fall in it. Integer objects are never mutated.
+SMALL_INT_MIN = -128
+SMALL_INT_MAX = 1023
+SMALL_INTS = [Integer(i) for i in range(SMALL_INT_MIN, SMALL_INT_MAX + 1)]
+
+
+def new_array(elements: List[Object]) -> Array:
+    """An array of `elements`, packed into an IntArray if they are all
+    64-bit integers. Takes ownership of `elements`."""
+    if elements and all(
+        type(e) is Integer and type(e.value) is int for e in elements
+    ):
+        try:
+            return IntArray(array.array("q", [e.value for e in elements]))
+        except OverflowError:
+            pass
+    return Array(elements)
+
+
+def to_string(obj: Object) -> str:
+    """`str(obj)` for objects whose `write_to` is the real implementation."""
+    out = io.StringIO()
+    obj.write_to(out)
+    return out.getvalue()
+
+
+def new_integer(value: int) -> Integer:
+    # `/` makes Integers holding floats, which must keep their own type.
+    if type(value) is int and SMALL_INT_MIN <= value <= SMALL_INT_MAX:
+        return SMALL_INTS[value - SMALL_INT_MIN]
+    return Integer(value)
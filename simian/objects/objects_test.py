@@ -0,0 +1,173 @@
+import gc
+import io
+
+from simian.objects import (
+    Array,
+    ArraySlice,
+    Bytes,
+    Hash,
+    HashPair,
+    IntArray,
+    Record,
+    Set,
+    Shape,
+    String,
+    new_array,
+    new_integer,
+    to_string,
+)
+from simian.objects.objects import SHAPES
+
+
+def values(array: Array) -> list:
+    return [el.value for el in array]
+
+
+def append_behind_the_tip(a, b, buffer: str, append):
+    """`append(a)`, where `b` was appended to `a` and so shares its buffer.
+    `a` is no longer the tip, so this must copy rather than clobber `b`."""
+    assert getattr(a, buffer) is getattr(b, buffer)
+    c = append(a)
+    assert getattr(c, buffer) is not getattr(b, buffer)
+    return c
+
+
+def test_new_array_packs_integers():
+    assert isinstance(new_array([new_integer(1), new_integer(2)]), IntArray)
+    assert not isinstance(new_array([new_integer(1), String("a")]), IntArray)
+    assert not isinstance(new_array([new_integer(2 ** 70)]), IntArray)
+    assert not isinstance(new_array([new_integer(5 / 2)]), IntArray)
+    assert isinstance(Array([]).push(new_integer(1)), IntArray)
+
+
+def test_int_array_pushes_share_the_buffer():
+    base = new_array([new_integer(i) for i in range(3)])
+    a = base.push(new_integer(3))
+    b = a.push(new_integer(4))
+    c = append_behind_the_tip(a, b, "values", lambda x: x.push(new_integer(40)))
+    assert values(base) == [0, 1, 2]
+    assert values(a) == [0, 1, 2, 3]
+    assert values(b) == [0, 1, 2, 3, 4]
+    assert values(c) == [0, 1, 2, 3, 40]
+    assert values(b.rest().push(new_integer(5))) == [1, 2, 3, 4, 5]
+
+
+def test_int_array_falls_back_on_mixed_elements():
+    a = new_array([new_integer(1), new_integer(2)])
+    mixed = a.push(String("x"))
+    assert type(mixed) is Array
+    assert [str(el) for el in mixed] == ["1", "2", "x"]
+    big = a.push(new_integer(2 ** 64))
+    assert type(big) is Array
+    assert values(big) == [1, 2, 2 ** 64]
+    assert values(a.concat(Array([String("y")])))[-1] == "y"
+    assert values(a.concat(a)) == [1, 2, 1, 2]
+
+
+def test_slices_are_views():
+    base = Array([String(str(i)) for i in range(100)])
+    view = base.slice(10, 90)
+    assert isinstance(view, ArraySlice)
+    assert view.root is base.root
+    assert len(view) == 80
+    assert view.first().value == "10"
+    assert view.last().value == "89"
+    assert view.get(80) is None
+    assert [el.value for el in view.rest().slice(0, 3)] == ["11", "12", "13"]
+    assert len(view.slice(5, 5)) == 0
+    # Only the last elements of a vector can be pushed onto in place.
+    pushed = view.push(String("x"))
+    assert [el.value for el in pushed][-2:] == ["89", "x"]
+    assert base.get(90).value == "90"
+    assert type(base.slice(10, 100)) is Array
+
+
+def test_int_array_slices_share_the_buffer():
+    base = new_array([new_integer(i) for i in range(10)])
+    view = base.slice(2, 5)
+    assert view.values is base.values
+    assert values(view) == [2, 3, 4]
+    assert values(view.push(new_integer(9))) == [2, 3, 4, 9]
+    assert values(base) == list(range(10))
+
+
+def test_write_to_matches_str():
+    key = String("k")
+    hash_ = Hash({key.hash_key(): HashPair(key, Array([new_integer(1), String("v")]))})
+    nested = Array([new_integer(1), String("two"), hash_, new_array([new_integer(3)])])
+    out = io.StringIO()
+    nested.write_to(out)
+    assert out.getvalue() == str(nested) == '[1, two, {"k": [1, v]}, [3]]'
+    assert to_string(nested) == str(nested)
+
+
+def test_write_to_streams_large_values():
+    # Packed integers are written a chunk at a time.
+    ints = new_array([new_integer(i) for i in range(10_000)])
+    out = io.StringIO()
+    ints.write_to(out)
+    assert out.getvalue() == "[" + ", ".join(str(i) for i in range(10_000)) + "]"
+    view = ints.slice(4_000, 9_000)
+    assert to_string(view) == "[" + ", ".join(str(i) for i in range(4_000, 9_000)) + "]"
+    # Writing a rope writes its parts without joining them.
+    rope = String("a" * 300).concat(String("b" * 300))
+    out = io.StringIO()
+    rope.write_to(out)
+    assert out.getvalue() == "a" * 300 + "b" * 300
+    assert rope._rope is not None
+
+
+def test_set_adds_share_the_members():
+    base = Set({1: new_integer(1)})
+    a = base.add(2, new_integer(2))
+    b = a.add(3, new_integer(3))
+    c = append_behind_the_tip(a, b, "members", lambda x: x.add(4, new_integer(4)))
+    assert not a.has(3) and b.has(3)
+    assert values(base) == [1]
+    assert values(a) == [1, 2]
+    assert values(b) == [1, 2, 3]
+    assert values(c) == [1, 2, 4]
+    assert values(b.union(c)) == [1, 2, 3, 4]
+    assert values(b.remove(2)) == [1, 3]
+    assert values(b) == [1, 2, 3]
+
+
+def test_bytes_slices_and_appends_share_the_buffer():
+    data = Bytes(b"header:payload")
+    payload = data.slice(7, 14)
+    assert payload.data is data.data
+    assert payload.to_bytes() == b"payload"
+    assert payload.get(0).value == ord("p")
+    a = payload.push(ord("!"))
+    b = a.concat(Bytes(b"??"))
+    c = append_behind_the_tip(a, b, "data", lambda x: x.push(ord(".")))
+    assert [x.to_bytes() for x in (data, a, b, c)] == [
+        b"header:payload",
+        b"payload!",
+        b"payload!??",
+        b"payload!.",
+    ]
+    assert b.concat(b).to_bytes() == b"payload!??payload!??"
+
+
+def test_records_share_their_shape():
+    point = Shape.of(("x", "y"))
+    assert Shape.of(("x", "y")) is point
+    assert Shape.of(("y", "x")) is not point
+    a = point.call([new_integer(1), new_integer(2)])
+    b = point.call([new_integer(3), new_integer(4)])
+    assert isinstance(a, Record)
+    assert a.shape is b.shape is point
+    assert point.index == {"x": 0, "y": 1}
+    assert b.get("y").value == 4
+    assert b.get("z") is None
+
+
+def test_shapes_no_longer_used_are_dropped():
+    fields = ("unused", "shape")
+    Shape.of(fields)
+    gc.collect()
+    assert fields not in SHAPES
+    point = Shape.of(("x", "y"))
+    gc.collect()
+    assert SHAPES[("x", "y")] is point
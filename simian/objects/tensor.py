@@ -0,0 +1,219 @@
+"""The optional TENSOR type: an n-dimensional NumPy array, so numeric code
+can run as vectorised kernels instead of monkey loops.
+
+NumPy is not a dependency. Without it `ENABLED` is False, the tensor
+builtins are not added to BUILTINS and no Tensor can be made, so the
+evaluator's tensor cases never come up.
+"""
+import operator
+from typing import Callable, Dict, List
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from simian import objects
+from simian.objects import ObjectType
+from simian.objects.builtins import BUILTINS, wrong_number_of_args
+
+__all__ = ["Tensor"]
+
+ENABLED = numpy is not None
+
+OPERATORS: Dict[str, Callable] = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "%": operator.mod,
+    "<": operator.lt,
+    ">": operator.gt,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+class Tensor(objects.Object):
+    __slots__ = ("array",)
+
+    def __init__(self, array: "numpy.ndarray"):
+        self.array = array
+
+    def object_type(self):
+        return ObjectType.TENSOR_OBJ
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def slice(self, start: int, end: int) -> "Tensor":
+        """The view of the sub-tensors `start` to `end`."""
+        return Tensor(self.array[start:end])
+
+    def sum(self) -> objects.Object:
+        return wrap(self.array.sum())
+
+    def __str__(self):
+        return f"tensor({from_native(self.array.tolist())})"
+
+
+####################
+#    EVALUATION    #
+####################
+def evaluate_infix(
+    op: str, left: objects.Object, right: objects.Object
+) -> objects.Object:
+    """`op` applied element-wise, broadcasting tensors and integers."""
+    fn = OPERATORS.get(op, None)
+    if fn is None:
+        return objects.Error(
+            f"unknown operator: {left.object_type().value} {op} {right.object_type().value}"
+        )
+    operands = [operand(left), operand(right)]
+    if any(o is None for o in operands):
+        return objects.Error(
+            f"type mismatch: {left.object_type().value} {op} {right.object_type().value}"
+        )
+    try:
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            return wrap(fn(*operands))
+    except ValueError:
+        return objects.Error(
+            f"shape mismatch: {shape(operands[0])} {op} {shape(operands[1])}"
+        )
+    except OverflowError:
+        # An integer too large for the tensor's 64-bit elements.
+        return objects.Error(
+            f"integer overflow: {left.object_type().value} {op} {right.object_type().value}"
+        )
+    except TypeError:
+        # NumPy refuses some operators on boolean tensors, `-` for one.
+        return objects.Error(
+            f"unknown operator: {left.object_type().value} {op} {right.object_type().value}"
+        )
+
+
+def evaluate_minus(right: Tensor) -> objects.Object:
+    try:
+        return wrap(-right.array)
+    except TypeError:
+        return objects.Error(f"unknown operator: -{right.object_type().value}")
+
+
+def evaluate_index(tensor: Tensor, index: objects.Object) -> objects.Object:
+    """The element, or the view of the sub-tensor, at `index`."""
+    array = tensor.array
+    idx = index.value
+    if array.ndim == 0 or idx < 0 or idx >= array.shape[0]:
+        return objects.NULL
+    return wrap(array[int(idx)])
+
+
+####################
+#     BUILTINS     #
+####################
+def tensor_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) != 1:
+        return wrong_number_of_args(actual=len(args), expected=1)
+    src = args[0]
+    if src.object_type() == ObjectType.TENSOR_OBJ:
+        return src
+    if src.object_type() != ObjectType.ARRAY_OBJ:
+        return objects.Error(
+            f"argument to `tensor` must be ARRAY, got {src.object_type().value}"
+        )
+    if isinstance(src, objects.IntArray):
+        return Tensor(numpy.array(src.packed(), dtype=numpy.int64))
+    try:
+        return Tensor(numpy.array(to_native(src)))
+    except TypeError as e:
+        return objects.Error(f"argument to `tensor` {e}")
+    except ValueError:
+        return objects.Error("argument to `tensor` must not be ragged")
+
+
+def to_array_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) != 1:
+        return wrong_number_of_args(actual=len(args), expected=1)
+    if args[0].object_type() != ObjectType.TENSOR_OBJ:
+        return objects.Error(
+            f"argument to `to_array` must be TENSOR, got {args[0].object_type().value}"
+        )
+    return from_native(args[0].array.tolist())
+
+
+def mean_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) != 1:
+        return wrong_number_of_args(actual=len(args), expected=1)
+    if args[0].object_type() != ObjectType.TENSOR_OBJ:
+        return objects.Error(
+            f"argument to `mean` must be TENSOR, got {args[0].object_type().value}"
+        )
+    if args[0].array.size == 0:
+        return objects.NULL
+    return wrap(args[0].array.mean())
+
+
+def dot_fn(args: List[objects.Object]) -> objects.Object:
+    if len(args) != 2:
+        return wrong_number_of_args(actual=len(args), expected=2)
+    for arg in args:
+        if arg.object_type() != ObjectType.TENSOR_OBJ:
+            return objects.Error(
+                f"arguments to `dot` must be TENSOR, got {arg.object_type().value}"
+            )
+    left, right = args[0].array, args[1].array
+    try:
+        return wrap(numpy.dot(left, right))
+    except ValueError:
+        return objects.Error(f"shape mismatch: {shape(left)} dot {shape(right)}")
+
+
+####################
+#      HELPERS     #
+####################
+def operand(obj: objects.Object):
+    if obj.object_type() == ObjectType.TENSOR_OBJ:
+        return obj.array
+    if obj.object_type() == ObjectType.INTEGER_OBJ:
+        return obj.value
+    return None
+
+
+def wrap(value) -> objects.Object:
+    if isinstance(value, numpy.ndarray):
+        return Tensor(value)
+    return from_native(value.item() if isinstance(value, numpy.generic) else value)
+
+
+def to_native(obj: objects.Object):
+    if obj.object_type() == ObjectType.ARRAY_OBJ:
+        return [to_native(el) for el in obj]
+    if obj.object_type() in (ObjectType.INTEGER_OBJ, ObjectType.BOOLEAN_OBJ):
+        return obj.value
+    raise TypeError(
+        f"must hold INTEGER, BOOLEAN or ARRAY, got {obj.object_type().value}"
+    )
+
+
+def from_native(value) -> objects.Object:
+    if isinstance(value, list):
+        return objects.new_array([from_native(v) for v in value])
+    if isinstance(value, bool):
+        return objects.TRUE if value else objects.FALSE
+    return objects.new_integer(value)
+
+
+def shape(value) -> str:
+    return str(list(numpy.shape(value)))
+
+
+if ENABLED:
+    BUILTINS.update(
+        {
+            "tensor": objects.Builtin(tensor_fn),
+            "to_array": objects.Builtin(to_array_fn),
+            "mean": objects.Builtin(mean_fn),
+            "dot": objects.Builtin(dot_fn),
+        }
+    )
@@ -0,0 +1,73 @@
+import pytest
+import simian.objects as objects
+from simian.evaluator.evaluator_test import evaluate_input
+
+numpy = pytest.importorskip("numpy")
+
+
+def test_tensor_arithmetic(evaluate):
+    tests = [
+        ("tensor([1, 2, 3])", "tensor([1, 2, 3])"),
+        ("tensor([[1, 2], [3, 4]]) + 1", "tensor([[2, 3], [4, 5]])"),
+        ("2 * tensor([1, 2])", "tensor([2, 4])"),
+        ("tensor([[1, 2], [3, 4]]) - tensor([10, 20])", "tensor([[-9, -18], [-7, -16]])"),
+        ("tensor([1, 2]) / 2", "tensor([0.5, 1.0])"),
+        ("tensor([5, 6]) % 4", "tensor([1, 2])"),
+        ("tensor([1, 2, 3]) < 2", "tensor([true, false, false])"),
+        ("tensor([1, 2]) == tensor([1, 3])", "tensor([true, false])"),
+        ("-tensor([1, -2])", "tensor([-1, 2])"),
+        ("tensor([1, 2]) + tensor([1, 2, 3])", "ERROR: shape mismatch: [2] + [3]"),
+        ('tensor([1]) + "a"', "ERROR: type mismatch: TENSOR + STRING"),
+        ("tensor([1]) && true", "ERROR: unknown operator: TENSOR && BOOLEAN"),
+        (
+            "tensor([1, 2, 3]) + 99999999999999999999",
+            "ERROR: integer overflow: TENSOR + INTEGER",
+        ),
+        ("tensor([true]) - tensor([true])", "ERROR: unknown operator: TENSOR - TENSOR"),
+        ("-tensor([true])", "ERROR: unknown operator: -TENSOR"),
+    ]
+    for input_, expected in tests:
+        assert str(evaluate_input(evaluate, input_)) == expected
+
+
+def test_tensor_builtins(evaluate):
+    tests = [
+        ("sum(tensor([[1, 2], [3, 4]]))", "10"),
+        ("mean(tensor([1, 2, 3, 4]))", "2.5"),
+        ("mean(tensor([]))", "null"),
+        ("dot(tensor([1, 2, 3]), tensor([4, 5, 6]))", "32"),
+        ("dot(tensor([[1, 2], [3, 4]]), tensor([1, 1]))", "tensor([3, 7])"),
+        ("to_array(tensor([[1, 2], [3, 4]]))", "[[1, 2], [3, 4]]"),
+        ("tensor(range_fill(3))", "tensor([0, 1, 2])"),
+        ("type(tensor([1]))", "TENSOR"),
+        ("len(tensor([[1, 2], [3, 4], [5, 6]]))", "3"),
+        ("tensor([1, [2]])", "ERROR: argument to `tensor` must not be ragged"),
+        (
+            'tensor(["a"])',
+            "ERROR: argument to `tensor` must hold INTEGER, BOOLEAN or ARRAY, got STRING",
+        ),
+        ("dot(tensor([1, 2]), [1, 2])", "ERROR: arguments to `dot` must be TENSOR, got ARRAY"),
+    ]
+    for input_, expected in tests:
+        assert str(evaluate_input(evaluate, input_)) == expected
+
+
+def test_tensor_indexing(evaluate):
+    tests = [
+        ("tensor([[1, 2], [3, 4]])[1]", "tensor([3, 4])"),
+        ("tensor([[1, 2], [3, 4]])[1][0]", "3"),
+        ("tensor([1, 2])[2]", "null"),
+        ("tensor([1, 2])[-1]", "null"),
+        ("tensor([[1, 2], [3, 4], [5, 6]])[1:]", "tensor([[3, 4], [5, 6]])"),
+        ("slice(tensor([1, 2, 3]), 0, -1)", "tensor([1, 2])"),
+    ]
+    for input_, expected in tests:
+        assert str(evaluate_input(evaluate, input_)) == expected
+
+
+def test_indexing_makes_views():
+    matrix = objects.Tensor(numpy.arange(6).reshape(2, 3))
+    row = objects.tensor.evaluate_index(matrix, objects.new_integer(1))
+    assert numpy.shares_memory(row.array, matrix.array)
+    rows = matrix.slice(0, 1)
+    assert numpy.shares_memory(rows.array, matrix.array)
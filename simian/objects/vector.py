@@ -0,0 +1,134 @@
+"""Helpers for the persistent vector behind `objects.Array`.
+
+A vector of `count` elements is a trie of 32-wide Python lists (`root`,
+`shift` bits deep) holding every element before `tail_offset(count)`, plus
+a `tail` list holding the rest (1 to 32 elements once count > 0). Vectors
+of up to 32 elements therefore live entirely in the tail. Nodes are never
+modified once a vector using them exists, so vectors share them freely.
+"""
+from typing import Iterator, List, Sequence, Tuple
+
+__all__ = []
+
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+
+# (count, shift, root, tail)
+Parts = Tuple[int, int, list, list]
+
+
+def tail_offset(count: int) -> int:
+    if count < WIDTH:
+        return 0
+    return ((count - 1) >> BITS) << BITS
+
+
+def leaf_for(shift: int, root: list, i: int) -> list:
+    """The leaf holding index `i`, which must be below the tail offset."""
+    node = root
+    level = shift
+    while level > 0:
+        node = node[(i >> level) & MASK]
+        level -= BITS
+    return node
+
+
+def push_tail(count: int, shift: int, root: list, tail: list) -> Tuple[list, int]:
+    """Move a full `tail` into the trie. `count` includes the tail's
+    elements. Returns the new root and shift."""
+    if (count >> BITS) > (1 << shift):
+        # The root is full: grow the trie a level.
+        return [root, new_path(shift, tail)], shift + BITS
+    return push_tail_at(count, shift, root, tail), shift
+
+
+def push_tail_at(count: int, level: int, parent: list, tail: list) -> list:
+    index = ((count - 1) >> level) & MASK
+    node = list(parent)
+    if level == BITS:
+        child = tail
+    elif index < len(parent):
+        child = push_tail_at(count, level - BITS, parent[index], tail)
+    else:
+        child = new_path(level - BITS, tail)
+    if index < len(node):
+        node[index] = child
+    else:
+        node.append(child)
+    return node
+
+
+def new_path(level: int, node: list) -> list:
+    while level > 0:
+        node = [node]
+        level -= BITS
+    return node
+
+
+def from_list(items: List) -> Parts:
+    """Build a vector holding `items`, which it takes ownership of."""
+    count = len(items)
+    if count <= WIDTH:
+        return count, BITS, [], items
+    offset = tail_offset(count)
+    nodes = [items[i : i + WIDTH] for i in range(0, offset, WIDTH)]
+    shift = BITS
+    while len(nodes) > WIDTH:
+        nodes = [nodes[i : i + WIDTH] for i in range(0, len(nodes), WIDTH)]
+        shift += BITS
+    return count, shift, nodes, items[offset:]
+
+
+def extend(parts: Parts, items: Sequence) -> Parts:
+    """Append `items` a tail at a time: O(len(items) / 32 * log n) nodes."""
+    count, shift, root, tail = parts
+    items = list(items)
+    tail = tail + items[: WIDTH - len(tail)]
+    pos = len(tail) - (count - tail_offset(count))
+    count += pos
+    while pos < len(items):
+        root, shift = push_tail(count, shift, root, tail)
+        tail = items[pos : pos + WIDTH]
+        pos += len(tail)
+        count += len(tail)
+    return count, shift, root, tail
+
+
+def push(parts: Parts, item) -> Parts:
+    count, shift, root, tail = parts
+    if len(tail) < WIDTH:
+        return count + 1, shift, root, tail + [item]
+    root, shift = push_tail(count, shift, root, tail)
+    return count + 1, shift, root, [item]
+
+
+def assoc(parts: Parts, i: int, item) -> Parts:
+    """Replace the element at `i`, copying only the path to it."""
+    count, shift, root, tail = parts
+    offset = tail_offset(count)
+    if i >= offset:
+        tail = list(tail)
+        tail[i - offset] = item
+        return count, shift, root, tail
+    return count, shift, assoc_at(shift, root, i, item), tail
+
+
+def assoc_at(level: int, node: list, i: int, item) -> list:
+    node = list(node)
+    if level == 0:
+        node[i & MASK] = item
+    else:
+        index = (i >> level) & MASK
+        node[index] = assoc_at(level - BITS, node[index], i, item)
+    return node
+
+
+def iterate(parts: Parts, start: int = 0) -> Iterator:
+    count, shift, root, tail = parts
+    offset = tail_offset(count)
+    i = start
+    while i < offset:
+        yield from leaf_for(shift, root, i)[i & MASK :]
+        i = (i | MASK) + 1
+    yield from tail[max(i - offset, 0) :]
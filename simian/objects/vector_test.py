@@ -0,0 +1,64 @@
+import pytest
+from simian.objects import Array, new_integer
+
+SIZES = [0, 1, 31, 32, 33, 64, 65, 1024, 1056, 1057, 33 * 1024 + 1]
+
+
+def ints(array: Array) -> list:
+    return [el.value for el in array]
+
+
+def make(values) -> Array:
+    return Array([new_integer(v) for v in values])
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_from_list(n):
+    array = make(range(n))
+    assert len(array) == n
+    assert ints(array) == list(range(n))
+    assert all(array.get(i).value == i for i in range(n))
+    assert array.get(n) is None
+    assert array.get(-1) is None
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_push(n):
+    array = Array([])
+    pushed = []
+    for i in range(n):
+        pushed.append(array)
+        array = array.push(new_integer(i))
+    assert ints(array) == list(range(n))
+    assert all(array.get(i).value == i for i in range(n))
+    # Earlier versions are untouched.
+    for i in range(0, n, max(n // 7, 1)):
+        assert ints(pushed[i]) == list(range(i))
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_rest(n):
+    array = make(range(n))
+    for k in range(min(n, 40)):
+        assert len(array) == n - k
+        assert array.first().value == k
+        assert array.last().value == n - 1
+        assert array.get(n - k - 1).value == n - 1
+        array = array.rest()
+    if n <= 40:
+        assert len(array) == 0
+        assert array.first() is None
+        assert array.last() is None
+        assert len(array.rest()) == 0
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_concat(n):
+    left = make(range(n)).rest()
+    right = make(range(n, 2 * n))
+    both = left.concat(right)
+    expected = list(range(1, 2 * n)) if n else []
+    assert ints(both) == expected
+    assert all(both.get(i).value == v for i, v in enumerate(expected))
+    assert ints(left) == list(range(1, n))
+    assert ints(both.push(new_integer(-1)))[-1:] == [-1]
@@ -0,0 +1,17 @@
+from .optimizer import (
+    Pass,
+    ConstantFolding,
+    DeadBranchElimination,
+    CommentRemoval,
+    PassManager,
+    optimize,
+)
+
+__all__ = [
+    "Pass",
+    "ConstantFolding",
+    "DeadBranchElimination",
+    "CommentRemoval",
+    "PassManager",
+    "optimize",
+]
@@ -0,0 +1,299 @@
+from typing import Callable, Dict, Iterable, List, Optional
+
+import simian.ast as ast
+import simian.objects as objects
+from simian.evaluator import evaluator
+from simian.token import Token, TokenType
+
+__all__ = [
+    "Pass",
+    "ConstantFolding",
+    "DeadBranchElimination",
+    "CommentRemoval",
+    "PassManager",
+    "optimize",
+]
+
+LITERALS = (ast.IntegerLiteral, ast.StringLiteral, ast.Boolean)
+
+
+class Pass:
+    """An in-place rewrite of a program.
+
+    `run` returns how many nodes the pass removed from the tree. Passes must
+    leave every engine's result unchanged, errors included.
+    """
+
+    name = ""
+
+    def run(self, program: ast.Program) -> int:
+        raise NotImplementedError
+
+
+class ConstantFolding(Pass):
+    """Replaces prefix and infix expressions whose operands are literals
+    with the literal they evaluate to. Expressions that evaluate to an error
+    are left for the engine to report at run time."""
+
+    name = "constant_folding"
+
+    def run(self, program: ast.Program) -> int:
+        self.removed = 0
+        transform(program, self.fold)
+        return self.removed
+
+    def fold(self, node: ast.Node) -> ast.Node:
+        if isinstance(node, ast.InfixExpression):
+            if isinstance(node.left, LITERALS) and isinstance(node.right, LITERALS):
+                return self.replace(
+                    node,
+                    lambda: evaluator.evaluate_infix_expression(
+                        node.operator, literal_value(node.left), literal_value(node.right)
+                    ),
+                )
+        elif isinstance(node, ast.PrefixExpression):
+            if isinstance(node.right, LITERALS):
+                return self.replace(
+                    node,
+                    lambda: evaluator.evaluate_prefix_expression(
+                        node.operator, literal_value(node.right)
+                    ),
+                )
+        return node
+
+    def replace(self, node: ast.Node, fold: Callable[[], objects.Object]) -> ast.Node:
+        try:
+            literal = to_literal(fold())
+        except ArithmeticError:
+            # e.g. `1 % 0`, which has to fail when the program runs.
+            return node
+        if literal is None:
+            return node
+        self.removed += count_nodes(node) - 1
+        return literal
+
+
+class DeadBranchElimination(Pass):
+    """Drops the branch of an `if` whose condition is a literal that can't
+    be taken. An `if` that stands as a statement of its own is replaced by
+    the statements of the branch that is taken, which is safe because blocks
+    don't open scopes."""
+
+    name = "dead_branch_elimination"
+
+    def run(self, program: ast.Program) -> int:
+        self.removed = 0
+        transform(program, self.prune)
+        return self.removed
+
+    def prune(self, node: ast.Node) -> ast.Node:
+        if isinstance(node, ast.IfExpression) and isinstance(node.condition, LITERALS):
+            self.prune_if_expression(node)
+        elif isinstance(node, (ast.Program, ast.BlockStatement)):
+            node.statements = self.prune_statements(node.statements)
+        return node
+
+    def prune_if_expression(self, node: ast.IfExpression) -> None:
+        """Leave `node` as either `if (<truthy>) { taken }` or an
+        `if (<falsy>) {}` without an else, both of which evaluate the same
+        way as before."""
+        if is_truthy(node.condition):
+            if node.alternative is not None:
+                self.removed += count_nodes(node.alternative)
+                node.alternative = None
+        elif node.alternative is not None:
+            # The condition is swapped for a single `true` literal.
+            self.removed += count_nodes(node.consequence) + count_nodes(node.condition) - 1
+            node.condition = to_literal(objects.Boolean(True))
+            node.consequence = node.alternative
+            node.alternative = None
+        elif node.consequence.statements:
+            self.removed += count_nodes(node.consequence) - 1
+            node.consequence.statements = []
+
+    def prune_statements(self, statements: List[ast.Statement]) -> List[ast.Statement]:
+        last = len(statements) - 1
+        pruned = []
+        for i, statement in enumerate(statements):
+            if not isinstance(statement, ast.ExpressionStatement) or not isinstance(
+                statement.expression, ast.IfExpression
+            ):
+                pruned.append(statement)
+                continue
+            node = statement.expression
+            if not isinstance(node.condition, LITERALS):
+                pruned.append(statement)
+            elif is_truthy(node.condition):
+                taken = node.consequence.statements
+                if not taken and i == last:
+                    # The empty block gives the enclosing block the value None.
+                    pruned.append(statement)
+                    continue
+                self.removed += count_nodes(statement) - sum(map(count_nodes, taken))
+                pruned.extend(taken)
+            elif i == last:
+                # Still the block's value: NULL.
+                pruned.append(statement)
+            else:
+                self.removed += count_nodes(statement)
+        return pruned
+
+
+class CommentRemoval(Pass):
+    """Removes comment statements from blocks. A comment that ends a block
+    is kept, since it gives the block the value None."""
+
+    name = "comment_removal"
+
+    def run(self, program: ast.Program) -> int:
+        self.removed = 0
+        transform(program, self.strip)
+        return self.removed
+
+    def strip(self, node: ast.Node) -> ast.Node:
+        if isinstance(node, (ast.Program, ast.BlockStatement)) and node.statements:
+            *body, last = node.statements
+            kept = [s for s in body if not isinstance(s, ast.Comment)]
+            self.removed += len(body) - len(kept)
+            node.statements = kept + [last]
+        return node
+
+
+class PassManager:
+    """Runs a sequence of passes over a program.
+
+    Every pass is enabled to begin with; `disable` and `enable` take a
+    pass's `name`. `run` returns, for each pass that ran, the number of
+    nodes it removed.
+    """
+
+    def __init__(self, passes: Optional[List[Pass]] = None):
+        if passes is None:
+            passes = [CommentRemoval(), ConstantFolding(), DeadBranchElimination()]
+        self.passes = passes
+        self.disabled = set()
+
+    def enable(self, name: str) -> None:
+        self.disabled.discard(self.lookup(name).name)
+
+    def disable(self, name: str) -> None:
+        self.disabled.add(self.lookup(name).name)
+
+    def lookup(self, name: str) -> Pass:
+        for p in self.passes:
+            if p.name == name:
+                return p
+        raise ValueError(f"unknown optimization pass: {name}")
+
+    def run(self, program: ast.Program) -> Dict[str, int]:
+        report = {}
+        for p in self.passes:
+            if p.name not in self.disabled:
+                report[p.name] = p.run(program)
+        return report
+
+
+def optimize(program: ast.Program, disabled: Iterable[str] = ()) -> ast.Program:
+    """Run the default passes, less any named in `disabled`, over `program`."""
+    manager = PassManager()
+    for name in disabled:
+        manager.disable(name)
+    manager.run(program)
+    return program
+
+
+####################
+#      HELPERS     #
+####################
+def transform(root: ast.Node, fn: Callable[[ast.Node], ast.Node]) -> ast.Node:
+    """Replace every node under `root`, its children before it, with
+    `fn(node)`, and return what `root` became. Nodes are visited from a
+    list rather than by recursion, so programs nested deeper than Python
+    recurses are optimized too.
+    """
+    order = [root]
+    for node in order:
+        order.extend(ast.iter_child_nodes(node))
+    # Every node is after its parent in `order`, so before it in reverse.
+    replaced = {}
+    lookup = lambda child: replaced.get(id(child), child)
+    for node in reversed(order):
+        map_children(node, lookup)
+        replaced[id(node)] = fn(node)
+    return replaced[id(root)]
+
+
+def map_children(node: ast.Node, fn: Callable[[ast.Node], ast.Node]) -> None:
+    """Replace each direct child of `node` with `fn(child)`."""
+    if isinstance(node, (ast.Program, ast.BlockStatement)):
+        node.statements = [fn(s) for s in node.statements]
+    elif isinstance(node, ast.LetStatement):
+        node.value = apply(fn, node.value)
+    elif isinstance(node, ast.ReturnStatement):
+        node.return_value = apply(fn, node.return_value)
+    elif isinstance(node, ast.ExpressionStatement):
+        node.expression = apply(fn, node.expression)
+    elif isinstance(node, ast.WhileStatement):
+        node.condition = apply(fn, node.condition)
+        node.body = apply(fn, node.body)
+    elif isinstance(node, ast.FunctionLiteral):
+        node.body = apply(fn, node.body)
+    elif isinstance(node, ast.ArrayLiteral):
+        if node.elements is not None:
+            node.elements = [fn(e) for e in node.elements]
+    elif isinstance(node, ast.HashLiteral):
+        node.pairs = {fn(k): fn(v) for k, v in node.pairs.items()}
+    elif isinstance(node, ast.PrefixExpression):
+        node.right = apply(fn, node.right)
+    elif isinstance(node, ast.InfixExpression):
+        node.left = apply(fn, node.left)
+        node.right = apply(fn, node.right)
+    elif isinstance(node, ast.IfExpression):
+        node.condition = apply(fn, node.condition)
+        node.consequence = apply(fn, node.consequence)
+        node.alternative = apply(fn, node.alternative)
+    elif isinstance(node, ast.CallExpression):
+        node.function = apply(fn, node.function)
+        if node.arguments is not None:
+            node.arguments = [fn(a) for a in node.arguments]
+    elif isinstance(node, ast.IndexExpression):
+        node.left = apply(fn, node.left)
+        node.index = apply(fn, node.index)
+    elif isinstance(node, ast.SliceExpression):
+        node.left = apply(fn, node.left)
+        node.start = apply(fn, node.start)
+        node.end = apply(fn, node.end)
+
+
+def apply(fn: Callable[[ast.Node], ast.Node], node: Optional[ast.Node]):
+    return fn(node) if node is not None else None
+
+
+def count_nodes(node: ast.Node) -> int:
+    nodes = [node]
+    for n in nodes:
+        nodes.extend(ast.iter_child_nodes(n))
+    return len(nodes)
+
+
+def literal_value(node: ast.Expression) -> objects.Object:
+    # Literals don't look anything up, so they need no environment.
+    return evaluator.evaluate(node, None)
+
+
+def is_truthy(node: ast.Expression) -> bool:
+    return evaluator.is_truthy(literal_value(node))
+
+
+def to_literal(obj: objects.Object) -> Optional[ast.Expression]:
+    if isinstance(obj, objects.Boolean):
+        literal = "true" if obj.value else "false"
+        token_type = TokenType.TRUE if obj.value else TokenType.FALSE
+        return ast.Boolean(Token(token_type, literal), obj.value)
+    elif isinstance(obj, objects.Integer):
+        node = ast.IntegerLiteral(Token(TokenType.INT, str(obj.value)))
+        node.value = obj.value
+        return node
+    elif isinstance(obj, objects.String):
+        return ast.StringLiteral(Token(TokenType.STRING, obj.value), obj.value)
+    return None
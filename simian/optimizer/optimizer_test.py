@@ -0,0 +1,111 @@
+import os
+import pytest
+import simian.ast as ast
+import simian.lexer as lexer
+import simian.objects as objects
+import simian.parser as parser
+from simian.engines import ENGINES
+from simian.optimizer import PassManager, optimize
+
+
+def test_constant_folding():
+    program = build_program('1 + 2 * 3; -(4 - 5); !true; "a" + "b" == "ab"; 7 / 2;')
+    report = run_passes(program, "constant_folding")
+    assert report == {"constant_folding": 14}
+    assert statements(program) == ["7", "1", "false", "true", "3.5"]
+
+
+def test_constant_folding_leaves_errors_for_run_time():
+    program = build_program('5 % 0; "a" - "b"; -true; x + 1;')
+    report = run_passes(program, "constant_folding")
+    assert report == {"constant_folding": 0}
+    assert statements(program) == ["(5 % 0)", "(a - b)", "(-true)", "(x + 1)"]
+
+
+def test_dead_branch_elimination():
+    program = build_program(
+        "if (true) { let a = 1; a } else { 2 }; let b = if (false) { 1 } else { 2 }; if (false) { puts(1) }; b"
+    )
+    report = run_passes(program, "dead_branch_elimination")
+    assert report == {"dead_branch_elimination": 18}
+    assert statements(program) == ["let a = 1;", "a", "let b = iftrue { 2 };", "b"]
+
+
+def test_dead_branch_elimination_keeps_final_value():
+    program = build_program("1; if (false) { 2 }")
+    assert run_passes(program, "dead_branch_elimination") == {
+        "dead_branch_elimination": 2
+    }
+    assert statements(program) == ["1", "iffalse {  }"]
+
+
+def test_comment_removal():
+    program = build_program("// one\n1;\n// two\nfn() { // three\n2 };\n// four")
+    assert run_passes(program, "comment_removal") == {"comment_removal": 3}
+    assert statements(program) == ["1", "fn() {2}", "// four;"]
+
+
+def test_passes_can_be_disabled():
+    manager = PassManager()
+    manager.disable("constant_folding")
+    program = build_program("if (1 < 2) { 3 }; // comment\n4")
+    assert manager.run(program) == {
+        "comment_removal": 1,
+        "dead_branch_elimination": 0,
+    }
+
+    manager.enable("constant_folding")
+    assert manager.run(program) == {
+        "comment_removal": 0,
+        "constant_folding": 2,
+        "dead_branch_elimination": 4,
+    }
+    assert statements(program) == ["3", "4"]
+
+    with pytest.raises(ValueError):
+        manager.disable("inlining")
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_results_are_unchanged(engine):
+    tests = [
+        "let x = 2 * 3 + 1; if (x > 5) { x } else { 0 }",
+        "if (true) { let y = 2; } y",
+        "let f = fn() { if (true) { return 1 + 1; } 3 }; f();",
+        "let i = 0; while (i < 3) { if (true) { let i = i + 1; } } i",
+        "if (true) {}",
+        "1; if (false) { 2 }",
+        "5; // comment",
+        "let f = fn() { 1 // one\n}; f()",
+        "if (!false) { -5 } else { 1 / 0 }",
+        '[1 + 1, "a" + "b", {1 + 1: true == false}]',
+        "let a = 1; let g = fn() { if (1 == 1) { a } }; g()",
+    ]
+    evaluate = ENGINES[engine]
+    for tt in tests:
+        expected = evaluate(build_program(tt), objects.new_environment())
+        got = evaluate(optimize(build_program(tt)), objects.new_environment())
+        assert str(got) == str(expected), tt
+        assert type(got) is type(expected), tt
+
+
+####################
+#      HELPERS     #
+####################
+def run_passes(program: ast.Program, *enabled: str):
+    manager = PassManager()
+    for p in manager.passes:
+        if p.name not in enabled:
+            manager.disable(p.name)
+    return manager.run(program)
+
+
+def statements(program: ast.Program):
+    return [str(s) for s in program.statements]
+
+
+def build_program(input_: str) -> ast.Program:
+    p = parser.Parser(lexer.new(input_), os.getcwd())
+    program = p.parse_program()
+    assert len(p.errors) == 0
+    return program
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import enum
-from typing import List
+from typing import List, Optional, Union
 
 import simian.ast as ast
-from simian.lexer import Lexer
+from simian.lexer import Lexer, RegexLexer, TokenReader, TokenStore
 from simian.token import TokenType
 
 __all__ = ["Parser", "Precedence"]
@@ -41,6 +41,69 @@ precedences = {
     TokenType.PERIOD: Precedence.INDEX,
 }
 
+# Parser compares precedences as ints, and binds the token types it checks
+# once, as reading either off an enum costs as much as a function call.
+PRECEDENCES = {token_type: p.value for token_type, p in precedences.items()}
+LOWEST = Precedence.LOWEST.value
+PREFIX = Precedence.PREFIX.value
+
+IDENT = TokenType.IDENT
+INT = TokenType.INT
+STRING = TokenType.STRING
+COMMENT = TokenType.COMMENT
+EOF = TokenType.EOF
+TRUE = TokenType.TRUE
+FALSE = TokenType.FALSE
+BANG = TokenType.BANG
+MINUS = TokenType.MINUS
+ASSIGN = TokenType.ASSIGN
+COLON = TokenType.COLON
+COMMA = TokenType.COMMA
+SEMICOLON = TokenType.SEMICOLON
+LPAREN = TokenType.LPAREN
+RPAREN = TokenType.RPAREN
+LBRACE = TokenType.LBRACE
+RBRACE = TokenType.RBRACE
+LBRACKET = TokenType.LBRACKET
+RBRACKET = TokenType.RBRACKET
+PERIOD = TokenType.PERIOD
+FUNCTION = TokenType.FUNCTION
+LET = TokenType.LET
+IF = TokenType.IF
+ELSE = TokenType.ELSE
+RETURN = TokenType.RETURN
+IMPORT = TokenType.IMPORT
+WHILE = TokenType.WHILE
+
+# What Parser.parse does next: parse a statement, a block or an expression
+# starting at the current token, or resume the frame on top of its stack
+# with the node just parsed.
+STATEMENT, BLOCK, EXPRESSION, RESUME = range(4)
+
+# What a frame on Parser.parse's stack is waiting for. A frame is a list of
+# one of these followed by what it needs to finish its node.
+(
+    DONE,  # [DONE]: hands the node back from parse.
+    OPERATORS,  # [OPERATORS, precedence]: applies infix operators to the node.
+    OPERAND,  # [OPERAND, node]: the right of a prefix or infix expression.
+    GROUPED,  # [GROUPED]: the expression in parentheses.
+    ELEMENTS,  # [ELEMENTS, array, elements]
+    ARGUMENTS,  # [ARGUMENTS, call, arguments]
+    INDEX,  # [INDEX, token, left]: the index, or the start of a slice.
+    SLICE,  # [SLICE, token, left, start]: the end of a slice, or None.
+    KEY,  # [KEY, hash, None]
+    VALUE,  # [VALUE, hash, key]
+    CONDITION,  # [CONDITION, if expression or while statement]
+    CONSEQUENCE,  # [CONSEQUENCE, if expression]
+    ALTERNATIVE,  # [ALTERNATIVE, if expression]
+    BODY,  # [BODY, function literal or while statement]
+    IMPORT_NAME,  # [IMPORT_NAME, import expression]
+    LET_VALUE,  # [LET_VALUE, let statement]
+    RETURN_VALUE,  # [RETURN_VALUE, return statement]
+    EXPRESSION_STATEMENT,  # [EXPRESSION_STATEMENT, expression statement]
+    STATEMENTS,  # [STATEMENTS, block]
+) = range(19)
+
 # Hrmm...
 # type (
 # 	prefixParseFn func() ast.Expression
@@ -49,48 +112,28 @@ precedences = {
 
 
 class Parser:
-    def __init__(self, lexer: Lexer, current_dir: str) -> None:
-        self.lexer: Lexer = lexer
+    """A Pratt parser that keeps the nodes it is part way through on a
+    stack of its own rather than Python's, so it parses expressions and
+    blocks nested hundreds of thousands deep. It builds the same AST, and
+    reports the same errors, as the recursive parser it replaced, which
+    benchmarks/recursive_parser.py keeps.
+    """
+
+    def __init__(
+        self,
+        lexer: Union[Lexer, RegexLexer, TokenReader, TokenStore],
+        current_dir: str,
+    ) -> None:
+        # Tokens read from a TokenStore carry positions, which errors report.
+        if isinstance(lexer, TokenStore):
+            lexer = lexer.reader()
+        self.lexer = lexer
         self.current_dir: str = current_dir
         self.errors: [str] = []
 
         self.current_token: TokenType = self.lexer.next_token()
         self.peek_token: TokenType = self.lexer.next_token()
 
-        self.prefix_parse_fns = {
-            TokenType.IDENT: self.parse_identifier,
-            TokenType.INT: self.parse_integer_literal,
-            TokenType.BANG: self.parse_prefix_expression,
-            TokenType.MINUS: self.parse_prefix_expression,
-            TokenType.TRUE: self.parse_boolean,
-            TokenType.FALSE: self.parse_boolean,
-            TokenType.LPAREN: self.parse_grouped_expression,
-            TokenType.IF: self.parse_if_expression,
-            TokenType.FUNCTION: self.parse_function_literal,
-            TokenType.STRING: self.parse_string_literal,
-            TokenType.LBRACKET: self.parse_array_literal,
-            TokenType.LBRACE: self.parse_hash_literal,
-            TokenType.IMPORT: self.parse_import_expression,
-            TokenType.WHILE: self.parse_while_statement,
-        }
-
-        self.infix_parse_fns = {
-            TokenType.PLUS: self.parse_infix_expression,
-            TokenType.MINUS: self.parse_infix_expression,
-            TokenType.SLASH: self.parse_infix_expression,
-            TokenType.ASTERISK: self.parse_infix_expression,
-            TokenType.MODULO: self.parse_infix_expression,
-            TokenType.EQ: self.parse_infix_expression,
-            TokenType.NOT_EQ: self.parse_infix_expression,
-            TokenType.AND: self.parse_infix_expression,
-            TokenType.OR: self.parse_infix_expression,
-            TokenType.LT: self.parse_infix_expression,
-            TokenType.GT: self.parse_infix_expression,
-            TokenType.LPAREN: self.parse_call_expression,
-            TokenType.LBRACKET: self.parse_index_expression,
-            TokenType.PERIOD: self.parse_selector_expression,
-        }
-
     def next_token(self) -> None:
         self.current_token = self.peek_token
         self.peek_token = self.lexer.next_token()
@@ -106,125 +149,320 @@ class Parser:
 
         return program
 
-    # STATEMENTS
     def parse_statement(self) -> ast.Statement:
-        if self.current_token.token_type == TokenType.COMMENT:
-            return self.parse_comment_statement()
-        if self.current_token.token_type == TokenType.LET:
-            return self.parse_let_statement()
-        elif self.current_token.token_type == TokenType.RETURN:
-            return self.parse_return_statement()
-        elif self.current_token.token_type == TokenType.WHILE:
-            return self.parse_while_statement()
-        else:
-            return self.parse_expression_statement()
-
-    def parse_comment_statement(self):
-        return ast.Comment(self.current_token, self.current_token.literal)
-
-    def parse_return_statement(self):
-        stmt = ast.ReturnStatement(self.current_token)
-        self.next_token()
-        stmt.return_value = self.parse_expression(Precedence.LOWEST)
-
-        if self.peek_token_is(TokenType.SEMICOLON):
-            self.next_token()
-
-        return stmt
-
-    def parse_while_statement(self):
-        stmt = ast.WhileStatement(self.current_token)
-        if not self.expect_peek(TokenType.LPAREN):
-            return None
-
-        self.next_token()
-        stmt.condition = self.parse_expression(Precedence.LOWEST)
-        if not self.expect_peek(TokenType.RPAREN):
-            return None
-
-        if not self.expect_peek(TokenType.LBRACE):
-            return None
-
-        stmt.body = self.parse_block_statement()
-
-        return stmt
-
-    def parse_expression_statement(self):
-        stmt = ast.ExpressionStatement(self.current_token)
-        stmt.expression = self.parse_expression(Precedence.LOWEST)
-        if self.peek_token_is(TokenType.SEMICOLON):
-            self.next_token()
-        return stmt
-
-    def parse_let_statement(self) -> ast.LetStatement:
-        stmt = ast.LetStatement(self.current_token)
-
-        if not self.expect_peek(TokenType.IDENT):
-            return None
-
-        stmt.name = ast.Identifier(self.current_token, self.current_token.literal)
-
-        if not self.expect_peek(TokenType.ASSIGN):
-            return None
-
-        self.next_token()
-        stmt.value = self.parse_expression(Precedence.LOWEST)
-
-        if self.peek_token_is(TokenType.SEMICOLON):
-            self.next_token()
-
-        return stmt
+        return self.parse(STATEMENT)
 
     def parse_block_statement(self) -> ast.BlockStatement:
-        block = ast.BlockStatement(self.current_token)
-        block.statements: List[ast.Statement] = []
-        self.next_token()
-
-        while not self.current_token_is(TokenType.RBRACE) and not self.current_token_is(
-            TokenType.EOF
-        ):
-            stmt = self.parse_statement()
-            if stmt is not None:
-                block.statements.append(stmt)
-            self.next_token()
+        return self.parse(BLOCK)
+
+    def parse_expression(self, precedence: Precedence) -> ast.Expression:
+        return self.parse(EXPRESSION, precedence.value)
+
+    def parse(self, action: int, precedence: int = LOWEST) -> Optional[ast.Node]:
+        """Parse a statement, a block or an expression binding tighter than
+        `precedence`, as `action` says, one token at a time. Where the
+        recursive parser would call itself for a part of a node, this pushes
+        a frame for the node and starts on the part; once the part is
+        parsed, the frame on top of the stack is resumed with it.
+        """
+        stack = [[DONE]]
+        node = None
+        while True:
+            if action == RESUME:
+                frame = stack[-1]
+                kind = frame[0]
+                if kind == OPERATORS:
+                    token_type = self.peek_token.token_type
+                    if frame[1] >= PRECEDENCES.get(token_type, LOWEST):
+                        stack.pop()
+                        continue
+                    self.next_token()
+                    token = self.current_token
+                    if token_type is LPAREN:
+                        node = ast.CallExpression(token, node)
+                        if self.peek_token.token_type is RPAREN:
+                            self.next_token()
+                            node.arguments = []
+                        else:
+                            self.next_token()
+                            stack.append([ARGUMENTS, node, []])
+                            action, precedence = EXPRESSION, LOWEST
+                    elif token_type is LBRACKET:
+                        self.next_token()
+                        if self.current_token.token_type is COLON:
+                            stack.append([SLICE, token, node, None])
+                            node = None
+                            if self.peek_token.token_type is not RBRACKET:
+                                self.next_token()
+                                action, precedence = EXPRESSION, LOWEST
+                        else:
+                            stack.append([INDEX, token, node])
+                            action, precedence = EXPRESSION, LOWEST
+                    elif token_type is PERIOD:
+                        self.expect_peek(IDENT)
+                        index = ast.StringLiteral(
+                            self.current_token, self.current_token.literal
+                        )
+                        node = ast.IndexExpression(self.current_token, node, index)
+                    else:
+                        stack.append(
+                            [OPERAND, ast.InfixExpression(token, token.literal, node)]
+                        )
+                        self.next_token()
+                        action, precedence = EXPRESSION, PRECEDENCES[token_type]
+                elif kind == OPERAND:
+                    stack.pop()
+                    frame[1].right = node
+                    node = frame[1]
+                elif kind == ELEMENTS or kind == ARGUMENTS:
+                    frame[2].append(node)
+                    if self.peek_token.token_type is COMMA:
+                        self.next_token()
+                        self.next_token()
+                        action, precedence = EXPRESSION, LOWEST
+                        continue
+                    stack.pop()
+                    if kind == ELEMENTS:
+                        ok = self.expect_peek(RBRACKET)
+                        frame[1].elements = frame[2] if ok else None
+                    else:
+                        ok = self.expect_peek(RPAREN)
+                        frame[1].arguments = frame[2] if ok else None
+                    node = frame[1]
+                elif kind == STATEMENTS:
+                    if node is not None:
+                        frame[1].statements.append(node)
+                    self.next_token()
+                    token_type = self.current_token.token_type
+                    if token_type is not RBRACE and token_type is not EOF:
+                        action = STATEMENT
+                        continue
+                    stack.pop()
+                    node = frame[1]
+                elif kind == EXPRESSION_STATEMENT:
+                    stack.pop()
+                    frame[1].expression = node
+                    if self.peek_token.token_type is SEMICOLON:
+                        self.next_token()
+                    node = frame[1]
+                elif kind == GROUPED:
+                    stack.pop()
+                    if not self.expect_peek(RPAREN):
+                        node = None
+                elif kind == INDEX:
+                    token, left = frame[1], frame[2]
+                    if self.peek_token.token_type is COLON:
+                        self.next_token()
+                        stack[-1] = [SLICE, token, left, node]
+                        node = None
+                        if self.peek_token.token_type is not RBRACKET:
+                            self.next_token()
+                            action, precedence = EXPRESSION, LOWEST
+                        continue
+                    stack.pop()
+                    node = ast.IndexExpression(self.current_token, left, node)
+                    if not self.expect_peek(RBRACKET):
+                        node = None
+                elif kind == SLICE:
+                    stack.pop()
+                    if self.expect_peek(RBRACKET):
+                        node = ast.SliceExpression(frame[1], frame[2], frame[3], node)
+                    else:
+                        node = None
+                elif kind == KEY:
+                    if self.expect_peek(COLON):
+                        frame[0], frame[2] = VALUE, node
+                        self.next_token()
+                        action, precedence = EXPRESSION, LOWEST
+                        continue
+                    stack.pop()
+                    node = None
+                elif kind == VALUE:
+                    frame[1].pairs[frame[2]] = node
+                    if not self.peek_token_is(RBRACE) and not self.expect_peek(COMMA):
+                        stack.pop()
+                        node = None
+                    elif not self.peek_token_is(RBRACE):
+                        self.next_token()
+                        frame[0] = KEY
+                        action, precedence = EXPRESSION, LOWEST
+                    else:
+                        stack.pop()
+                        self.next_token()
+                        node = frame[1]
+                elif kind == LET_VALUE or kind == RETURN_VALUE:
+                    stack.pop()
+                    if kind == LET_VALUE:
+                        frame[1].value = node
+                    else:
+                        frame[1].return_value = node
+                    if self.peek_token.token_type is SEMICOLON:
+                        self.next_token()
+                    node = frame[1]
+                elif kind == CONDITION:
+                    frame[1].condition = node
+                    if self.expect_peek(RPAREN) and self.expect_peek(LBRACE):
+                        frame[0] = (
+                            CONSEQUENCE
+                            if isinstance(frame[1], ast.IfExpression)
+                            else BODY
+                        )
+                        action = BLOCK
+                        continue
+                    stack.pop()
+                    node = None
+                elif kind == CONSEQUENCE:
+                    frame[1].consequence = node
+                    if self.peek_token.token_type is ELSE:
+                        self.next_token()
+                        if self.expect_peek(LBRACE):
+                            frame[0] = ALTERNATIVE
+                            action = BLOCK
+                            continue
+                        stack.pop()
+                        node = None
+                    else:
+                        stack.pop()
+                        node = frame[1]
+                elif kind == ALTERNATIVE:
+                    stack.pop()
+                    frame[1].alternative = node
+                    node = frame[1]
+                elif kind == BODY:
+                    stack.pop()
+                    frame[1].body = node
+                    node = frame[1]
+                elif kind == IMPORT_NAME:
+                    stack.pop()
+                    frame[1].name = node
+                    node = frame[1] if self.expect_peek(RPAREN) else None
+                else:
+                    return node
+
+            elif action == EXPRESSION:
+                # A prefix: a node of its own, or the start of one.
+                stack.append([OPERATORS, precedence])
+                action = RESUME
+                token = self.current_token
+                token_type = token.token_type
+                if token_type is IDENT:
+                    node = ast.Identifier(token, token.literal)
+                elif token_type is INT:
+                    node = self.parse_integer_literal()
+                elif token_type is STRING:
+                    node = ast.StringLiteral(token, token.literal)
+                elif token_type is TRUE or token_type is FALSE:
+                    node = ast.Boolean(token, token_type is TRUE)
+                elif token_type is BANG or token_type is MINUS:
+                    stack.append([OPERAND, ast.PrefixExpression(token, token.literal)])
+                    self.next_token()
+                    action, precedence = EXPRESSION, PREFIX
+                elif token_type is LPAREN:
+                    stack.append([GROUPED])
+                    self.next_token()
+                    action, precedence = EXPRESSION, LOWEST
+                elif token_type is LBRACKET:
+                    node = ast.ArrayLiteral(token)
+                    if self.peek_token.token_type is RBRACKET:
+                        self.next_token()
+                        node.elements = []
+                    else:
+                        self.next_token()
+                        stack.append([ELEMENTS, node, []])
+                        action, precedence = EXPRESSION, LOWEST
+                elif token_type is LBRACE:
+                    node = ast.HashLiteral(token)
+                    if self.peek_token.token_type is RBRACE:
+                        self.next_token()
+                    else:
+                        self.next_token()
+                        stack.append([KEY, node, None])
+                        action, precedence = EXPRESSION, LOWEST
+                elif token_type is IF or token_type is WHILE:
+                    if token_type is IF:
+                        node = ast.IfExpression(token)
+                    else:
+                        node = ast.WhileStatement(token)
+                    if self.expect_peek(LPAREN):
+                        self.next_token()
+                        stack.append([CONDITION, node])
+                        action, precedence = EXPRESSION, LOWEST
+                    else:
+                        node = None
+                elif token_type is FUNCTION:
+                    node = ast.FunctionLiteral(token)
+                    if not self.expect_peek(LPAREN):
+                        node = None
+                        continue
+                    node.parameters = self.parse_function_parameters()
+                    if self.expect_peek(LBRACE):
+                        stack.append([BODY, node])
+                        action = BLOCK
+                    else:
+                        node = None
+                elif token_type is IMPORT:
+                    node = ast.ImportExpression(token, self.current_dir)
+                    if self.expect_peek(LPAREN):
+                        self.next_token()
+                        stack.append([IMPORT_NAME, node])
+                        action, precedence = EXPRESSION, LOWEST
+                    else:
+                        node = None
+                else:
+                    self.no_prefix_parse_fn_error(token_type)
+                    # No operators apply to a missing prefix.
+                    stack.pop()
+                    node = None
+
+            elif action == STATEMENT:
+                token = self.current_token
+                token_type = token.token_type
+                if token_type is COMMENT:
+                    node = self.parse_comment_statement()
+                    action = RESUME
+                elif token_type is LET:
+                    node = ast.LetStatement(token)
+                    action = RESUME
+                    if not self.expect_peek(IDENT):
+                        node = None
+                        continue
+                    node.name = ast.Identifier(
+                        self.current_token, self.current_token.literal
+                    )
+                    if not self.expect_peek(ASSIGN):
+                        node = None
+                        continue
+                    self.next_token()
+                    stack.append([LET_VALUE, node])
+                    action, precedence = EXPRESSION, LOWEST
+                elif token_type is RETURN:
+                    stack.append([RETURN_VALUE, ast.ReturnStatement(token)])
+                    self.next_token()
+                    action, precedence = EXPRESSION, LOWEST
+                elif token_type is WHILE:
+                    node = ast.WhileStatement(token)
+                    action = RESUME
+                    if self.expect_peek(LPAREN):
+                        self.next_token()
+                        stack.append([CONDITION, node])
+                        action, precedence = EXPRESSION, LOWEST
+                    else:
+                        node = None
+                else:
+                    stack.append([EXPRESSION_STATEMENT, ast.ExpressionStatement(token)])
+                    action, precedence = EXPRESSION, LOWEST
+
+            else:
+                node = ast.BlockStatement(self.current_token)
+                self.next_token()
+                action = RESUME
+                token_type = self.current_token.token_type
+                if token_type is not RBRACE and token_type is not EOF:
+                    stack.append([STATEMENTS, node])
+                    action = STATEMENT
 
-        return block
-
-    # EXPRESSIONS
-    def parse_expression(self, precedence: int) -> ast.Expression:
-        prefix = self.prefix_parse_fns.get(self.current_token.token_type, None)
-        # print(
-        #     f"`prefix`: {prefix.__name__ if prefix is not None else prefix}, current token: {str(self.current_token)}"
-        # )
-        if prefix is None:
-            # print(
-            #     f"`prefix` is none: self.current_token.token_type: {self.current_token.token_type}"
-            # )
-            self.no_prefix_parse_fn_error(self.current_token.token_type)
-            return None
-        left_exp = prefix()
-
-        while (
-            not self.peek_token_is(TokenType.SEMICOLON)
-            and precedence.value < self.peek_precedence().value
-        ):
-            infix = self.infix_parse_fns.get(self.peek_token.token_type, None)
-            # print(
-            #     f"`infix`: {infix.__name__ if infix is not None else infix}, current token: {str(self.current_token)}"
-            # )
-
-            if infix is None:
-                return left_exp
-            self.next_token()
-
-            left_exp = infix(left_exp)
-        return left_exp
-
-    def parse_boolean(self) -> ast.Boolean:
-        return ast.Boolean(self.current_token, self.current_token_is(TokenType.TRUE))
-
-    def parse_identifier(self) -> ast.Identifier:
-        return ast.Identifier(self.current_token, self.current_token.literal)
+    def parse_comment_statement(self):
+        return ast.Comment(self.current_token, self.current_token.literal)
 
     def parse_integer_literal(self) -> ast.Expression:
         lit = ast.IntegerLiteral(self.current_token)
@@ -233,85 +471,10 @@ class Parser:
             return lit
         except ValueError:
             self.errors.append(
-                f"Could not parse {self.current_token.literal} as integer"
+                f"Could not parse {self.current_token.literal} as integer{self.at()}"
             )
             return None
 
-    def parse_string_literal(self) -> ast.StringLiteral:
-        return ast.StringLiteral(self.current_token, self.current_token.literal)
-
-    def parse_array_literal(self) -> ast.Expression:
-        array = ast.ArrayLiteral(self.current_token)
-        array.elements = self.parse_expression_list(TokenType.RBRACKET)
-        return array
-
-    def parse_prefix_expression(self) -> ast.Expression:
-        expression = ast.PrefixExpression(
-            self.current_token, self.current_token.literal
-        )
-        self.next_token()
-        expression.right = self.parse_expression(Precedence.PREFIX)
-        return expression
-
-    def parse_infix_expression(self, left: ast.Expression) -> ast.Expression:
-        expression = ast.InfixExpression(
-            self.current_token, self.current_token.literal, left
-        )
-        precedence = self.current_precedence()
-        self.next_token()
-        expression.right = self.parse_expression(precedence)
-        return expression
-
-    def parse_grouped_expression(self) -> ast.Expression:
-        self.next_token()
-        expression = self.parse_expression(Precedence.LOWEST)
-
-        if not self.expect_peek(TokenType.RPAREN):
-            return None
-
-        return expression
-
-    def parse_if_expression(self) -> ast.Expression:
-        expression = ast.IfExpression(self.current_token)
-        if not self.expect_peek(TokenType.LPAREN):
-            return None
-
-        self.next_token()
-        expression.condition = self.parse_expression(Precedence.LOWEST)
-
-        if not self.expect_peek(TokenType.RPAREN):
-            return None
-
-        if not self.expect_peek(TokenType.LBRACE):
-            return None
-
-        expression.consequence = self.parse_block_statement()
-
-        if self.peek_token_is(TokenType.ELSE):
-            self.next_token()
-
-            if not self.expect_peek(TokenType.LBRACE):
-                return None
-
-            expression.alternative = self.parse_block_statement()
-
-        return expression
-
-    def parse_function_literal(self):
-        lit = ast.FunctionLiteral(self.current_token)
-
-        if not self.expect_peek(TokenType.LPAREN):
-            return None
-
-        lit.parameters = self.parse_function_parameters()
-
-        if not self.expect_peek(TokenType.LBRACE):
-            return None
-
-        lit.body = self.parse_block_statement()
-
-        return lit
-
     def parse_function_parameters(self) -> List[ast.Identifier]:
         identifiers: List[ast.Identifier] = []
 
@@ -335,66 +498,6 @@ class Parser:
 
         return identifiers
 
-    def parse_call_expression(self, function: ast.Expression) -> ast.Expression:
-        exp = ast.CallExpression(self.current_token, function)
-        exp.arguments = self.parse_expression_list(TokenType.RPAREN)
-        return exp
-
-    def parse_index_expression(self, left: ast.Expression) -> ast.Expression:
-        self.next_token()
-        index = self.parse_expression(Precedence.LOWEST)
-        exp = ast.IndexExpression(self.current_token, left, index)
-
-        if not self.expect_peek(TokenType.RBRACKET):
-            return None
-
-        return exp
-
-    def parse_selector_expression(self, exp: ast.Expression) -> ast.Expression:
-        self.expect_peek(TokenType.IDENT)
-        index = ast.StringLiteral(self.current_token, self.current_token.literal)
-        return ast.IndexExpression(self.current_token, exp, index)
-
-    def parse_hash_literal(self) -> ast.Expression:
-        lit = ast.HashLiteral(self.current_token)
-
-        while not self.peek_token_is(TokenType.RBRACE):
-            self.next_token()
-            key = self.parse_expression(Precedence.LOWEST)
-
-            if not self.expect_peek(TokenType.COLON):
-                return None
-
-            self.next_token()
-            value = self.parse_expression(Precedence.LOWEST)
-
-            lit.pairs[key] = value
-
-            if not self.peek_token_is(TokenType.RBRACE) and not self.expect_peek(
-                TokenType.COMMA
-            ):
-                return None
-
-        if not self.expect_peek(TokenType.RBRACE):
-            return None
-
-        return lit
-
-    def parse_import_expression(self) -> ast.Expression:
-        expression = ast.ImportExpression(self.current_token, self.current_dir)
-
-        if not self.expect_peek(TokenType.LPAREN):
-            return None
-
-        self.next_token()
-
-        expression.name = self.parse_expression(Precedence.LOWEST)
-
-        if not self.expect_peek(TokenType.RPAREN):
-            return None
-
-        return expression
-
     ###########
     # HELPERS #
     ###########
@@ -416,7 +519,7 @@ class Parser:
         return self.peek_token.token_type == tokenType
 
     def peek_error(self, tokenType: TokenType) -> None:
-        error_message = f"Expected next token to be {tokenType}, got {self.peek_token.token_type} instead."
+        error_message = f"Expected next token to be {tokenType}, got {self.peek_token.token_type} instead{self.at(peek=True)}."
         # print(error_message)
         self.errors.append(error_message)
 
@@ -424,24 +527,18 @@ class Parser:
         return precedences.get(self.peek_token.token_type, Precedence.LOWEST)
 
     def no_prefix_parse_fn_error(self, tokenType: TokenType):
-        self.errors.append(f"No prefix parse function for {tokenType} found.")
-
-    def parse_expression_list(self, endTokenType: TokenType) -> List[ast.Expression]:
-        expressions: List[ast.Expression] = []
-
-        if self.peek_token_is(endTokenType):
-            self.next_token()
-            return expressions
-
-        self.next_token()
-        expressions.append(self.parse_expression(Precedence.LOWEST))
-
-        while self.peek_token_is(TokenType.COMMA):
-            self.next_token()
-            self.next_token()
-            expressions.append(self.parse_expression(Precedence.LOWEST))
-
-        if not self.expect_peek(endTokenType):
-            return None
-
-        return expressions
+        self.errors.append(f"No prefix parse function for {tokenType} found{self.at()}.")
+
+    def at(self, peek: bool = False) -> str:
+        """Where the current token, or the peek token, starts, for an error
+        message. Empty for the character-at-a-time Lexer, which keeps no
+        positions.
+        """
+        if isinstance(self.lexer, TokenReader):
+            line, column = self.lexer.position(self.lexer.index - (0 if peek else 1))
+        elif isinstance(self.lexer, RegexLexer):
+            # The lexer's last token is the peek token.
+            line, column = self.lexer.position(last=peek)
+        else:
+            return ""
+        return f" at line {line}, column {column}"
@@ -1,15 +1,23 @@
+import io
 import os
 import pytest
 import simian.ast as ast
 import simian.lexer as lexer
 import simian.parser as parser
 
+from benchmarks.recursive_parser import RecursiveParser
 from simian.lexer import Lexer
 from simian.parser import Parser
 from simian.token import Token
 
 
-def test_operator_precedence():
+@pytest.fixture(params=[Parser, RecursiveParser])
+def new_parser(request):
+    """Each parser, for a test to run against."""
+    return request.param
+
+
+def test_operator_precedence(new_parser):
     tests = [
         ("-a * b", "((-a) * b)",),
         ("!-a", "(!(-a))",),
@@ -48,7 +56,7 @@ def test_operator_precedence():
     ]
     for tt in tests:
         input_, expected = tt
-        program = build_program(input_)
+        program = build_program(input_, new_parser)
         actual = str(program)
         assert actual == expected
 
@@ -56,7 +64,7 @@ def test_operator_precedence():
 ##############
 # STATEMENTS #
 ##############
-def test_let_statements():
+def test_let_statements(new_parser):
     tests = [
         ("let x = 5", "x", 5),
         ("let y = true;", "y", True),
@@ -66,7 +74,7 @@ def test_let_statements():
     for tt in tests:
         input_, expected_identifier, expected_value = tt
 
-        program = build_program(input_)
+        program = build_program(input_, new_parser)
         assert len(program.statements) == 1
 
         stmt = program.statements[0]
@@ -78,7 +86,7 @@ def test_let_statements():
         assert literal_expression_tester(stmt.value, expected_value)
 
 
-def test_return_statements():
+def test_return_statements(new_parser):
     input_ = """
     return 5;
     return 10;
@@ -87,7 +95,7 @@ def test_return_statements():
 
     expected = [5, 10, 993322]
 
-    program = build_program(input_)
+    program = build_program(input_, new_parser)
     assert len(program.statements) == 3
 
     for i, stmt in enumerate(program.statements):
@@ -102,9 +110,9 @@ def test_return_statements():
 ###############
 
 
-def test_identifier_expression():
+def test_identifier_expression(new_parser):
     input_ = "foobar"
-    program = build_program(input_)
+    program = build_program(input_, new_parser)
 
     assert len(program.statements) == 1
     stmt = program.statements[0]
@@ -115,9 +123,9 @@ def test_identifier_expression():
     assert ident.token_literal() == "foobar"
 
 
-def test_string_literal_expression():
+def test_string_literal_expression(new_parser):
     input_ = '"hello world"'
-    program = build_program(input_)
+    program = build_program(input_, new_parser)
 
     assert len(program.statements) == 1
     stmt = program.statements[0]
@@ -127,9 +135,9 @@ def test_string_literal_expression():
     assert literal.value == "hello world"
 
 
-def test_array_literal():
+def test_array_literal(new_parser):
     input_ = "[1, 2 * 2, 3 + 3]"
-    program = build_program(input_)
+    program = build_program(input_, new_parser)
     stmt = program.statements[0]
     assert isinstance(stmt, ast.ExpressionStatement)
     array = stmt.expression
@@ -140,17 +148,17 @@ def test_array_literal():
     assert infix_expression_tester(array.elements[2], 3, "+", 3)
 
 
-def test_hash_literal_empty():
-    program = build_program("{}")
+def test_hash_literal_empty(new_parser):
+    program = build_program("{}", new_parser)
     stmt = program.statements[0]
     lit = stmt.expression
     assert isinstance(lit, ast.HashLiteral)
     assert len(lit.pairs) == 0
 
 
-def test_hash_literal_string_keys():
+def test_hash_literal_string_keys(new_parser):
     input_ = """{"one": 1, "two": 2, "three": 3}"""
-    program = build_program(input_)
+    program = build_program(input_, new_parser)
     stmt = program.statements[0]
     lit = stmt.expression
     assert isinstance(lit, ast.HashLiteral)
@@ -168,9 +176,9 @@ def test_hash_literal_string_keys():
         assert integer_literal_tester(value, expected_value)
 
 
-def test_hash_literal_expressions():
+def test_hash_literal_expressions(new_parser):
     input_ = """{"one": 0 + 1, "two": 10 - 8, "three": 15 / 5}"""
-    program = build_program(input_)
+    program = build_program(input_, new_parser)
     stmt = program.statements[0]
     assert isinstance(stmt, ast.ExpressionStatement)
     lit = stmt.expression
@@ -196,7 +204,7 @@ def test_hash_literal_expressions():
 ###############
 
 
-def test_prefix_expression():
+def test_prefix_expression(new_parser):
     tests = [
         ("!5;", "!", 5),
         ("-15;", "-", 15),
@@ -206,7 +214,7 @@ def test_prefix_expression():
 
     for tt in tests:
         input_, operator, value = tt
-        program = build_program(input_)
+        program = build_program(input_, new_parser)
         assert len(program.statements) == 1
         stmt = program.statements[0]
         assert isinstance(stmt, ast.ExpressionStatement)
@@ -215,9 +223,9 @@ def test_prefix_expression():
         # skip testLiteralExpression for now
 
 
-def test_if_expression():
+def test_if_expression(new_parser):
     input_ = "if (x < y) { x }"
-    program = build_program(input_)
+    program = build_program(input_, new_parser)
     assert len(program.statements) == 1
     stmt = program.statements[0]
     assert isinstance(stmt, ast.ExpressionStatement)
@@ -231,9 +239,9 @@ def test_if_expression():
     assert exp.alternative == None
 
 
-def test_if_else_expression():
+def test_if_else_expression(new_parser):
     input_ = "if (x < y) { x } else { y }"
-    program = build_program(input_)
+    program = build_program(input_, new_parser)
     assert len(program.statements) == 1
     stmt = program.statements[0]
     assert isinstance(stmt, ast.ExpressionStatement)
@@ -250,9 +258,9 @@ def test_if_else_expression():
     assert identifier_tester(alternative.expression, "y")
 
 
-def test_function_literal_expression():
+def test_function_literal_expression(new_parser):
     input_ = "fn(x, y) { x + y }"
-    program = build_program(input_)
+    program = build_program(input_, new_parser)
     assert len(program.statements) == 1
     stmt = program.statements[0]
     assert isinstance(stmt, ast.ExpressionStatement)
@@ -267,9 +275,9 @@ def test_function_literal_expression():
     infix_expression_tester(body_stmt.expression, "x", "+", "y")
 
 
-def test_call_expression():
+def test_call_expression(new_parser):
     input_ = "add(1, 2 * 3, 4 + 5);"
-    program = build_program(input_)
+    program = build_program(input_, new_parser)
     assert len(program.statements) == 1
     stmt = program.statements[0]
     assert isinstance(stmt, ast.ExpressionStatement)
@@ -282,9 +290,9 @@ def test_call_expression():
     assert infix_expression_tester(exp.arguments[2], 4, "+", 5)
 
 
-def test_index_expression():
+def test_index_expression(new_parser):
     input_ = "myArray[1+1]"
-    program = build_program(input_)
+    program = build_program(input_, new_parser)
     stmt = program.statements[0]
     assert isinstance(stmt, ast.ExpressionStatement)
     index_exp = stmt.expression
@@ -293,9 +301,32 @@ def test_index_expression():
     assert infix_expression_tester(index_exp.index, 1, "+", 1)
 
 
-def test_selector_expression():
+def test_slice_expression(new_parser):
+    tests = [
+        ("a[1:n]", 1, "n"),
+        ("a[:n]", None, "n"),
+        ("a[1:]", 1, None),
+        ("a[:]", None, None),
+    ]
+    for input_, start, end in tests:
+        program = build_program(input_, new_parser)
+        stmt = program.statements[0]
+        assert isinstance(stmt, ast.ExpressionStatement)
+        exp = stmt.expression
+        assert isinstance(exp, ast.SliceExpression)
+        assert identifier_tester(exp.left, "a")
+        for bound, expected in ((exp.start, start), (exp.end, end)):
+            if expected is None:
+                assert bound is None
+            else:
+                assert literal_expression_tester(bound, expected)
+    program = build_program("a[1 + 1:2][0]", new_parser)
+    assert str(program) == "((a[(1 + 1):2])[0])"
+
+
+def test_selector_expression(new_parser):
     input_ = "myHash.key"
-    program = build_program(input_)
+    program = build_program(input_, new_parser)
     stmt = program.statements[0]
     assert isinstance(stmt, ast.ExpressionStatement)
     exp = stmt.expression
@@ -304,13 +335,93 @@ def test_selector_expression():
     assert identifier_tester(exp.index, "key")
 
 
+def test_parsing_a_token_store(new_parser):
+    input_ = 'let add = fn(x, y) { x + y };\nputs(add(1, 2), "three");'
+    expected = build_program(input_, new_parser)
+    p = new_parser(lexer.tokenize(input_), os.getcwd())
+    program = p.parse_program()
+    check_parser_errors(p)
+    assert str(program) == str(expected)
+
+
+def test_errors_from_a_token_store_have_positions(new_parser):
+    p = new_parser(lexer.tokenize('let x = 5;\nlet = "a";'), os.getcwd())
+    p.parse_program()
+    assert p.errors[0] == (
+        "Expected next token to be TokenType.IDENT, got TokenType.ASSIGN instead"
+        " at line 2, column 5."
+    )
+    assert p.errors[1] == "No prefix parse function for TokenType.ASSIGN found at line 2, column 5."
+
+
+def test_errors_from_a_stream_have_positions(new_parser):
+    source = io.StringIO("let x = 5;\n" * 10 + 'let = "a";')
+    p = new_parser(lexer.new(source, 4), os.getcwd())
+    p.parse_program()
+    assert p.errors[0] == (
+        "Expected next token to be TokenType.IDENT, got TokenType.ASSIGN instead"
+        " at line 11, column 5."
+    )
+    assert p.errors[1] == "No prefix parse function for TokenType.ASSIGN found at line 11, column 5."
+
+
+def test_errors_match_the_recursive_parser():
+    tests = [
+        "let = 5;",
+        "let x 5;",
+        "(1 + 2",
+        "[1, 2",
+        "add(1, 2",
+        '{"a" 1}',
+        '{"a": 1 "b": 2}',
+        "a[1",
+        "a[1:2",
+        "if (x { 1 }",
+        "if (x) { 1 } else 2",
+        "fn(x { x }",
+        "while (x) 1",
+        'import "a"',
+        "99999999999999999999999999 + )",
+        "a.1; } + ;",
+    ]
+    for input_ in tests:
+        p = Parser(lexer.new(input_), os.getcwd())
+        program = p.parse_program()
+        r = RecursiveParser(lexer.new(input_), os.getcwd())
+        expected = r.parse_program()
+        assert p.errors
+        assert p.errors == r.errors
+        assert ast.dump(program) == ast.dump(expected)
+
+
+def test_deep_nesting():
+    depth = 20_000
+    tests = [
+        ("[" * depth + "]" * depth, ast.ArrayLiteral, lambda exp: exp.elements[0]),
+        ("-" * depth + "1", ast.PrefixExpression, lambda exp: exp.right),
+        ("1 + (" * depth + "1" + ")" * depth, ast.InfixExpression, lambda exp: exp.right),
+        (
+            "if (x) { " * depth + "1" + " }" * depth,
+            ast.IfExpression,
+            lambda exp: exp.consequence.statements[0].expression,
+        ),
+    ]
+    for input_, node_type, inner in tests:
+        program = build_program(input_)
+        exp = program.statements[0].expression
+        for _ in range(depth - 1):
+            assert isinstance(exp, node_type)
+            exp = inner(exp)
+        assert isinstance(exp, node_type)
+
+
 ####################
 #      HELPERS     #
 ####################
-def build_program(input_: str) -> ast.Program:
+def build_program(input_: str, new_parser=Parser) -> ast.Program:
     l = lexer.new(input_)
     cwd = os.getcwd()
-    p = Parser(l, cwd)
+    p = new_parser(l, cwd)
     program = p.parse_program()
     check_parser_errors(p)
     return program
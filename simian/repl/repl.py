@@ -8,7 +8,8 @@ import simian.lexer as lexer
 import simian.parser as parser
 from simian import objects
 from simian.token import TokenType
-from simian.evaluator import evaluate
+from simian.engines import DEFAULT_ENGINE, get_engine
+from simian.optimizer import optimize
 
 __all__ = ["Rlpl", "Rppl", "Repl", "print_errors"]
 
@@ -90,8 +91,7 @@ class Rppl:
                 scanned = input(PROMPT)
                 if scanned == "exit()":
                     sys.exit()
-                l = lexer.new(scanned)
-                p = parser.Parser(l, os.getcwd())
+                p = parser.Parser(lexer.tokenize(scanned), os.getcwd())
                 program = p.parse_program()
                 if len(p.errors) != 0:
                     print_errors(p.errors)
@@ -104,23 +104,27 @@ class Rppl:
 
 
 class Repl:
+    def __init__(self, engine: str = DEFAULT_ENGINE):
+        self.engine = engine
+        self.evaluate = get_engine(engine)
+
     def start(self):
-        print_header(mode="EVALUATION")
+        print_header(mode=f"EVALUATION ({self.engine})")
         env = objects.new_environment()
 
         while True:
             try:
                 scanned = input(PROMPT)
-                l = lexer.new(scanned)
-                p = parser.Parser(l, os.getcwd())
+                p = parser.Parser(lexer.tokenize(scanned), os.getcwd())
                 program = p.parse_program()
                 if len(p.errors) != 0:
                     print_errors(p.errors)
                     continue
 
-                evaluated = evaluate(program, env)
+                evaluated = self.evaluate(optimize(program), env)
                 if evaluated is not None:
-                    print(str(evaluated))
+                    evaluated.write_to(sys.stdout)
+                    sys.stdout.write("\n")
             except KeyboardInterrupt:
                 print(f"\nNow exiting... {SALUTATION}")
                 sys.exit(0)
@@ -0,0 +1,3 @@
+from .resolver import Resolver, resolve, declared_names, mark_tail_calls
+
+__all__ = ["Resolver", "resolve", "declared_names", "mark_tail_calls"]
@@ -0,0 +1,114 @@
+from typing import Dict, List
+
+import simian.ast as ast
+
+__all__ = ["Resolver", "resolve", "declared_names", "mark_tail_calls"]
+
+
+class Resolver:
+    """Annotates identifiers with where their binding lives.
+
+    Every `ast.Identifier` gets a `depth` (how many function frames out from
+    the one it appears in) and a `slot` (its index in that frame), or
+    `slot = None` when it isn't a local of any enclosing function, in which
+    case it's looked up by name in the global environment and then the
+    builtins. Each `ast.FunctionLiteral` gets the `slots` its frame needs,
+    and the calls in tail position in its body are marked.
+    """
+
+    def __init__(self):
+        # Innermost function scope last; empty at the top level.
+        self.scopes: List[Dict[str, int]] = []
+
+    def resolve(self, node: ast.Node) -> None:
+        if isinstance(node, ast.Identifier):
+            self.resolve_identifier(node)
+        elif isinstance(node, ast.FunctionLiteral):
+            self.resolve_function_literal(node)
+        else:
+            for child in ast.iter_child_nodes(node):
+                self.resolve(child)
+
+    def resolve_identifier(self, node: ast.Identifier) -> None:
+        depth = 0
+        for scope in reversed(self.scopes):
+            slot = scope.get(node.value, None)
+            if slot is not None:
+                node.depth, node.slot = depth, slot
+                return
+            depth += 1
+        node.depth, node.slot = depth, None
+
+    def resolve_function_literal(self, node: ast.FunctionLiteral) -> None:
+        node.slots = {}
+        for name in declared_names(node):
+            # A repeated parameter shares one slot; the last argument wins.
+            node.slots.setdefault(name, len(node.slots))
+        self.scopes.append(node.slots)
+        for param in node.parameters:
+            self.resolve(param)
+        self.resolve(node.body)
+        self.scopes.pop()
+        mark_tail_calls(node.body)
+
+
+def resolve(node: ast.Node) -> ast.Node:
+    Resolver().resolve(node)
+    return node
+
+
+def mark_tail_calls(body: ast.BlockStatement) -> None:
+    """Set `tail` on each call whose value becomes the function's result.
+
+    That's a call that is returned, or is the value of the body's last
+    statement, looking through `if` branches. A `return` only leaves the
+    function from a statement of the body or of an `if` standing as a
+    statement; inside a `while` it moves on to the next iteration and in
+    other expressions (including the value of another `return`) it's just
+    a value, so calls there aren't marked.
+    """
+
+    def visit_block(block: ast.BlockStatement, is_result: bool, leaves: bool) -> None:
+        last = len(block.statements) - 1
+        for i, statement in enumerate(block.statements):
+            if isinstance(statement, ast.ReturnStatement):
+                if leaves:
+                    visit_result(statement.return_value, leaves=False)
+            elif isinstance(statement, ast.ExpressionStatement):
+                if is_result and i == last:
+                    visit_result(statement.expression, leaves)
+                elif leaves and isinstance(statement.expression, ast.IfExpression):
+                    visit_if(statement.expression, False, leaves)
+
+    def visit_if(node: ast.IfExpression, is_result: bool, leaves: bool) -> None:
+        for branch in (node.consequence, node.alternative):
+            if branch is not None:
+                visit_block(branch, is_result, leaves)
+
+    def visit_result(node: ast.Expression, leaves: bool) -> None:
+        if isinstance(node, ast.CallExpression):
+            node.tail = True
+        elif isinstance(node, ast.IfExpression):
+            visit_if(node, True, leaves)
+
+    visit_block(body, is_result=True, leaves=True)
+
+
+def declared_names(fn: ast.FunctionLiteral) -> List[str]:
+    """Parameters, then every `let` in the body that isn't inside a nested
+    function. Blocks don't open scopes in monkey, so all of them share the
+    function's frame."""
+    names = [p.value for p in fn.parameters]
+    seen = set(names)
+
+    def visit(node: ast.Node) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.FunctionLiteral):
+                continue
+            if isinstance(child, ast.LetStatement) and child.name.value not in seen:
+                seen.add(child.name.value)
+                names.append(child.name.value)
+            visit(child)
+
+    visit(fn.body)
+    return names
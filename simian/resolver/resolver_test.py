@@ -0,0 +1,140 @@
+import os
+import simian.ast as ast
+import simian.lexer as lexer
+import simian.objects as objects
+import simian.parser as parser
+from simian.evaluator import evaluate
+from simian.resolver import resolve
+
+
+def test_global_names_have_no_slot():
+    program = resolve(build_program("let a = 1; a + len([]);"))
+    assert resolutions(program) == [("a", 0, None), ("a", 0, None), ("len", 0, None)]
+
+
+def test_function_slots():
+    program = resolve(build_program("fn(x, y) { let z = x; if (y) { let w = z; } }"))
+    literal = program.statements[0].expression
+    assert literal.slots == {"x": 0, "y": 1, "z": 2, "w": 3}
+    assert resolutions(program) == [
+        ("x", 0, 0),
+        ("y", 0, 1),
+        ("z", 0, 2),
+        ("x", 0, 0),
+        ("y", 0, 1),
+        ("w", 0, 3),
+        ("z", 0, 2),
+    ]
+
+
+def test_repeated_parameters_share_a_slot():
+    program = resolve(build_program("fn(x, x) { x }"))
+    assert program.statements[0].expression.slots == {"x": 0}
+
+
+def test_nested_functions():
+    program = resolve(
+        build_program("let f = fn(a) { fn(b) { fn(c) { a + b + c + len } } };")
+    )
+    inner = [r for r in resolutions(program) if r[0] in ("a", "b", "c", "len")]
+    assert inner == [
+        ("a", 0, 0),
+        ("b", 0, 0),
+        ("c", 0, 0),
+        ("a", 2, 0),
+        ("b", 1, 0),
+        ("c", 0, 0),
+        ("len", 3, None),
+    ]
+
+
+def test_tail_calls():
+    program = resolve(
+        build_program(
+            """
+            let f = fn(n) {
+                if (n == 0) { return a(); }
+                let x = b();
+                c(d());
+                while (n > 0) { return e(); }
+                if (n == 1) { g() } else { h() }
+            };
+            """
+        )
+    )
+    assert tail_calls(program) == {
+        "a": True,
+        "b": False,
+        "c": False,
+        "d": False,
+        "e": False,
+        "g": True,
+        "h": True,
+    }
+
+
+def test_calls_outside_functions_are_not_tail_calls():
+    program = resolve(build_program("f(); fn() { g(h()) }"))
+    assert tail_calls(program) == {"f": False, "g": True, "h": False}
+
+
+def test_frame():
+    env = objects.new_environment()
+    env.set("x", objects.Integer(1))
+    frame = objects.Frame({"x": 0, "y": 1}, env)
+
+    # An unset slot falls back to the enclosing environment.
+    assert frame.get("x").value == 1
+    assert frame.get("y") is None
+
+    frame.set("x", objects.Integer(2))
+    frame.set("extra", objects.Integer(3))
+    assert frame.slots[0].value == 2
+    assert frame.get("x").value == 2
+    assert frame.get("extra").value == 3
+    assert env.get("x").value == 1
+
+
+def test_evaluating_unresolved_nodes():
+    # Nodes evaluated without going through evaluate_program still look
+    # their names up by name.
+    env = objects.new_environment()
+    env.set("x", objects.Integer(4))
+    statement = build_program("x * 2").statements[0]
+    assert evaluate(statement, env).value == 8
+
+
+####################
+#      HELPERS     #
+####################
+def resolutions(node: ast.Node):
+    found = []
+
+    def visit(node: ast.Node) -> None:
+        if isinstance(node, ast.Identifier):
+            found.append((node.value, node.depth, node.slot))
+        for child in ast.iter_child_nodes(node):
+            visit(child)
+
+    visit(node)
+    return found
+
+
+def tail_calls(node: ast.Node):
+    found = {}
+
+    def visit(node: ast.Node) -> None:
+        if isinstance(node, ast.CallExpression):
+            found[node.function.value] = node.tail
+        for child in ast.iter_child_nodes(node):
+            visit(child)
+
+    visit(node)
+    return found
+
+
+def build_program(input_: str) -> ast.Program:
+    p = parser.Parser(lexer.new(input_), os.getcwd())
+    program = p.parse_program()
+    assert not p.errors
+    return program
@@ -79,6 +79,8 @@ def lookup_ident(ident: str) -> str:
 
 
 class Token:
+    __slots__ = ("token_type", "literal")
+
     def __init__(self, token_type: str, literal: str):
         self.token_type: str = token_type
         self.literal: str = literal
@@ -0,0 +1,11 @@
+from .runtime import MonkeyError, TranspiledFunction
+from .transpiler import Transpiler, transpile, compile_source, evaluate_transpiled
+
+__all__ = [
+    "MonkeyError",
+    "TranspiledFunction",
+    "Transpiler",
+    "transpile",
+    "compile_source",
+    "evaluate_transpiled",
+]
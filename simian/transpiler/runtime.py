@@ -0,0 +1,239 @@
+from types import CodeType
+from typing import Callable, List, Optional
+
+import simian.ast as ast
+import simian.objects as objects
+from simian.evaluator import evaluator
+from simian.token import TokenType
+
+__all__ = ["MonkeyError", "TranspiledFunction", "run"]
+
+Error = objects.Error
+Integer = objects.Integer
+TailCall = evaluator.TailCall
+TRUE = objects.TRUE
+FALSE = objects.FALSE
+NULL = objects.NULL
+
+
+class MonkeyError(Exception):
+    """Raised by the runtime helpers to abort on an `objects.Error`."""
+
+    def __init__(self, error: objects.Error):
+        self.error = error
+
+
+class TranspiledFunction(objects.Object, objects.Callable):
+    __slots__ = ("fn", "parameters", "arity", "text")
+
+    def __init__(self, fn: Callable, parameters: List[str], text: tuple):
+        self.fn = fn
+        self.parameters = parameters
+        self.arity = len(parameters)
+        self.text = text
+
+    def object_type(self):
+        return objects.ObjectType.FUNCTION_OBJ
+
+    def call(self, args: List[objects.Object]) -> objects.Object:
+        try:
+            return call(self, *args)
+        except MonkeyError as e:
+            return e.error
+
+    def __str__(self):
+        parameters, body = self.text
+        return f"fn({parameters}) {{\n{body}\n}}"
+
+
+def run(code: CodeType, env: objects.Environment) -> Optional[objects.Object]:
+    namespace = dict(NAMESPACE)
+    exec(code, namespace)
+    try:
+        return namespace["__program__"](env, env.store)
+    except MonkeyError as e:
+        return e.error
+
+
+def check(obj: Optional[objects.Object]) -> Optional[objects.Object]:
+    if type(obj) is Error:
+        raise MonkeyError(obj)
+    return obj
+
+
+def infix(operator: str, left: objects.Object, right: objects.Object):
+    return check(evaluator.evaluate_infix_expression(operator, left, right))
+
+
+def add(left, right):
+    if type(left) is Integer and type(right) is Integer:
+        return Integer(left.value + right.value)
+    return infix("+", left, right)
+
+
+def sub(left, right):
+    if type(left) is Integer and type(right) is Integer:
+        return Integer(left.value - right.value)
+    return infix("-", left, right)
+
+
+def mul(left, right):
+    if type(left) is Integer and type(right) is Integer:
+        return Integer(left.value * right.value)
+    return infix("*", left, right)
+
+
+def mod(left, right):
+    if type(left) is Integer and type(right) is Integer:
+        return Integer(left.value % right.value)
+    return infix("%", left, right)
+
+
+def lt(left, right):
+    if type(left) is Integer and type(right) is Integer:
+        return TRUE if left.value < right.value else FALSE
+    return infix("<", left, right)
+
+
+def gt(left, right):
+    if type(left) is Integer and type(right) is Integer:
+        return TRUE if left.value > right.value else FALSE
+    return infix(">", left, right)
+
+
+def eq(left, right):
+    if type(left) is Integer and type(right) is Integer:
+        return TRUE if left.value == right.value else FALSE
+    return infix("==", left, right)
+
+
+def not_eq(left, right):
+    if type(left) is Integer and type(right) is Integer:
+        return TRUE if left.value != right.value else FALSE
+    return infix("!=", left, right)
+
+
+def bang(right):
+    return TRUE if right is FALSE or right is NULL else FALSE
+
+
+def minus(right):
+    if type(right) is Integer:
+        return Integer(-right.value)
+    return check(evaluator.evaluate_minus_prefix_operator_expression(right))
+
+
+def index(left, index):
+    return check(evaluator.evaluate_index_expression(left, index))
+
+
+def field(left, site):
+    return check(evaluator.evaluate_field_expression(left, site))
+
+
+def slice_(left, start, end):
+    return check(evaluator.evaluate_slice_expression(left, start, end))
+
+
+def hash_key(key):
+    if not isinstance(key, objects.Hashable):
+        raise MonkeyError(Error(f"unusable as hash key: {key.object_type().value}"))
+    return key
+
+
+def hash_(items: list):
+    pairs = {}
+    for i in range(0, len(items), 2):
+        key = items[i]
+        pairs[key.hash_key()] = objects.HashPair(key, items[i + 1])
+    return objects.Hash(pairs)
+
+
+def global_(env: objects.Environment, name: str):
+    value = env.get(name)
+    if value is not None:
+        return value
+    builtin = objects.BUILTINS.get(name, None)
+    if builtin is not None:
+        return builtin
+    raise MonkeyError(Error(f"identifier not found: {name}"))
+
+
+def call(fn, *args):
+    # A tail call comes back as a TailCall and is made by the next iteration
+    # here, so tail recursion runs in constant Python stack.
+    while type(fn) is TranspiledFunction:
+        arity = fn.arity
+        if len(args) == arity:
+            result = fn.fn(*args)
+        elif len(args) > arity:
+            result = fn.fn(*args[:arity])
+        else:
+            raise MonkeyError(Error(f"{fn.parameters[len(args)]} not supplied"))
+        if type(result) is not TailCall:
+            return result
+        fn, args = result.fn, result.args
+    if type(fn) is objects.Builtin:
+        return check(fn.fn(list(args)))
+    return check(evaluator.apply_function(fn, list(args)))
+
+
+def tail_call(fn, *args):
+    """A call in tail position, left for `call` to make once the calling
+    function has returned."""
+    if type(fn) is TranspiledFunction:
+        return TailCall(fn, args)
+    return call(fn, *args)
+
+
+def import_(name: Optional[str], requestor: str):
+    node = ast.ImportExpression(None, requestor)
+    node.name = ast.StringLiteral(TokenType.STRING, name) if name is not None else None
+    module_path = check(evaluator.resolve_module_path(node))
+    module = check(evaluator.parse_module(module_path.value))
+
+    # Imported lazily: the transpiler module imports this one.
+    from simian.transpiler.transpiler import compile_source, transpile
+
+    env = objects.new_environment()
+    # Like the tree-walker, a module that fails part-way still exports
+    # whatever it bound before the error.
+    run(compile_source(transpile(module)), env)
+    return objects.Module(module_path.value, env.exported_hash())
+
+
+# The globals every generated module runs with.
+NAMESPACE = {
+    "__builtins__": {},
+    "_Integer": objects.Integer,
+    "_String": objects.String,
+    "_Array": objects.new_array,
+    "_Function": TranspiledFunction,
+    "_ReturnValue": objects.ReturnValue,
+    "_TRUE": TRUE,
+    "_FALSE": FALSE,
+    "_NULL": NULL,
+    "_FALSY": (NULL, FALSE),
+    "_LOOP_EXIT": (None, NULL, FALSE),
+    "_add": add,
+    "_sub": sub,
+    "_mul": mul,
+    "_mod": mod,
+    "_lt": lt,
+    "_gt": gt,
+    "_eq": eq,
+    "_not_eq": not_eq,
+    "_infix": infix,
+    "_bang": bang,
+    "_minus": minus,
+    "_index": index,
+    "_field": field,
+    "_FieldSite": evaluator.FieldSite,
+    "_slice": slice_,
+    "_hash_key": hash_key,
+    "_hash": hash_,
+    "_global": global_,
+    "_call": call,
+    "_tail_call": tail_call,
+    "_import": import_,
+}
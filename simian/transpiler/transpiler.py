@@ -0,0 +1,448 @@
+import hashlib
+from types import CodeType
+from typing import Dict, List, Optional
+
+import simian.ast as ast
+import simian.objects as objects
+from simian.evaluator.evaluator import RETURNING_EXPRESSIONS
+from simian.resolver import declared_names, mark_tail_calls
+from simian.transpiler import runtime
+
+__all__ = ["Transpiler", "transpile", "compile_source", "evaluate_transpiled"]
+
+# Code objects keyed by the SHA-256 of the Python source they were compiled
+# from. Transpiling is cheap next to `compile()`, so re-running the same
+# program (or importing the same module again) skips the expensive half.
+CODE_CACHE: Dict[str, CodeType] = {}
+CODE_CACHE_SIZE = 256
+
+INFIX_HELPERS = {
+    "+": "_add",
+    "-": "_sub",
+    "*": "_mul",
+    "%": "_mod",
+    "<": "_lt",
+    ">": "_gt",
+    "==": "_eq",
+    "!=": "_not_eq",
+}
+
+
+class FunctionScope:
+    def __init__(self, names: List[str], depth: int, outer: Optional["FunctionScope"]):
+        self.names = set(names)
+        self.depth = depth
+        self.outer = outer
+        self.temps = 0
+        # What catches a `return`, innermost last: None for a `while` loop,
+        # or the temp an `if` used as a value is assigned to.
+        self.exits: List[Optional[str]] = []
+
+
+class Transpiler:
+    """Translates an `ast.Program` into the source of a Python module that
+    defines `__program__(_env, _store)`.
+
+    Monkey functions become nested `def`s, monkey locals become Python locals
+    (so closures capture them through Python cells), and globals live in the
+    `Environment` store as they do for the tree-walker. Operators and builtins
+    go through `simian.transpiler.runtime`, which raises on `objects.Error`.
+    """
+
+    def __init__(self):
+        self.constants: List[str] = []
+        self.constant_names: Dict[object, str] = {}
+        self.lines: List[str] = []
+        self.indent = 1
+        self.scope: Optional[FunctionScope] = None
+        self.functions = 0
+        self.pure: Dict[int, bool] = {}
+        # Whether the program can make a ReturnValue, which statements have
+        # to check for.
+        self.return_values = False
+
+    def transpile(self, program: ast.Program) -> str:
+        self.lines = []
+        self.indent = 1
+        self.scope = FunctionScope([], 0, None)
+        self.return_values = makes_return_values(program)
+        self.block(program.statements, "return")
+        body = self.lines or ["    return None"]
+        header = ["def __program__(_env, _store):"]
+        return "\n".join(self.constants + header + body) + "\n"
+
+    ######################
+    #     STATEMENTS     #
+    ######################
+    def block(self, statements: List[ast.Statement], target: Optional[str]) -> None:
+        """Emit `statements`. `target` says what to do with the value of the
+        last one: "return" it, assign it to a temp of that name, or drop it
+        (None)."""
+        if not statements:
+            self.finish(target, "None")
+            return
+        last = len(statements) - 1
+        for i, statement in enumerate(statements):
+            self.statement(statement, target if i == last else None)
+
+    def statement(self, node: ast.Statement, target: Optional[str]) -> None:
+        if isinstance(node, ast.ExpressionStatement):
+            if isinstance(node.expression, ast.IfExpression) and not self.is_pure(
+                node.expression
+            ):
+                self.if_statement(node.expression, target)
+                return
+            value = self.expression(node.expression)
+            if (
+                self.return_values
+                and isinstance(node.expression, RETURNING_EXPRESSIONS)
+                and target in (None, "return")
+            ):
+                # A ReturnValue, from an `if` used as a value, returns.
+                returned = self.temp()
+                self.emit(f"{returned} = {value}")
+                if target is None:
+                    self.emit(f"if {returned}.__class__ is _ReturnValue:")
+                    self.indent += 1
+                    self.return_(returned, wrapped=True)
+                    self.indent -= 1
+                else:
+                    self.emit(
+                        f"return {returned}.value"
+                        f" if {returned}.__class__ is _ReturnValue else {returned}"
+                    )
+            elif target is None:
+                if not is_trivial(value):
+                    self.emit(value)
+            else:
+                self.finish(target, value)
+        elif isinstance(node, ast.LetStatement):
+            value = self.expression(node.value)
+            self.emit(f"{self.binding(node.name.value)} = {value}")
+            self.finish(target, "None")
+        elif isinstance(node, ast.ReturnStatement):
+            self.return_(self.expression(node.return_value), wrapped=False)
+        elif isinstance(node, ast.WhileStatement):
+            self.while_statement(node)
+            self.finish(target, "None")
+        elif isinstance(node, ast.BlockStatement):
+            self.block(node.statements, target)
+        else:
+            self.finish(target, "None")
+
+    def indented_block(
+        self, statements: List[ast.Statement], target: Optional[str]
+    ) -> None:
+        self.indent += 1
+        start = len(self.lines)
+        self.block(statements, target)
+        if len(self.lines) == start:
+            self.emit("pass")
+        self.indent -= 1
+
+    def return_(self, value: str, wrapped: bool) -> None:
+        """Return `value` from whatever catches it, as the tree-walker does:
+        an `if` used as a value takes it, as a ReturnValue, as its own value,
+        and a `while` loop drops it and carries on with the next iteration.
+        `wrapped` is set when `value` is a ReturnValue a statement returns.
+        """
+        if not self.scope.exits:
+            self.emit(f"return {value}.value" if wrapped else f"return {value}")
+            return
+        exit = self.scope.exits[-1]
+        if exit is None:
+            if not is_trivial(value):
+                self.emit(value)
+            self.emit("continue")
+        else:
+            if not wrapped:
+                value = f"_ReturnValue({value})"
+            self.emit(f"{exit} = {value}")
+            self.emit("break")
+
+    def finish(self, target: Optional[str], value: str) -> None:
+        if target == "return":
+            self.emit(f"return {value}")
+        elif target is not None:
+            self.emit(f"{target} = {value}")
+
+    def while_statement(self, node: ast.WhileStatement) -> None:
+        self.emit("while True:")
+        self.indent += 1
+        condition = self.expression(node.condition)
+        self.emit(f"if {condition} in _LOOP_EXIT:")
+        self.emit("    break")
+        self.scope.exits.append(None)
+        self.block(node.body.statements, None)
+        self.scope.exits.pop()
+        self.indent -= 1
+
+    def if_statement(self, node: ast.IfExpression, target: Optional[str]) -> None:
+        condition = self.expression(node.condition)
+        self.emit(f"if {condition} not in _FALSY:")
+        self.indented_block(node.consequence.statements, target)
+        if node.alternative is not None:
+            self.emit("else:")
+            self.indented_block(node.alternative.statements, target)
+        elif target is not None:
+            self.emit("else:")
+            self.indent += 1
+            self.finish(target, "_NULL")
+            self.indent -= 1
+
+    #######################
+    #     EXPRESSIONS     #
+    #######################
+    def expression(self, node: ast.Expression) -> str:
+        """Return a Python expression for `node`, first emitting whatever
+        statements it needs."""
+        if node is None:
+            return "None"
+        if isinstance(node, ast.IntegerLiteral):
+            return self.constant(("int", node.value), f"_Integer({node.value!r})")
+        if isinstance(node, ast.StringLiteral):
+            return self.constant(("str", node.value), f"_String({node.value!r})")
+        if isinstance(node, ast.Boolean):
+            return "_TRUE" if node.value else "_FALSE"
+        if isinstance(node, ast.Identifier):
+            return self.lookup(node.value)
+        if isinstance(node, ast.InfixExpression):
+            left, right = self.operands([node.left, node.right])
+            helper = INFIX_HELPERS.get(node.operator, None)
+            if helper is not None:
+                return f"{helper}({left}, {right})"
+            return f"_infix({node.operator!r}, {left}, {right})"
+        if isinstance(node, ast.PrefixExpression):
+            right = self.expression(node.right)
+            if node.operator == "!":
+                return f"_bang({right})"
+            return f"_minus({right})"
+        if isinstance(node, ast.CallExpression):
+            operands = self.operands([node.function] + node.arguments)
+            helper = "_tail_call" if node.tail else "_call"
+            return f"{helper}({', '.join(operands)})"
+        if isinstance(node, ast.IfExpression):
+            return self.if_expression(node)
+        if isinstance(node, ast.IndexExpression):
+            if isinstance(node.index, ast.StringLiteral):
+                left = self.expression(node.left)
+                # Each site gets its own constant: it holds the site's cache.
+                site = self.constant(
+                    ("site", id(node)), f"_FieldSite({node.index.value!r})"
+                )
+                return f"_field({left}, {site})"
+            left, index = self.operands([node.left, node.index])
+            return f"_index({left}, {index})"
+        if isinstance(node, ast.SliceExpression):
+            bounds = [b for b in (node.start, node.end) if b is not None]
+            operands = iter(self.operands([node.left] + bounds))
+            left = next(operands)
+            start = "_NULL" if node.start is None else next(operands)
+            end = "_NULL" if node.end is None else next(operands)
+            return f"_slice({left}, {start}, {end})"
+        if isinstance(node, ast.ArrayLiteral):
+            elements = self.operands(node.elements)
+            return f"_Array([{', '.join(elements)}])"
+        if isinstance(node, ast.HashLiteral):
+            children = [n for pair in node.pairs.items() for n in pair]
+            operands = self.operands(children)
+            # Keys are checked as soon as they're evaluated, before their value.
+            items = [
+                f"_hash_key({o})" if i % 2 == 0 else o for i, o in enumerate(operands)
+            ]
+            return f"_hash([{', '.join(items)}])"
+        if isinstance(node, ast.FunctionLiteral):
+            return self.function_literal(node)
+        if isinstance(node, ast.ImportExpression):
+            name = node.name.value if isinstance(node.name, ast.StringLiteral) else None
+            return f"_import({name!r}, {str(node.requestor)!r})"
+        if isinstance(node, ast.WhileStatement):
+            self.while_statement(node)
+            return "None"
+        return "None"
+
+    def operands(self, nodes: List[ast.Expression]) -> List[str]:
+        """Translate sibling operands left to right. If a later operand has to
+        emit statements, earlier ones are saved to temps first so evaluation
+        order matches the tree-walker."""
+        impure = [not self.is_pure(n) for n in nodes]
+        out = []
+        for i, node in enumerate(nodes):
+            value = self.expression(node)
+            if any(impure[i + 1 :]) and not is_trivial(value):
+                temp = self.temp()
+                self.emit(f"{temp} = {value}")
+                value = temp
+            out.append(value)
+        return out
+
+    def if_expression(self, node: ast.IfExpression) -> str:
+        if self.is_pure(node):
+            condition = self.expression(node.condition)
+            consequence = self.expression(node.consequence.statements[0].expression)
+            alternative = "_NULL"
+            if node.alternative is not None:
+                alternative = self.expression(node.alternative.statements[0].expression)
+            return f"({consequence} if {condition} not in _FALSY else {alternative})"
+        temp = self.temp()
+        if not self.return_values:
+            self.if_statement(node, temp)
+            return temp
+        # Run once, so that a `return` in the branches can `break` out.
+        self.emit("while True:")
+        self.indent += 1
+        self.scope.exits.append(temp)
+        self.if_statement(node, temp)
+        self.scope.exits.pop()
+        self.emit("break")
+        self.indent -= 1
+        return temp
+
+    def function_literal(self, node: ast.FunctionLiteral) -> str:
+        self.functions += 1
+        name = f"_f{self.functions}"
+        names = declared_names(node)
+        mark_tail_calls(node.body)
+        scope = FunctionScope(names, self.scope.depth + 1, self.scope)
+        params = [mangle(p.value, scope.depth) for p in node.parameters]
+        # Duplicate parameters are legal in monkey (the last one wins) but
+        # not in Python, so earlier duplicates get throwaway names.
+        params = [
+            p if p not in params[i + 1 :] else f"_unused{i}" for i, p in enumerate(params)
+        ]
+        self.emit(f"def {name}({', '.join(params)}):")
+        self.indent += 1
+        outer = self.scope
+        self.scope = scope
+        parameter_names = {p.value for p in node.parameters}
+        lets = [mangle(n, scope.depth) for n in names if n not in parameter_names]
+        if lets:
+            self.emit(f"{' = '.join(lets)} = None")
+        self.block(node.body.statements, "return")
+        self.scope = outer
+        self.indent -= 1
+
+        parameter_text = ", ".join(str(p) for p in node.parameters)
+        text = self.constant(
+            ("fn", parameter_text, str(node.body)),
+            f"({parameter_text!r}, {str(node.body)!r})",
+        )
+        names_text = repr([p.value for p in node.parameters])
+        return f"_Function({name}, {names_text}, {text})"
+
+    ####################
+    #      HELPERS     #
+    ####################
+    def emit(self, line: str) -> None:
+        self.lines.append("    " * self.indent + line)
+
+    def temp(self) -> str:
+        self.scope.temps += 1
+        return f"_t{self.scope.temps}"
+
+    def constant(self, key: object, source: str) -> str:
+        name = self.constant_names.get(key, None)
+        if name is None:
+            name = f"_k{len(self.constants)}"
+            self.constants.append(f"{name} = {source}")
+            self.constant_names[key] = name
+        return name
+
+    def binding(self, name: str) -> str:
+        if self.scope.depth == 0:
+            return f"_store[{name!r}]"
+        return mangle(name, self.scope.depth)
+
+    def lookup(self, name: str) -> str:
+        scopes = []
+        scope = self.scope
+        while scope.depth > 0:
+            if name in scope.names:
+                scopes.append(mangle(name, scope.depth))
+            scope = scope.outer
+        # An unset (None) local falls back to the next scope out that binds
+        # the same name, then to globals and builtins, like Environment.get.
+        out = f"_global(_env, {name!r})"
+        for local in reversed(scopes):
+            out = f"({local} if {local} is not None else {out})"
+        return out
+
+    def is_pure(self, node: ast.Node) -> bool:
+        """Whether `node` translates to a single Python expression."""
+        key = id(node)
+        cached = self.pure.get(key, None)
+        if cached is not None:
+            return cached
+        if isinstance(node, (ast.FunctionLiteral, ast.WhileStatement)):
+            result = False
+        elif isinstance(node, ast.IfExpression):
+            result = all(
+                block is None
+                or (
+                    len(block.statements) == 1
+                    and isinstance(block.statements[0], ast.ExpressionStatement)
+                    and self.is_pure(block.statements[0].expression)
+                )
+                for block in (node.consequence, node.alternative)
+            ) and self.is_pure(node.condition)
+        else:
+            result = all(self.is_pure(c) for c in ast.iter_child_nodes(node))
+        self.pure[key] = result
+        return result
+
+
+def mangle(name: str, depth: int) -> str:
+    return f"m_{name}_{depth}"
+
+
+def is_trivial(value: str) -> bool:
+    return value.isidentifier() or value == "None"
+
+
+def makes_return_values(program: ast.Program) -> bool:
+    """Whether `program` has a `return` in a branch of an `if` used as a
+    value, which gives it back as a ReturnValue: the only way to make one.
+    """
+    stack = [(program, False)]
+    while stack:
+        node, in_value = stack.pop()
+        if in_value and isinstance(node, ast.ReturnStatement):
+            return True
+        if isinstance(node, ast.ExpressionStatement) and isinstance(
+            node.expression, ast.IfExpression
+        ):
+            # An `if` statement passes a `return` on to what it is in.
+            node = node.expression
+        elif isinstance(node, ast.IfExpression):
+            in_value = True
+        stack.extend((child, in_value) for child in ast.iter_child_nodes(node))
+    return False
+
+
+def transpile(program: ast.Program) -> str:
+    return Transpiler().transpile(program)
+
+
+def compile_source(source: str) -> CodeType:
+    key = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    code = CODE_CACHE.get(key, None)
+    if code is None:
+        code = compile(source, f"<simian {key[:12]}>", "exec")
+        if len(CODE_CACHE) >= CODE_CACHE_SIZE:
+            CODE_CACHE.clear()
+        CODE_CACHE[key] = code
+    return code
+
+
+def evaluate_transpiled(
+    program: ast.Program, env: objects.Environment
+) -> objects.Object:
+    try:
+        code = compile_source(transpile(program))
+    except (SyntaxError, RecursionError):
+        # Nesting deeper than CPython's compiler allows; run it on the
+        # tree-walker instead.
+        from simian.evaluator import evaluate
+
+        return evaluate(program, env)
+    return runtime.run(code, env)
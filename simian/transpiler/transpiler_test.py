@@ -0,0 +1,100 @@
+import os
+import simian.lexer as lexer
+import simian.parser as parser
+import simian.objects as objects
+from simian.evaluator import evaluate
+from simian.transpiler import TranspiledFunction, evaluate_transpiled, transpile
+from simian.transpiler import transpiler
+
+
+def test_matches_tree_walker():
+    tests = [
+        "let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } }; fib(15);",
+        "let i = 0; let total = 0; while (i < 100) { let total = total + i; let i = i + 1; } total;",
+        "let f = fn() { let i = 0; while (i < 10) { let i = i + 1; if (i == 5) { return 99; } } i }; f();",
+        "let f = fn() { let x = 1; let g = fn() { x }; let x = 2; g() }; f();",
+        "let x = 10; let f = fn(c) { if (c) { let x = 1; } x }; [f(true), f(false)];",
+        "let f = fn() { let g = fn(n) { if (n == 0) { 0 } else { g(n - 1) } }; g(10) }; f();",
+        "let adder = fn(a) { fn(b) { fn(c) { a + b + c } } }; adder(1)(2)(3);",
+        "let f = fn(x, x) { x }; f(1, 2);",
+        'let h = {"a": [1, 2, 3], 1: true}; [h.a[1], h[1], len(h["a"]), h["b"]];',
+        "[1, if (true) { let y = 2; y } else { 3 }, fn() { 4 }()]",
+        "let f = fn() { let x = 1; }; f();",
+        "let f = fn() { if (false) { 1 } }; f();",
+        "let len = fn(x) { 42 }; len([1]);",
+        "5 / 2",
+        "5; // comment",
+        "if (true) {}",
+        "if (false) { 1 }",
+        "return 3; 4;",
+        "[1, 2] + [3]",
+        '"a" + "b" == "ab"',
+        "!5 == !!false",
+        "true && false || true",
+        '"a" * 2',
+        "-true",
+        "1(2)",
+        "let add = fn(x, y) { x + y }; add(1);",
+        '{fn(x) { x }: 1}',
+        "missing + 1",
+        "str(fn(a, b) { a + b })",
+        "puts",
+    ]
+    for input_ in tests:
+        expected = evaluate(build_program(input_), objects.new_environment())
+        evaluated = run(input_)
+        assert type(evaluated) is type(expected) or (
+            isinstance(evaluated, TranspiledFunction)
+            and isinstance(expected, objects.Function)
+        ), input_
+        assert str(evaluated) == str(expected), input_
+
+
+def test_errors_are_error_objects():
+    evaluated = run("let f = fn(x) { x + true }; f(1); 10;")
+    assert isinstance(evaluated, objects.Error)
+    assert evaluated.message == "type mismatch: INTEGER + BOOLEAN"
+
+
+def test_code_objects_are_cached():
+    transpiler.CODE_CACHE.clear()
+    source = transpile(build_program("1 + 2"))
+    code = transpiler.compile_source(source)
+    assert transpiler.compile_source(source) is code
+    assert len(transpiler.CODE_CACHE) == 1
+
+
+def test_globals_persist_between_runs():
+    env = objects.new_environment()
+    evaluate_transpiled(build_program("let counter = fn(n) { n + 1 };"), env)
+    evaluated = evaluate_transpiled(build_program("counter(41)"), env)
+    assert isinstance(evaluated, objects.Integer)
+    assert evaluated.value == 42
+
+
+def test_deep_nesting_falls_back():
+    # CPython refuses more than 20 statically nested loops.
+    input_ = "let i = 0; " + "while (i < 1) { " * 25 + "let i = 7; " + "}" * 25 + " i"
+    evaluated = run(input_)
+    assert isinstance(evaluated, objects.Integer)
+    assert evaluated.value == 7
+
+
+def test_import(tmp_path):
+    module = tmp_path / "module.mo"
+    module.write_text('let double = fn(x) { x * 2 }; let name = "mod";')
+    p = parser.Parser(lexer.new('let m = import("./module.mo"); [m.double(21), m.name];'), tmp_path)
+    evaluated = evaluate_transpiled(p.parse_program(), objects.new_environment())
+    assert str(evaluated) == "[42, mod]"
+
+
+####################
+#      HELPERS     #
+####################
+def build_program(input_: str):
+    p = parser.Parser(lexer.new(input_), os.getcwd())
+    return p.parse_program()
+
+
+def run(input_: str) -> objects.Object:
+    return evaluate_transpiled(build_program(input_), objects.new_environment())
@@ -0,0 +1,3 @@
+from .vm import VM, Closure, Scope, evaluate_vm
+
+__all__ = ["VM", "Closure", "Scope", "evaluate_vm"]
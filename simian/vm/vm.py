@@ -0,0 +1,443 @@
+from typing import List, Optional
+
+import simian.ast as ast
+import simian.objects as objects
+from simian.compiler import Bytecode, CompiledFunction, Opcode, compile_program
+from simian.compiler.compiler import GENERIC_INFIX_OPERATORS
+from simian.evaluator import evaluator
+
+__all__ = ["VM", "Closure", "Scope", "evaluate_vm"]
+
+Error = objects.Error
+Integer = objects.Integer
+ReturnValue = objects.ReturnValue
+BUILTINS = objects.BUILTINS
+
+TRUE = objects.TRUE
+FALSE = objects.FALSE
+NULL = objects.NULL
+
+CONSTANT = Opcode.CONSTANT.value
+NONE = Opcode.NONE.value
+NULL_OP = Opcode.NULL.value
+TRUE_OP = Opcode.TRUE.value
+FALSE_OP = Opcode.FALSE.value
+POP = Opcode.POP.value
+POP_UNLESS_RETURN = Opcode.POP_UNLESS_RETURN.value
+WRAP_RETURN = Opcode.WRAP_RETURN.value
+ADD = Opcode.ADD.value
+SUB = Opcode.SUB.value
+MUL = Opcode.MUL.value
+MOD = Opcode.MOD.value
+EQ = Opcode.EQ.value
+NOT_EQ = Opcode.NOT_EQ.value
+LT = Opcode.LT.value
+GT = Opcode.GT.value
+INFIX = Opcode.INFIX.value
+MINUS = Opcode.MINUS.value
+BANG = Opcode.BANG.value
+JUMP = Opcode.JUMP.value
+JUMP_IF_FALSY = Opcode.JUMP_IF_FALSY.value
+LOOP_TEST = Opcode.LOOP_TEST.value
+GET_GLOBAL = Opcode.GET_GLOBAL.value
+SET_GLOBAL = Opcode.SET_GLOBAL.value
+GET_LOCAL = Opcode.GET_LOCAL.value
+SET_LOCAL = Opcode.SET_LOCAL.value
+GET_OUTER = Opcode.GET_OUTER.value
+ARRAY = Opcode.ARRAY.value
+HASH = Opcode.HASH.value
+CHECK_HASH_KEY = Opcode.CHECK_HASH_KEY.value
+INDEX = Opcode.INDEX.value
+SLICE = Opcode.SLICE.value
+GET_FIELD = Opcode.GET_FIELD.value
+CLOSURE = Opcode.CLOSURE.value
+CALL = Opcode.CALL.value
+RETURN_VALUE = Opcode.RETURN_VALUE.value
+IMPORT = Opcode.IMPORT.value
+
+INFIX_SYMBOLS = {
+    ADD: "+",
+    SUB: "-",
+    MUL: "*",
+    MOD: "%",
+    EQ: "==",
+    NOT_EQ: "!=",
+    LT: "<",
+    GT: ">",
+}
+
+
+class VMError(Exception):
+    """Raised inside the interpreter loop to abort on an `objects.Error`."""
+
+    def __init__(self, error: objects.Error):
+        self.error = error
+
+
+class Scope:
+    """The locals of one function call.
+
+    Closures keep a reference to the Scope they were created in, so later
+    `let`s in the enclosing function are visible to them, as in the
+    tree-walker. `get` makes a Scope usable as the `outer` of an
+    `objects.Environment`.
+    """
+
+    __slots__ = ("slots", "fn", "outer", "globals")
+
+    def __init__(
+        self,
+        fn: CompiledFunction,
+        outer: Optional["Scope"],
+        globals_: objects.Environment,
+    ):
+        self.slots: List[Optional[objects.Object]] = [None] * fn.num_locals
+        self.fn = fn
+        self.outer = outer
+        self.globals = globals_
+
+    def get(self, name: str) -> Optional[objects.Object]:
+        scope = self
+        while scope is not None:
+            slot = scope.fn.slots.get(name, None)
+            if slot is not None:
+                value = scope.slots[slot]
+                if value is not None:
+                    return value
+            scope = scope.outer
+        return self.globals.get(name)
+
+
+class Closure(objects.Function):
+    __slots__ = ("fn", "scope", "globals")
+
+    def __init__(
+        self,
+        fn: CompiledFunction,
+        scope: Optional[Scope],
+        globals_: objects.Environment,
+    ):
+        super().__init__(fn.parameters, fn.body, scope if scope is not None else globals_)
+        self.fn = fn
+        self.scope = scope
+        self.globals = globals_
+
+    def call(self, args: List[objects.Object]) -> objects.Object:
+        try:
+            return call_closure(self, args)
+        except VMError as e:
+            return e.error
+
+
+class Frame:
+    __slots__ = ("fn", "instructions", "constants", "ip", "scope", "globals", "base")
+
+    def __init__(self, fn, instructions, constants, scope, globals_, base):
+        self.fn = fn
+        self.instructions = instructions
+        self.constants = constants
+        self.ip = 0
+        self.scope = scope
+        self.globals = globals_
+        self.base = base
+
+
+class VM:
+    def __init__(self, bytecode: Bytecode, env: objects.Environment):
+        self.bytecode = bytecode
+        self.env = env
+
+    def run(self) -> Optional[objects.Object]:
+        frame = Frame(
+            None, self.bytecode.instructions, self.bytecode.constants, None, self.env, 0
+        )
+        try:
+            return execute(frame, [])
+        except VMError as e:
+            return e.error
+
+
+def evaluate_vm(program: ast.Program, env: objects.Environment) -> objects.Object:
+    return VM(compile_program(program), env).run()
+
+
+def execute(frame: Frame, stack: list) -> Optional[objects.Object]:
+    """Run `frame` until it returns, pushing further frames for calls."""
+    frames: List[Frame] = []
+    instructions = frame.instructions
+    constants = frame.constants
+    scope = frame.scope
+    slots = scope.slots if scope is not None else None
+    env = frame.globals
+    store = env.store
+    ip = 0
+    push = stack.append
+    pop = stack.pop
+
+    while True:
+        op = instructions[ip]
+
+        if op == CONSTANT:
+            push(constants[instructions[ip + 1]])
+            ip += 2
+        elif op == GET_LOCAL:
+            value = slots[instructions[ip + 1]]
+            if value is None:
+                value = lookup(scope.fn.names[instructions[ip + 1]], scope.outer, env)
+            push(value)
+            ip += 2
+        elif op == GET_GLOBAL:
+            name = constants[instructions[ip + 1]]
+            value = store.get(name, None)
+            if value is None:
+                value = lookup(name, None, env)
+            push(value)
+            ip += 2
+        elif ADD <= op <= GT:
+            right = pop()
+            left = stack[-1]
+            if type(left) is Integer and type(right) is Integer:
+                if op == ADD:
+                    stack[-1] = Integer(left.value + right.value)
+                elif op == SUB:
+                    stack[-1] = Integer(left.value - right.value)
+                elif op == LT:
+                    stack[-1] = TRUE if left.value < right.value else FALSE
+                elif op == MUL:
+                    stack[-1] = Integer(left.value * right.value)
+                elif op == MOD:
+                    stack[-1] = Integer(left.value % right.value)
+                elif op == GT:
+                    stack[-1] = TRUE if left.value > right.value else FALSE
+                elif op == EQ:
+                    stack[-1] = TRUE if left.value == right.value else FALSE
+                else:
+                    stack[-1] = TRUE if left.value != right.value else FALSE
+            else:
+                stack[-1] = check(
+                    evaluator.evaluate_infix_expression(INFIX_SYMBOLS[op], left, right)
+                )
+            ip += 1
+        elif op == SET_LOCAL:
+            slots[instructions[ip + 1]] = pop()
+            ip += 2
+        elif op == SET_GLOBAL:
+            store[constants[instructions[ip + 1]]] = pop()
+            ip += 2
+        elif op == JUMP_IF_FALSY:
+            condition = pop()
+            if condition is NULL or condition is FALSE:
+                ip = instructions[ip + 1]
+            else:
+                ip += 2
+        elif op == LOOP_TEST:
+            condition = pop()
+            if condition is None or condition is NULL or condition is FALSE:
+                ip = instructions[ip + 1]
+            else:
+                ip += 2
+        elif op == JUMP:
+            ip = instructions[ip + 1]
+        elif op == CALL:
+            num_args = instructions[ip + 1]
+            ip += 2
+            fn = stack[-1 - num_args]
+            if type(fn) is Closure:
+                compiled = fn.fn
+                parameters = compiled.parameters
+                if num_args < len(parameters):
+                    raise VMError(Error(f"{parameters[num_args].value} not supplied"))
+                frame.ip = ip
+                frame.scope = scope
+                frames.append(frame)
+                base = len(stack) - num_args - 1
+                scope = Scope(compiled, fn.scope, fn.globals)
+                slots = scope.slots
+                slots[: len(parameters)] = stack[base + 1 : base + 1 + len(parameters)]
+                del stack[base + 1 :]
+                env = fn.globals
+                store = env.store
+                instructions = compiled.instructions
+                constants = compiled.constants
+                frame = Frame(compiled, instructions, constants, scope, env, base)
+                ip = 0
+            else:
+                args = stack[len(stack) - num_args :]
+                del stack[len(stack) - num_args - 1 :]
+                push(call_object(fn, args))
+        elif op == RETURN_VALUE:
+            value = pop()
+            if type(value) is ReturnValue:
+                value = value.value
+            if not frames:
+                return value
+            del stack[frame.base :]
+            push(value)
+            frame = frames.pop()
+            instructions = frame.instructions
+            constants = frame.constants
+            scope = frame.scope
+            slots = scope.slots if scope is not None else None
+            env = frame.globals
+            store = env.store
+            ip = frame.ip
+        elif op == POP:
+            pop()
+            ip += 1
+        elif op == POP_UNLESS_RETURN:
+            if type(stack[-1]) is ReturnValue:
+                ip += 2
+            else:
+                pop()
+                ip = instructions[ip + 1]
+        elif op == WRAP_RETURN:
+            stack[-1] = ReturnValue(stack[-1])
+            ip += 1
+        elif op == GET_OUTER:
+            target = scope
+            for _ in range(instructions[ip + 1]):
+                target = target.outer
+            slot = instructions[ip + 2]
+            value = target.slots[slot]
+            if value is None:
+                value = lookup(target.fn.names[slot], target.outer, env)
+            push(value)
+            ip += 3
+        elif op == INFIX:
+            right = pop()
+            left = stack[-1]
+            operator = GENERIC_INFIX_OPERATORS[instructions[ip + 1]]
+            stack[-1] = check(evaluator.evaluate_infix_expression(operator, left, right))
+            ip += 2
+        elif op == INDEX:
+            index = pop()
+            left = stack[-1]
+            stack[-1] = check(evaluator.evaluate_index_expression(left, index))
+            ip += 1
+        elif op == GET_FIELD:
+            site = constants[instructions[ip + 1]]
+            stack[-1] = check(evaluator.evaluate_field_expression(stack[-1], site))
+            ip += 2
+        elif op == SLICE:
+            end = pop()
+            start = pop()
+            left = stack[-1]
+            stack[-1] = check(evaluator.evaluate_slice_expression(left, start, end))
+            ip += 1
+        elif op == TRUE_OP:
+            push(TRUE)
+            ip += 1
+        elif op == FALSE_OP:
+            push(FALSE)
+            ip += 1
+        elif op == NULL_OP:
+            push(NULL)
+            ip += 1
+        elif op == NONE:
+            push(None)
+            ip += 1
+        elif op == MINUS:
+            right = stack[-1]
+            if type(right) is Integer:
+                stack[-1] = Integer(-right.value)
+            else:
+                stack[-1] = check(
+                    evaluator.evaluate_minus_prefix_operator_expression(right)
+                )
+            ip += 1
+        elif op == BANG:
+            right = stack[-1]
+            stack[-1] = TRUE if right is FALSE or right is NULL else FALSE
+            ip += 1
+        elif op == CLOSURE:
+            push(Closure(constants[instructions[ip + 1]], scope, env))
+            ip += 2
+        elif op == ARRAY:
+            count = instructions[ip + 1]
+            elements = stack[len(stack) - count :]
+            del stack[len(stack) - count :]
+            push(objects.new_array(elements))
+            ip += 2
+        elif op == CHECK_HASH_KEY:
+            key = stack[-1]
+            if not isinstance(key, objects.Hashable):
+                raise VMError(
+                    Error(f"unusable as hash key: {key.object_type().value}")
+                )
+            ip += 1
+        elif op == HASH:
+            count = instructions[ip + 1] * 2
+            items = stack[len(stack) - count :]
+            del stack[len(stack) - count :]
+            pairs = {}
+            for i in range(0, count, 2):
+                key = items[i]
+                pairs[key.hash_key()] = objects.HashPair(key, items[i + 1])
+            push(objects.Hash(pairs))
+            ip += 2
+        elif op == IMPORT:
+            push(import_module(constants[instructions[ip + 1]]))
+            ip += 2
+
+        else:
+            raise RuntimeError(f"unknown opcode {op} at {ip}")
+
+
+####################
+#      HELPERS     #
+####################
+def check(obj: Optional[objects.Object]) -> Optional[objects.Object]:
+    if type(obj) is Error:
+        raise VMError(obj)
+    return obj
+
+
+def lookup(
+    name: str, scope: Optional[Scope], env: objects.Environment
+) -> objects.Object:
+    """Find `name` the way `Environment.get` would: the innermost scope that
+    has actually bound it, then the globals, then the builtins."""
+    while scope is not None:
+        slot = scope.fn.slots.get(name, None)
+        if slot is not None:
+            value = scope.slots[slot]
+            if value is not None:
+                return value
+        scope = scope.outer
+    value = env.get(name)
+    if value is not None:
+        return value
+    builtin = BUILTINS.get(name, None)
+    if builtin is not None:
+        return builtin
+    raise VMError(Error(f"identifier not found: {name}"))
+
+
+def call_object(fn: objects.Object, args: List[objects.Object]) -> objects.Object:
+    if type(fn) is objects.Builtin:
+        return check(fn.fn(args))
+    if type(fn) is Closure:
+        return call_closure(fn, args)
+    return check(evaluator.apply_function(fn, args))
+
+
+def call_closure(fn: Closure, args: List[objects.Object]) -> objects.Object:
+    """Call a VM closure from Python, e.g. from a builtin."""
+    parameters = fn.fn.parameters
+    if len(args) < len(parameters):
+        raise VMError(Error(f"{parameters[len(args)].value} not supplied"))
+    scope = Scope(fn.fn, fn.scope, fn.globals)
+    scope.slots[: len(parameters)] = args[: len(parameters)]
+    frame = Frame(fn.fn, fn.fn.instructions, fn.fn.constants, scope, fn.globals, 0)
+    return execute(frame, [])
+
+
+def import_module(node: ast.ImportExpression) -> objects.Object:
+    module_path = check(evaluator.resolve_module_path(node))
+    module = check(evaluator.parse_module(module_path.value))
+
+    env = objects.new_environment()
+    # Like the tree-walker, a module that fails part-way still exports
+    # whatever it bound before the error.
+    VM(compile_program(module), env).run()
+    return objects.Module(module_path.value, env.exported_hash())